@@ -29,6 +29,7 @@ class Settings(BaseSettings):
         default="https://api.marketaux.com/v1/news/all",
         env="MARKETAUX_BASE_URL",
     )
+    marketaux_speculative_fallback: bool = Field(default=False, env="MARKETAUX_SPECULATIVE_FALLBACK")
     supabase_url: str | None = Field(default=None, env="SUPABASE_URL")
     supabase_key: str | None = Field(default=None, env="SUPABASE_KEY")
     ob_fractal_period: int = Field(default=2, env="OB_FRACTAL_PERIOD")
@@ -0,0 +1,103 @@
+-- Factor Correlation Stats Migration
+-- Aggregates prediction factors per outcome in Postgres so the learning
+-- analyzer receives one row per factor instead of every outcome's JSON
+
+-- ============================================
+-- 1. INDEX FOR THE OUTCOME WINDOW SCAN
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_outcome_results_interval_created_at
+    ON outcome_results(check_interval, created_at DESC);
+
+-- ============================================
+-- 2. FACTOR CORRELATION STATS FUNCTION
+-- Called via POST /rest/v1/rpc/factor_correlation_stats
+--
+-- Returns:
+-- {
+--   "sample_size": 120,
+--   "numeric": [{"factor": "rsi_14", "ml_correct": true, "count": 70, "sum": 4012.5, "sum_sq": 241890.3}, ...],
+--   "categorical": [{"factor": "trend", "value": "UP", "total": 40, "correct": 28}, ...]
+-- }
+-- Booleans count as numeric (0/1); strings as categorical; nulls,
+-- objects and arrays are skipped.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.factor_correlation_stats(
+    p_cutoff TIMESTAMPTZ,
+    p_symbol TEXT DEFAULT NULL,
+    p_check_interval TEXT DEFAULT '24h'
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+    WITH outcomes AS (
+        SELECT o.ml_correct, p.factors
+        FROM outcome_results o
+        JOIN prediction_logs p ON p.id = o.prediction_id
+        WHERE o.check_interval = p_check_interval
+          AND o.created_at >= p_cutoff
+          AND (p_symbol IS NULL OR p.symbol = p_symbol)
+    ),
+    factor_values AS (
+        SELECT o.ml_correct, f.key AS factor, jsonb_typeof(f.value) AS kind, f.value
+        FROM outcomes o
+        CROSS JOIN LATERAL jsonb_each(o.factors) f
+        WHERE jsonb_typeof(o.factors) = 'object'
+    ),
+    numeric_stats AS (
+        SELECT
+            factor,
+            ml_correct,
+            COUNT(*) AS value_count,
+            SUM(num) AS value_sum,
+            SUM(num * num) AS value_sum_sq
+        FROM (
+            SELECT
+                factor,
+                ml_correct,
+                CASE kind
+                    WHEN 'boolean' THEN CASE WHEN value = 'true'::jsonb THEN 1.0 ELSE 0.0 END
+                    ELSE (value #>> '{}')::DOUBLE PRECISION
+                END AS num
+            FROM factor_values
+            WHERE kind IN ('number', 'boolean')
+        ) numeric_values
+        GROUP BY factor, ml_correct
+    ),
+    categorical_stats AS (
+        SELECT
+            factor,
+            value #>> '{}' AS value_text,
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE ml_correct) AS correct
+        FROM factor_values
+        WHERE kind = 'string'
+        GROUP BY factor, value #>> '{}'
+    )
+    SELECT jsonb_build_object(
+        'sample_size', (SELECT COUNT(*) FROM outcomes),
+        'numeric', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_object(
+                'factor', factor,
+                'ml_correct', ml_correct,
+                'count', value_count,
+                'sum', value_sum,
+                'sum_sq', value_sum_sq
+            )) FROM numeric_stats),
+            '[]'::jsonb
+        ),
+        'categorical', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_object(
+                'factor', factor,
+                'value', value_text,
+                'total', total,
+                'correct', correct
+            )) FROM categorical_stats),
+            '[]'::jsonb
+        )
+    );
+$$;
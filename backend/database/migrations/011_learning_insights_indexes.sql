@@ -0,0 +1,11 @@
+-- Learning Insights Index Migration
+-- Supports get_active_insights, which reads symbol-specific and general
+-- (symbol IS NULL) active insights as two separate newest-first queries
+
+CREATE INDEX IF NOT EXISTS idx_learning_insights_symbol_active_created_at
+    ON learning_insights(symbol, created_at DESC)
+    WHERE is_active = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_learning_insights_general_active_created_at
+    ON learning_insights(created_at DESC)
+    WHERE is_active = TRUE AND symbol IS NULL;
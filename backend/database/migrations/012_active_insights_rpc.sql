@@ -0,0 +1,48 @@
+-- Active Insights RPC Migration
+-- Returns the active learning insights for a symbol plus general
+-- (symbol IS NULL) insights, newest first, in one call:
+-- POST /rest/v1/rpc/get_active_insights_for {"p_symbol": "XAUUSD"}
+-- With p_symbol NULL, returns the latest active insights for all symbols.
+
+CREATE OR REPLACE FUNCTION public.get_active_insights_for(p_symbol TEXT DEFAULT NULL)
+RETURNS SETOF learning_insights
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+    SELECT *
+    FROM (
+        -- Each branch can use its partial index from migration 011
+        (
+            SELECT *
+            FROM learning_insights
+            WHERE is_active = TRUE
+              AND p_symbol IS NOT NULL
+              AND symbol = p_symbol
+            ORDER BY created_at DESC
+            LIMIT 50
+        )
+        UNION ALL
+        (
+            SELECT *
+            FROM learning_insights
+            WHERE is_active = TRUE
+              AND p_symbol IS NOT NULL
+              AND symbol IS NULL
+            ORDER BY created_at DESC
+            LIMIT 50
+        )
+        UNION ALL
+        (
+            SELECT *
+            FROM learning_insights
+            WHERE is_active = TRUE
+              AND p_symbol IS NULL
+            ORDER BY created_at DESC
+            LIMIT 50
+        )
+    ) insights
+    ORDER BY created_at DESC
+    LIMIT 50;
+$$;
@@ -5,16 +5,31 @@ Uses httpx directly instead of supabase-py to avoid dependency conflicts.
 from __future__ import annotations
 
 import os
+import json
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 _init_error: Optional[str] = None
 _initialized: bool = False
 
 
+def _decode_json(response: httpx.Response) -> Any:
+    """Decode a PostgREST body from bytes (orjson when installed, else stdlib json)."""
+    if not response.content:
+        return None
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
 class SupabaseRestClient:
     """Simple Supabase REST API client using httpx."""
     
@@ -30,6 +45,25 @@ class SupabaseRestClient:
     
     def table(self, table_name: str) -> "TableQuery":
         return TableQuery(self, table_name)
+    
+    def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Call a Postgres function exposed by PostgREST (POST /rest/v1/rpc/<name>)."""
+        try:
+            with httpx.Client(timeout=30.0) as client:
+                url = f"{self.url}/rest/v1/rpc/{function_name}"
+                response = client.post(url, json=params or {}, headers=self.headers)
+                response.raise_for_status()
+                return {"data": _decode_json(response), "error": None}
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                # Function not deployed (its migration has not been applied yet)
+                logger.warning(f"Supabase rpc function not found ({function_name})")
+                return {"data": None, "error": str(e), "missing": True}
+            logger.error(f"Supabase rpc error ({function_name}): {e}")
+            return {"data": None, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Supabase rpc error ({function_name}): {e}")
+            return {"data": None, "error": str(e)}
 
 
 class TableQuery:
@@ -74,6 +108,11 @@ class TableQuery:
         self.filters.append(f"{column}=is.{value}")
         return self
     
+    def in_(self, column: str, values: List[Any]) -> "TableQuery":
+        joined = ",".join(str(v) for v in values)
+        self.filters.append(f"{column}=in.({joined})")
+        return self
+    
     def order(self, column: str, desc: bool = False) -> "TableQuery":
         direction = "desc" if desc else "asc"
         self.order_by = f"{column}.{direction}"
@@ -102,18 +141,19 @@ class TableQuery:
             with httpx.Client(timeout=30.0) as client:
                 response = client.get(self._build_url(), headers=self.client.headers)
                 response.raise_for_status()
-                return {"data": response.json(), "error": None}
+                return {"data": _decode_json(response), "error": None}
         except Exception as e:
             logger.error(f"Supabase query error: {e}")
             return {"data": None, "error": str(e)}
     
-    def insert(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def insert(self, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Insert one row, or a list of rows in a single request (bulk insert)."""
         try:
             with httpx.Client(timeout=30.0) as client:
                 url = f"{self.client.url}/rest/v1/{self.table_name}"
                 response = client.post(url, json=data, headers=self.client.headers)
                 response.raise_for_status()
-                return {"data": response.json(), "error": None}
+                return {"data": _decode_json(response), "error": None}
         except Exception as e:
             logger.error(f"Supabase insert error: {e}")
             return {"data": None, "error": str(e)}
@@ -124,7 +164,7 @@ class TableQuery:
                 url = self._build_url()
                 response = client.patch(url, json=data, headers=self.client.headers)
                 response.raise_for_status()
-                return {"data": response.json(), "error": None}
+                return {"data": _decode_json(response), "error": None}
         except Exception as e:
             logger.error(f"Supabase update error: {e}")
             return {"data": None, "error": str(e)}
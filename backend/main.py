@@ -1,4 +1,5 @@
 from datetime import datetime
+import asyncio
 import time
 import os
 import sys
@@ -365,9 +366,23 @@ async def get_candlestick_patterns(symbol: str):
         return {"success": False, "error": str(e)}
 
 
+def _preload_ml_models():
+    # Importing the service compiles (or loads cached) numba kernels and
+    # joblib deserialization blocks too: both belong off the event loop
+    from services.ml_prediction_service import warmup
+    warmup()
+
+
 # Startup event - start background scheduler
 @app.on_event("startup")
 async def startup_event():
+    # First, as the scheduler module imports the ML service at import time
+    try:
+        await asyncio.to_thread(_preload_ml_models)
+        print("ML models preloaded")
+    except Exception as e:
+        print(f"Failed to preload ML models: {e}")
+    
     try:
         from services.background_scheduler import start_scheduler
         start_scheduler()
@@ -384,6 +399,12 @@ async def shutdown_event():
         print("Background scheduler stopped")
     except Exception as e:
         print(f"Error stopping scheduler: {e}")
+    
+    try:
+        from services.http_client import close_http_client
+        await close_http_client()
+    except Exception as e:
+        print(f"Error closing HTTP client: {e}")
 
 
 if __name__ == "__main__":
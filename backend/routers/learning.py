@@ -20,6 +20,7 @@ from services.target_config import get_symbol_config, SYMBOL_CONFIGS
 from services.learning_analyzer import (
     analyze_factor_correlations,
     generate_learning_insights,
+    generate_learning_insights_for_symbols,
     save_insights_to_db,
     get_active_insights,
 )
@@ -130,6 +131,7 @@ async def get_factor_analysis(
 @router.post("/generate-insights")
 async def trigger_insight_generation(
     symbol: Optional[str] = Query(None),
+    symbols: Optional[List[str]] = Query(None, description="Analyze several symbols concurrently (overrides symbol)"),
     days: int = Query(30, ge=7, le=180),
     save_to_db: bool = Query(True, description="Save insights to database")
 ):
@@ -140,7 +142,10 @@ async def trigger_insight_generation(
     if not is_db_available():
         return {"error": "Database not available"}
     
-    insights = await generate_learning_insights(symbol, days)
+    if symbols:
+        insights = await generate_learning_insights_for_symbols(symbols, days)
+    else:
+        insights = await generate_learning_insights(symbol, days)
     
     saved = 0
     if save_to_db and insights:
@@ -73,13 +73,10 @@ async def get_prediction(symbol: str):
 @router.get("/", response_model=List[PredictionResponse])
 async def get_all_predictions():
     """Get predictions for both NASDAQ and XAUUSD."""
-    from services.ml_prediction_service import get_ml_prediction
-    
-    nasdaq = await get_ml_prediction("NDX.INDX")
-    xauusd = await get_ml_prediction("XAUUSD")
+    from services.ml_prediction_service import get_ml_predictions
     
     results = []
-    for result in [nasdaq, xauusd]:
+    for result in await get_ml_predictions(["NDX.INDX", "XAUUSD"]):
         results.append(PredictionResponse(
             symbol=result.symbol,
             direction=result.direction,
@@ -4,9 +4,11 @@ Simple TTL-based caching for trend analysis results
 """
 
 from __future__ import annotations
+import asyncio
+import functools
 from datetime import datetime
 from threading import Lock
-from typing import Any, Optional, Dict
+from typing import Any, Awaitable, Callable, Optional, Dict
 
 _cache: Dict[str, tuple[float, Any]] = {}  # key -> (expiry_timestamp, value)
 _cache_lock = Lock()
@@ -56,6 +58,67 @@ def clear_all() -> None:
         _cache.clear()
 
 
+def async_ttl_cache(ttl: int = 60) -> Callable:
+    """
+    Cache an async function's result for `ttl` seconds, keyed by its arguments.
+    Concurrent callers with the same arguments share a single in-flight call
+    (single-flight), so a cache miss triggers only one upstream request.
+    `wrapper.cache_clear()` drops every cached result of the function and
+    `await wrapper.refresh(*args)` recomputes one entry ahead of expiry.
+    A key's lock only lives while a call for it is in flight, so arbitrary
+    caller arguments do not accumulate locks.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        prefix = f"{func.__module__}.{func.__qualname__}"
+        locks: Dict[str, asyncio.Lock] = {}
+        
+        def make_key(args: tuple, kwargs: dict) -> str:
+            return f"{prefix}:{args!r}:{sorted(kwargs.items())!r}"
+        
+        def release(key: str, lock: asyncio.Lock) -> None:
+            # Callers already queued on the lock keep their reference and
+            # find the cached value; later callers start from the cache
+            if locks.get(key) is lock:
+                del locks[key]
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            cached = get_cached(key)
+            if cached is not None:
+                return cached
+            
+            lock = locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    # Another caller may have filled the cache while we waited
+                    cached = get_cached(key)
+                    if cached is not None:
+                        return cached
+                    
+                    value = await func(*args, **kwargs)
+                    set_cached(key, value, ttl=ttl)
+                    return value
+            finally:
+                release(key, lock)
+        
+        async def refresh(*args, **kwargs):
+            key = make_key(args, kwargs)
+            lock = locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    value = await func(*args, **kwargs)
+                    set_cached(key, value, ttl=ttl)
+                    return value
+            finally:
+                release(key, lock)
+        
+        wrapper.cache_clear = lambda: invalidate_pattern(f"{prefix}:")
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
+
+
 def get_cache_stats() -> dict:
     """Get cache statistics"""
     with _cache_lock:
@@ -17,6 +17,7 @@ from services.data_fetcher import fetch_eod_candles, fetch_latest_price
 from services.marketaux_service import fetch_marketaux_headlines
 from services.outcome_tracker import check_pending_outcomes, check_multi_target_outcome
 from services.error_analysis_service import check_and_analyze_failed_predictions
+from services.learning_analyzer import INSIGHTS_CACHE_TTL_SECONDS, get_active_insights
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +29,14 @@ DATA_UPDATE_INTERVAL = 5  # Update price/TA data every 5 seconds
 NEWS_UPDATE_INTERVAL = 300  # Update news every 5 minutes
 OUTCOME_CHECK_INTERVAL = 300  # Check outcomes every 5 minutes
 ERROR_ANALYSIS_INTERVAL = 3600  # Analyze errors every hour
+INSIGHTS_REFRESH_INTERVAL = INSIGHTS_CACHE_TTL_SECONDS - 5  # Re-warm insights before the cache entry expires
 
 # Last update timestamps
 _last_news_update: Dict[str, datetime] = {}
 _last_news_hash: Dict[str, str] = {}
 _last_outcome_check: Optional[datetime] = None
 _last_error_analysis: Optional[datetime] = None
+_last_insights_refresh: Optional[datetime] = None
 
 # Scheduler running flag
 _scheduler_running = False
@@ -260,6 +263,27 @@ async def analyze_errors_if_needed():
         logger.error(f"Error in error analysis: {e}")
 
 
+async def refresh_insights_if_needed():
+    """Keep active learning insights for tracked symbols warm in the in-process cache."""
+    global _last_insights_refresh
+    
+    now = datetime.utcnow()
+    
+    if _last_insights_refresh and (now - _last_insights_refresh).total_seconds() < INSIGHTS_REFRESH_INTERVAL:
+        return
+    
+    _last_insights_refresh = now
+    
+    if not is_db_available():
+        return
+    
+    for symbol in TRACKED_SYMBOLS:
+        try:
+            await get_active_insights.refresh(symbol)
+        except Exception as e:
+            logger.error(f"Error refreshing insights for {symbol}: {e}")
+
+
 async def background_scheduler_loop():
     """Main background scheduler loop."""
     global _scheduler_running
@@ -278,6 +302,8 @@ async def background_scheduler_loop():
             await check_outcomes_if_needed()
             # Analyze errors periodically (self-learning)
             await analyze_errors_if_needed()
+            # Keep learning insights warm for prompt building
+            await refresh_insights_if_needed()
         except Exception as e:
             logger.error(f"Scheduler error: {e}")
         
@@ -306,7 +306,9 @@ Bu tahminin neden yanlış gittiğini analiz et ve öğrenme noktalarını belir
 
 async def create_error_analysis(
     prediction_id: str,
-    outcome_id: Optional[str] = None
+    outcome_id: Optional[str] = None,
+    prediction: Optional[Dict[str, Any]] = None,
+    candles_at_prediction: Optional[List[Dict]] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Create a full error analysis for a failed prediction.
@@ -314,6 +316,9 @@ async def create_error_analysis(
     Args:
         prediction_id: UUID of the prediction
         outcome_id: UUID of the outcome result (optional)
+        prediction: Pre-fetched prediction_logs row (skips the lookup)
+        candles_at_prediction: Pre-fetched 'at_prediction' snapshot candles
+            (skips the candle_snapshots lookup)
     
     Returns:
         Error analysis record
@@ -326,9 +331,10 @@ async def create_error_analysis(
         return None
     
     try:
-        # Fetch prediction
-        pred_result = client.table("prediction_logs").select("*").eq("id", prediction_id).execute()
-        prediction = pred_result.get("data", [{}])[0] if pred_result.get("data") else None
+        # Fetch prediction (unless the caller already batch-fetched it)
+        if prediction is None:
+            pred_result = client.table("prediction_logs").select("*").eq("id", prediction_id).execute()
+            prediction = pred_result.get("data", [{}])[0] if pred_result.get("data") else None
         
         if not prediction:
             logger.warning(f"Prediction not found: {prediction_id}")
@@ -367,13 +373,14 @@ async def create_error_analysis(
             error_type = "missed_target"
         
         # Get candle snapshots
-        snap_result = client.table("candle_snapshots").select("*").eq(
-            "prediction_id", prediction_id
-        ).eq("snapshot_type", "at_prediction").execute()
-        
-        candles_at_prediction = []
-        if snap_result.get("data"):
-            candles_at_prediction = snap_result["data"][0].get("candles", [])
+        if candles_at_prediction is None:
+            snap_result = client.table("candle_snapshots").select("*").eq(
+                "prediction_id", prediction_id
+            ).eq("snapshot_type", "at_prediction").execute()
+            
+            candles_at_prediction = []
+            if snap_result.get("data"):
+                candles_at_prediction = snap_result["data"][0].get("candles", [])
         
         # Fetch current candles for "after" comparison
         symbol = prediction.get("symbol", "NDX.INDX")
@@ -578,23 +585,54 @@ async def check_and_analyze_failed_predictions(
             logger.debug("No failed predictions to analyze")
             return []
         
-        # Check which ones don't have error analysis yet
+        candidates = [o for o in outcomes[:limit] if o.get("prediction_id")]
+        pred_ids = list(dict.fromkeys(o["prediction_id"] for o in candidates))
+        if not pred_ids:
+            return []
+        
+        # Check which ones don't have error analysis yet (one IN query)
+        existing = client.table("error_analysis").select("prediction_id").in_(
+            "prediction_id", pred_ids
+        ).execute()
+        analyzed_ids = {row.get("prediction_id") for row in (existing.get("data") or [])}
+        
+        candidates = [o for o in candidates if o["prediction_id"] not in analyzed_ids]
+        pred_ids = [pid for pid in pred_ids if pid not in analyzed_ids]
+        if not candidates:
+            logger.debug("All failed predictions already analyzed")
+            return []
+        
+        # Batch-fetch predictions and their 'at_prediction' snapshots
+        preds = client.table("prediction_logs").select("*").in_("id", pred_ids).execute()
+        preds_by_id: Dict[str, Dict[str, Any]] = {
+            p["id"]: p for p in (preds.get("data") or []) if p.get("id")
+        }
+        
+        snaps = client.table("candle_snapshots").select("prediction_id, candles").in_(
+            "prediction_id", pred_ids
+        ).eq("snapshot_type", "at_prediction").execute()
+        candles_by_pred: Dict[str, List[Dict]] = {}
+        for snap in snaps.get("data") or []:
+            candles_by_pred.setdefault(snap.get("prediction_id"), snap.get("candles") or [])
+        
         analyses_created = []
         
-        for outcome in outcomes[:limit]:
-            prediction_id = outcome.get("prediction_id")
+        for outcome in candidates:
+            prediction_id = outcome["prediction_id"]
             outcome_id = outcome.get("id")
+            prediction = preds_by_id.get(prediction_id)
             
-            # Check if analysis exists
-            existing = client.table("error_analysis").select("id").eq(
-                "prediction_id", prediction_id
-            ).execute()
-            
-            if existing.get("data"):
-                continue  # Already analyzed
+            if prediction is None:
+                logger.warning(f"Prediction not found: {prediction_id}")
+                continue
             
             # Create analysis
-            analysis = await create_error_analysis(prediction_id, outcome_id)
+            analysis = await create_error_analysis(
+                prediction_id,
+                outcome_id,
+                prediction=prediction,
+                candles_at_prediction=candles_by_pred.get(prediction_id, []),
+            )
             if analysis:
                 analyses_created.append(analysis)
         
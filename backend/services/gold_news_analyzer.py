@@ -11,19 +11,23 @@ Gold is heavily influenced by:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import httpx
+import numpy as np
 
 from config import settings
+from services.analysis_cache import async_ttl_cache
+from services.http_client import CircuitBreaker, get_with_retry, response_json
+from services.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class GoldNewsImpact:
     """Impact analysis for gold from news"""
     sentiment_score: float  # -1 (bearish) to +1 (bullish for gold)
@@ -80,6 +84,30 @@ HIGH_IMPACT_EVENTS = [
 ]
 
 
+# Weighted keyword automaton: payload is (category, weight)
+_HEADLINE_MATCHER = KeywordMatcher(
+    [(kw, ("event", 0)) for kw in HIGH_IMPACT_EVENTS]
+    + [
+        (kw, ("bullish", 2 if kw in ("war", "conflict", "nuclear", "invasion", "crisis") else 1))
+        for kw in GOLD_BULLISH_KEYWORDS
+    ]
+    + [
+        (kw, ("bearish", 2 if kw in ("rate hike", "hawkish", "dollar surges") else 1))
+        for kw in GOLD_BEARISH_KEYWORDS
+    ]
+)
+
+# One alternation over all event names (case-insensitive substring match)
+_HIGH_IMPACT_EVENT_RE = re.compile(
+    "|".join(map(re.escape, HIGH_IMPACT_EVENTS)), re.IGNORECASE
+)
+
+# Headline keywords surfaced as key factors, pre-titled for display
+_KEY_FACTOR_MATCHER = KeywordMatcher(
+    (kw, kw.title()) for kw in GOLD_BULLISH_KEYWORDS[:10] + GOLD_BEARISH_KEYWORDS[:10]
+)
+
+
 def analyze_headline(headline: str) -> Tuple[float, str]:
     """
     Analyze a single headline for gold impact.
@@ -91,27 +119,14 @@ def analyze_headline(headline: str) -> Tuple[float, str]:
     bearish_score = 0
     is_high_impact = False
     
-    # Check for high impact events
-    for event in HIGH_IMPACT_EVENTS:
-        if event in headline_lower:
+    # Single pass over the headline for events and bullish/bearish keywords
+    for _, (category, weight) in _HEADLINE_MATCHER.find(headline_lower):
+        if category == "bullish":
+            bullish_score += weight
+        elif category == "bearish":
+            bearish_score += weight
+        else:
             is_high_impact = True
-            break
-    
-    # Check bullish keywords
-    for keyword in GOLD_BULLISH_KEYWORDS:
-        if keyword in headline_lower:
-            if keyword in ["war", "conflict", "nuclear", "invasion", "crisis"]:
-                bullish_score += 2  # High impact geopolitical
-            else:
-                bullish_score += 1
-    
-    # Check bearish keywords
-    for keyword in GOLD_BEARISH_KEYWORDS:
-        if keyword in headline_lower:
-            if keyword in ["rate hike", "hawkish", "dollar surges"]:
-                bearish_score += 2  # High impact monetary
-            else:
-                bearish_score += 1
     
     # Calculate net score
     net_score = bullish_score - bearish_score
@@ -128,6 +143,14 @@ def analyze_headline(headline: str) -> Tuple[float, str]:
     return sentiment, impact_level
 
 
+# News moves on the order of minutes; polling callers hit the cache
+NEWS_CACHE_TTL_SECONDS = 60
+
+# Shared by both EODHD endpoints: during an outage, skip the network entirely
+_EODHD_CIRCUIT = CircuitBreaker(failure_threshold=3, reset_seconds=60.0)
+
+
+@async_ttl_cache(ttl=NEWS_CACHE_TTL_SECONDS)
 async def fetch_gold_news(limit: int = 30) -> List[Dict]:
     """Fetch news relevant to gold/XAUUSD"""
     
@@ -141,19 +164,26 @@ async def fetch_gold_news(limit: int = 30) -> List[Dict]:
         "s": "XAUUSD,GLD.US,GC.CMX",  # Gold symbols
     }
     
+    if _EODHD_CIRCUIT.is_open():
+        logger.debug("EODHD circuit open, serving sample gold news")
+        return _sample_gold_news()
+    
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                "https://eodhistoricaldata.com/api/news",
-                params=params
-            )
-            response.raise_for_status()
-            return response.json() or []
+        response = await get_with_retry(
+            "https://eodhistoricaldata.com/api/news",
+            params=params
+        )
+        response.raise_for_status()
+        news = response_json(response) or []
+        _EODHD_CIRCUIT.record_success()
+        return news
     except Exception as e:
+        _EODHD_CIRCUIT.record_failure()
         logger.warning(f"Failed to fetch gold news: {e}")
         return _sample_gold_news()
 
 
+@async_ttl_cache(ttl=NEWS_CACHE_TTL_SECONDS)
 async def fetch_economic_calendar() -> List[Dict]:
     """Fetch upcoming economic events that impact gold"""
     
@@ -170,25 +200,24 @@ async def fetch_economic_calendar() -> List[Dict]:
         "fmt": "json",
     }
     
+    if _EODHD_CIRCUIT.is_open():
+        logger.debug("EODHD circuit open, skipping economic calendar")
+        return []
+    
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                "https://eodhistoricaldata.com/api/economic-events",
-                params=params
-            )
-            response.raise_for_status()
-            events = response.json() or []
-            
-            # Filter high-impact events
-            gold_relevant = []
-            for event in events:
-                event_name = (event.get("event") or "").lower()
-                if any(kw in event_name for kw in HIGH_IMPACT_EVENTS):
-                    gold_relevant.append(event)
-            
-            return gold_relevant
-            
+        response = await get_with_retry(
+            "https://eodhistoricaldata.com/api/economic-events",
+            params=params
+        )
+        response.raise_for_status()
+        events = response_json(response) or []
+        _EODHD_CIRCUIT.record_success()
+        
+        # Filter high-impact events
+        return [e for e in events if _HIGH_IMPACT_EVENT_RE.search(e.get("event") or "")]
+        
     except Exception as e:
+        _EODHD_CIRCUIT.record_failure()
         logger.warning(f"Failed to fetch economic calendar: {e}")
         return []
 
@@ -199,8 +228,12 @@ async def analyze_gold_news_impact() -> GoldNewsImpact:
     Returns comprehensive sentiment analysis for trading decisions.
     """
     
-    news = await fetch_gold_news(limit=50)
-    events = await fetch_economic_calendar()
+    # Independent round-trips: run them concurrently
+    async with asyncio.TaskGroup() as tg:
+        news_task = tg.create_task(fetch_gold_news(limit=50))
+        events_task = tg.create_task(fetch_economic_calendar())
+    news = news_task.result()
+    events = events_task.result()
     
     if not news:
         return GoldNewsImpact(
@@ -213,33 +246,33 @@ async def analyze_gold_news_impact() -> GoldNewsImpact:
             high_impact_events=[]
         )
     
-    total_sentiment = 0
-    high_impact_count = 0
     key_factors = []
     high_impact_news = []
     
-    for article in news:
-        title = article.get("title") or ""
-        sentiment, impact = analyze_headline(title)
-        
-        total_sentiment += sentiment
+    # Score every headline, then aggregate with vectorized reductions
+    titles = [article.get("title") or "" for article in news]
+    analyzed = [analyze_headline(title) for title in titles]
+    n = len(analyzed)
+    sentiments = np.fromiter((sentiment for sentiment, _ in analyzed), dtype=np.float64, count=n)
+    high_mask = np.fromiter((impact == "high" for _, impact in analyzed), dtype=bool, count=n)
+    
+    high_impact_count = int(high_mask.sum())
+    
+    for idx in np.flatnonzero(high_mask):
+        title = titles[idx]
+        sentiment = sentiments[idx]
+        high_impact_news.append({
+            "title": title[:100],
+            "sentiment": "bullish" if sentiment > 0 else ("bearish" if sentiment < 0 else "neutral"),
+            "date": news[idx].get("date", "")
+        })
         
-        if impact == "high":
-            high_impact_count += 1
-            high_impact_news.append({
-                "title": title[:100],
-                "sentiment": "bullish" if sentiment > 0 else ("bearish" if sentiment < 0 else "neutral"),
-                "date": article.get("date", "")
-            })
-            
-            # Extract key factor
-            title_lower = title.lower()
-            for kw in GOLD_BULLISH_KEYWORDS[:10] + GOLD_BEARISH_KEYWORDS[:10]:
-                if kw in title_lower:
-                    factor = f"{'🟢' if sentiment > 0 else '🔴'} {kw.title()}"
-                    if factor not in key_factors:
-                        key_factors.append(factor)
-                    break
+        # Extract key factor (first listed keyword wins)
+        hit = _KEY_FACTOR_MATCHER.first(title.lower())
+        if hit is not None:
+            factor = f"{'🟢' if sentiment > 0 else '🔴'} {hit[1]}"
+            if factor not in key_factors:
+                key_factors.append(factor)
     
     # Add upcoming events as factors
     for event in events[:3]:
@@ -248,7 +281,7 @@ async def analyze_gold_news_impact() -> GoldNewsImpact:
         key_factors.append(f"📅 Upcoming: {event_name} ({event_date})")
     
     # Calculate average sentiment
-    avg_sentiment = total_sentiment / len(news) if news else 0
+    avg_sentiment = float(sentiments.mean()) if n else 0
     
     # Determine confidence based on news volume and impact
     base_confidence = 50
@@ -12,16 +12,23 @@ Key Improvements over V1:
 """
 from __future__ import annotations
 
+import calendar
+import heapq
 import logging
 import re
 import time
 import math
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple, Any
+from urllib.parse import urlparse
 from dataclasses import dataclass, field
-import httpx
+from functools import lru_cache
+import numpy as np
 
 from config import settings
+from services.analysis_cache import async_ttl_cache
+from services.http_client import get_with_retry, response_json
+from services.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +37,7 @@ logger = logging.getLogger(__name__)
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class NewsArticle:
     """Parsed news article with metadata"""
     title: str
@@ -46,9 +53,10 @@ class NewsArticle:
     context_modifier: float = 1.0
     final_score: float = 0.0
     validated: bool = False
+    title_lower: str = field(default="", repr=False)  # Cached title.lower()
 
 
-@dataclass
+@dataclass(slots=True)
 class GoldNewsImpactV2:
     """Advanced impact analysis for gold from news"""
     sentiment_score: float  # -1 (bearish) to +1 (bullish for gold)
@@ -106,24 +114,78 @@ SOURCE_WEIGHTS = {
 }
 
 
+_TRIE_DOMAIN = "$"  # Terminal marker; never a valid hostname label
+
+
+def _build_domain_trie(domains: List[str]) -> Dict[str, Any]:
+    """Nested dict keyed by reversed domain labels: reuters.com -> com -> reuters"""
+    trie: Dict[str, Any] = {}
+    for domain in domains:
+        if domain == "default":
+            continue
+        node = trie
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        node[_TRIE_DOMAIN] = domain
+    return trie
+
+
+_SOURCE_DOMAIN_TRIE = _build_domain_trie(list(SOURCE_WEIGHTS))
+
+
+@lru_cache(maxsize=1024)
+def match_source_domain(source_url: str) -> Optional[str]:
+    """
+    Return the SOURCE_WEIGHTS domain a source URL belongs to, if any.
+    Longest suffix match on the hostname, so "uk.reuters.com" maps to
+    "reuters.com" while "fox.com" no longer matches "x.com".
+    """
+    if not source_url:
+        return None
+    
+    source = source_url.strip().lower()
+    if "://" not in source:
+        source = "//" + source  # Bare domains like "reuters.com/markets"
+    try:
+        hostname = urlparse(source).hostname or ""
+    except ValueError:
+        return None
+    
+    node = _SOURCE_DOMAIN_TRIE
+    matched = None
+    for label in reversed(hostname.split(".")):
+        node = node.get(label)
+        if node is None:
+            break
+        matched = node.get(_TRIE_DOMAIN, matched)
+    
+    return matched
+
+
 def get_source_weight(source_url: str) -> float:
     """Get reliability weight for a news source"""
-    if not source_url:
+    domain = match_source_domain(source_url)
+    if domain is None:
         return SOURCE_WEIGHTS["default"]
-    
-    source_lower = source_url.lower()
-    for domain, weight in SOURCE_WEIGHTS.items():
-        if domain in source_lower:
-            return weight
-    
-    return SOURCE_WEIGHTS["default"]
+    return SOURCE_WEIGHTS[domain]
 
 
 # =============================================================================
 # TIME DECAY - News Freshness
 # =============================================================================
 
-def calculate_time_decay(publish_timestamp: float, half_life_minutes: int = 30) -> float:
+DECAY_LAMBDA = 0.693  # ln(2) ≈ 0.693
+MIN_DECAY_FACTOR = 0.05  # Minimum 5% impact
+
+# Age (in half-lives) past which the decay is pinned at MIN_DECAY_FACTOR
+_FLOOR_HALF_LIVES = math.log(1 / MIN_DECAY_FACTOR) / DECAY_LAMBDA
+
+
+def calculate_time_decay(
+    publish_timestamp: float,
+    half_life_minutes: int = 30,
+    now: Optional[float] = None,
+) -> float:
     """
     Calculate decay factor based on news age.
     
@@ -135,36 +197,114 @@ def calculate_time_decay(publish_timestamp: float, half_life_minutes: int = 30)
     
     Minimum 5% impact to not completely ignore old relevant news.
     """
-    now = time.time()
+    if now is None:
+        now = time.time()
     age_minutes = (now - publish_timestamp) / 60
     
     if age_minutes < 0:
         return 1.0  # Future dated (scheduled news)
+    if age_minutes >= _FLOOR_HALF_LIVES * half_life_minutes:
+        return MIN_DECAY_FACTOR  # Old news: skip the exp, result is the floor anyway
+    
+    decay_factor = math.exp(-DECAY_LAMBDA * age_minutes / half_life_minutes)
+    return max(decay_factor, MIN_DECAY_FACTOR)
+
+
+def calculate_time_decay_batch(
+    publish_timestamps: np.ndarray,
+    half_life_minutes: int = 30,
+    now: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Vectorized `calculate_time_decay` over an array of Unix timestamps.
+    Samples the clock once for the whole batch.
+    """
+    if now is None:
+        now = time.time()
+    age_minutes = (now - np.asarray(publish_timestamps, dtype=np.float64)) / 60
+    
+    # Future-dated news clips to age 0 -> factor 1.0
+    decay = np.exp(-DECAY_LAMBDA * np.maximum(age_minutes, 0.0) / half_life_minutes)
+    return np.maximum(decay, MIN_DECAY_FACTOR)
+
+
+UNKNOWN_NEWS_AGE_SECONDS = 3600  # Undated/unparseable news: assume 1 hour old
+
+# ISO-8601-shaped dates as returned by news APIs:
+# "2024-01-15", "2024-01-15 14:30:00", "2024-01-15T14:30:00.123Z", "...+00:00"
+_TIMESTAMP_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(\.\d+)?)?)?"
+    r"\s*(Z|[+-]\d{2}:?\d{2})?$"
+)
+
+
+# Feeds repeat the same publish times across polls (and often within a batch)
+TIMESTAMP_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _parse_timestamp_or_none(date_str: str) -> Optional[float]:
+    """
+    ISO-8601 via datetime.fromisoformat, regex fallback; naive times are taken as UTC.
+    Pure function of the string, so it is memoized; the clock-based default for
+    unparseable dates stays in the callers.
+    """
+    # Fast path: C-level ISO parser (3.11+ accepts a trailing 'Z')
+    try:
+        dt = datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
+    else:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    
+    match = _TIMESTAMP_RE.match(date_str.strip())
+    if match is None:
+        return None
     
-    decay_factor = math.exp(-0.693 * age_minutes / half_life_minutes)  # ln(2) ≈ 0.693
-    return max(decay_factor, 0.05)  # Minimum 5% impact
+    year, month, day, hour, minute, second, fraction, tz = match.groups()
+    try:
+        ts = calendar.timegm((
+            int(year), int(month), int(day),
+            int(hour or 0), int(minute or 0), int(second or 0),
+            0, 0, 0,
+        ))
+    except (ValueError, OverflowError):
+        return None
+    
+    if fraction:
+        ts += float(fraction)
+    if tz and tz != "Z":
+        sign = -1 if tz[0] == "-" else 1
+        offset = tz[1:].replace(":", "")
+        ts -= sign * (int(offset[:2]) * 3600 + int(offset[2:]) * 60)
+    
+    return float(ts)
 
 
 def parse_news_timestamp(date_str: str) -> float:
     """Parse various date formats to Unix timestamp"""
-    if not date_str:
-        return time.time() - 3600  # Default: 1 hour ago
-    
-    formats = [
-        "%Y-%m-%dT%H:%M:%S.%fZ",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-    ]
-    
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.timestamp()
-        except ValueError:
-            continue
+    if date_str:
+        ts = _parse_timestamp_or_none(date_str)
+        if ts is not None:
+            return ts
     
-    return time.time() - 3600  # Default if parsing fails
+    return time.time() - UNKNOWN_NEWS_AGE_SECONDS  # Default if missing or parsing fails
+
+
+def parse_news_timestamps(date_strs: List[str]) -> np.ndarray:
+    """Batch version of `parse_news_timestamp`; samples the clock once for fallbacks"""
+    fallback = time.time() - UNKNOWN_NEWS_AGE_SECONDS
+    parsed = (
+        (_parse_timestamp_or_none(d) if d else None) for d in date_strs
+    )
+    return np.fromiter(
+        (fallback if ts is None else ts for ts in parsed),
+        dtype=np.float64,
+        count=len(date_strs),
+    )
 
 
 # =============================================================================
@@ -305,15 +445,28 @@ GOLD_KEYWORDS_V2 = {
 }
 
 
-def get_event_impact_multiplier(headline: str) -> float:
-    """Get impact multiplier based on event type in headline"""
-    headline_lower = headline.lower()
-    
+# Both polarities flattened into one automaton; payload is
+# (impact, display label) so matching needs no per-hit formatting
+_GOLD_KEYWORD_MATCHER = KeywordMatcher(
+    [(kw, (impact, f"🟢 {kw}")) for kw, impact in GOLD_KEYWORDS_V2["bullish"].items()]
+    + [(kw, (impact, f"🔴 {kw}")) for kw, impact in GOLD_KEYWORDS_V2["bearish"].items()]
+)
+
+
+# Frozen (event, impact) pairs sorted by impact, highest first, so the
+# first registered hit is the maximum
+_EVENT_MATCHER = KeywordMatcher(
+    sorted(EVENT_IMPACT_SCORES.items(), key=lambda kv: -kv[1])
+)
+
+
+def get_event_impact_multiplier(headline_lower: str) -> float:
+    """Get impact multiplier based on event type in an already-lowercased headline"""
     max_impact = 0.10  # Default baseline
     
-    for event, impact in EVENT_IMPACT_SCORES.items():
-        if event in headline_lower:
-            max_impact = max(max_impact, impact)
+    hit = _EVENT_MATCHER.first(headline_lower)
+    if hit is not None:
+        max_impact = max(max_impact, hit[1])
     
     return max_impact
 
@@ -350,108 +503,177 @@ INTENSIFIER_WORDS = [
 ]
 
 
-def detect_negation(headline: str) -> bool:
-    """Detect if headline contains negation that reverses meaning"""
-    headline_lower = headline.lower()
-    
-    for neg in NEGATION_WORDS:
-        if neg in headline_lower:
-            return True
-    
-    return False
+def _word_alternation(words: List[str]) -> str:
+    # Whole words plus simple inflections ("delay" -> "delays", "delayed");
+    # words under 4 letters stay exact so "no"/"not" miss "nod"/"noted"
+    inflected = "|".join(re.escape(word) for word in words if len(word) >= 4)
+    exact = "|".join(re.escape(word) for word in words if len(word) < 4)
+    alternatives = [f"(?:{inflected})(?:s|es|d|ed|ing)?" if inflected else "", exact]
+    return r"\b(?:" + "|".join(filter(None, alternatives)) + r")\b"
+
+
+# Patterns compiled once; the three context categories share one regex pass
+_NEGATION_RE = re.compile(_word_alternation(NEGATION_WORDS))
+_CONTEXT_RE = re.compile(
+    f"(?P<unc>{_word_alternation(UNCERTAINTY_WORDS)})"
+    f"|(?P<conf>{_word_alternation(CONFIRMATION_WORDS)})"
+    f"|(?P<int>{_word_alternation(INTENSIFIER_WORDS)})"
+)
+
 
+def detect_negation(headline_lower: str) -> bool:
+    """Detect if an already-lowercased headline contains negation that reverses meaning"""
+    return _NEGATION_RE.search(headline_lower) is not None
 
-def calculate_context_modifier(headline: str) -> float:
+
+def calculate_context_modifier(headline_lower: str) -> float:
     """
     Calculate context modifier based on certainty/uncertainty.
+    Expects an already-lowercased headline.
     Returns: 0.3 (very uncertain) to 1.5 (confirmed + intense)
     """
-    headline_lower = headline.lower()
+    # Distinct words per category, collected in a single regex scan
+    hits: Dict[str, set] = {"unc": set(), "conf": set(), "int": set()}
+    for match in _CONTEXT_RE.finditer(headline_lower):
+        hits[match.lastgroup].add(match.group())
+    
     modifier = 1.0
     
     # Check for uncertainty (reduces impact)
-    uncertainty_count = sum(1 for word in UNCERTAINTY_WORDS if word in headline_lower)
+    uncertainty_count = len(hits["unc"])
     if uncertainty_count > 0:
         modifier *= (0.7 ** uncertainty_count)  # Each uncertainty word reduces by 30%
     
     # Check for confirmation (increases impact)
-    confirmation_count = sum(1 for word in CONFIRMATION_WORDS if word in headline_lower)
+    confirmation_count = len(hits["conf"])
     if confirmation_count > 0:
         modifier *= (1.15 ** min(confirmation_count, 2))  # Max 32% boost
     
     # Check for intensifiers
-    intensifier_count = sum(1 for word in INTENSIFIER_WORDS if word in headline_lower)
+    intensifier_count = len(hits["int"])
     if intensifier_count > 0:
         modifier *= (1.1 ** min(intensifier_count, 2))  # Max 21% boost
     
     return max(0.3, min(1.5, modifier))
 
 
-def analyze_headline_v2(headline: str, source: str = "", timestamp: float = None) -> NewsArticle:
+HEADLINE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=HEADLINE_CACHE_SIZE)
+def _analyze_headline_content(
+    headline: str, source: str
+) -> Tuple[str, float, float, float, bool, float, float, Tuple[str, ...]]:
     """
-    Advanced headline analysis with context awareness.
+    Timestamp-independent part of the headline analysis, memoized because
+    live feeds repeat the same (headline, source) across polls.
     
-    Example:
-    "Fed delays rate cut" -> Negation detected, BEARISH (not bullish)
-    "Fed may consider rate cut" -> Uncertainty, weak bullish
-    "Fed announces immediate rate cut" -> Confirmed, strong bullish
+    Returns: (headline_lower, source_weight, raw_sentiment, adjusted_sentiment,
+              negation_detected, context_modifier, event_impact, matched_keywords)
     """
-    if timestamp is None:
-        timestamp = time.time()
-    
     headline_lower = headline.lower()
     
-    # Initialize article
-    article = NewsArticle(
-        title=headline,
-        source=source,
-        timestamp=timestamp,
-    )
-    
     # 1. Get source weight
-    article.source_weight = get_source_weight(source)
+    source_weight = get_source_weight(source)
     
-    # 2. Calculate time decay
-    article.decay_factor = calculate_time_decay(timestamp)
+    # Event impact drives impact_level even for headlines with no sentiment
+    event_impact = get_event_impact_multiplier(headline_lower)
+    
+    # 2. Sentiment keywords first: most headlines have none, and then the score
+    #    is 0 whatever negation/context say, so those regex passes are skipped
+    keyword_hits = _GOLD_KEYWORD_MATCHER.find(headline_lower)
+    if not keyword_hits:
+        return (headline_lower, source_weight, 0.0, 0.0, False, 1.0, event_impact, ())
     
     # 3. Detect negation
-    article.negation_detected = detect_negation(headline)
+    negation_detected = detect_negation(headline_lower)
     
     # 4. Calculate context modifier
-    article.context_modifier = calculate_context_modifier(headline)
+    context_modifier = calculate_context_modifier(headline_lower)
     
     # 5. Calculate raw sentiment from keywords
     raw_score = 0.0
     matched_keywords = []
     
-    # Check bullish keywords
-    for keyword, impact in GOLD_KEYWORDS_V2["bullish"].items():
-        if keyword in headline_lower:
-            raw_score += impact
-            matched_keywords.append(f"🟢 {keyword}")
-    
-    # Check bearish keywords
-    for keyword, impact in GOLD_KEYWORDS_V2["bearish"].items():
-        if keyword in headline_lower:
-            raw_score += impact  # Already negative
-            matched_keywords.append(f"🔴 {keyword}")
+    # Bullish and bearish keywords in one pass (bearish impacts are negative)
+    for _, (impact, label) in keyword_hits:
+        raw_score += impact
+        matched_keywords.append(label)
     
-    article.raw_sentiment = raw_score
+    raw_sentiment = raw_score
     
     # 6. Apply negation (reverses sentiment!)
-    if article.negation_detected and abs(raw_score) > 0:
+    if negation_detected and abs(raw_score) > 0:
         raw_score = -raw_score * 0.8  # Reverse with 80% magnitude
-        logger.debug(f"Negation applied: {headline[:50]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Negation applied: %s...", headline[:50])
     
     # 7. Apply all modifiers
-    adjusted_score = raw_score * article.context_modifier
+    adjusted_score = raw_score * context_modifier
+    
+    return (
+        headline_lower,
+        source_weight,
+        raw_sentiment,
+        adjusted_score,
+        negation_detected,
+        context_modifier,
+        event_impact,
+        tuple(matched_keywords),
+    )
+
+
+def analyze_headline_v2(
+    headline: str,
+    source: str = "",
+    timestamp: float = None,
+    decay_factor: Optional[float] = None,
+) -> NewsArticle:
+    """
+    Advanced headline analysis with context awareness.
+    `decay_factor` may be passed when it was already computed for a batch
+    (see `calculate_time_decay_batch`).
+    
+    Example:
+    "Fed delays rate cut" -> Negation detected, BEARISH (not bullish)
+    "Fed may consider rate cut" -> Uncertainty, weak bullish
+    "Fed announces immediate rate cut" -> Confirmed, strong bullish
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    
+    (
+        headline_lower,
+        source_weight,
+        raw_sentiment,
+        adjusted_score,
+        negation_detected,
+        context_modifier,
+        event_impact,
+        _,
+    ) = _analyze_headline_content(headline, source)
+    
+    article = NewsArticle(
+        title=headline,
+        source=source,
+        timestamp=timestamp,
+        raw_sentiment=raw_sentiment,
+        adjusted_sentiment=adjusted_score,
+        source_weight=source_weight,
+        negation_detected=negation_detected,
+        context_modifier=context_modifier,
+        title_lower=headline_lower,
+    )
     
-    # 8. Calculate final score with decay and source weight
-    article.final_score = adjusted_score * article.decay_factor * article.source_weight
-    article.adjusted_sentiment = adjusted_score
+    # Time decay is the only timestamp-dependent factor
+    if decay_factor is None:
+        decay_factor = calculate_time_decay(timestamp)
+    article.decay_factor = decay_factor
     
-    # 9. Determine impact level
-    event_impact = get_event_impact_multiplier(headline)
+    # Final score with decay and source weight
+    article.final_score = adjusted_score * article.decay_factor * source_weight
+    
+    # Determine impact level
     if event_impact >= 0.30 or abs(article.final_score) >= 0.25:
         article.impact_level = "high"
     elif event_impact >= 0.15 or abs(article.final_score) >= 0.12:
@@ -504,37 +726,69 @@ def calculate_economic_surprise(event: str, forecast: float, actual: float) -> f
 # CONFLICT DETECTION - Mixed Signals
 # =============================================================================
 
-def detect_conflicts(articles: List[NewsArticle]) -> List[str]:
+# Contradiction phrases tracked while aggregating: phrase -> flag name
+CONFLICT_PHRASES = {
+    "rate cut": "rate_cut",
+    "rate hike": "rate_hike",
+    "dollar strength": "usd_strong",
+    "dollar surge": "usd_strong",
+    "dollar weakness": "usd_weak",
+    "dollar fall": "usd_weak",
+}
+
+_CONFLICT_MATCHER = KeywordMatcher(CONFLICT_PHRASES.items())
+
+
+def conflict_flags(headline_lower: str) -> List[str]:
+    """Conflict flags raised by a single (lowercased) headline"""
+    return [flag for _, flag in _CONFLICT_MATCHER.find(headline_lower)]
+
+
+def detect_conflicts(bullish_count: int, bearish_count: int, flags: Set[str]) -> List[str]:
     """
     Detect conflicting signals in news batch.
+    Takes counts of clearly bullish/bearish articles and the union of
+    `conflict_flags` over the batch, all gathered in the aggregation pass.
     Returns list of conflict descriptions.
     """
     conflicts = []
     
-    bullish_count = sum(1 for a in articles if a.final_score > 0.1)
-    bearish_count = sum(1 for a in articles if a.final_score < -0.1)
-    
     # Major conflict: significant bullish AND bearish signals
     if bullish_count >= 2 and bearish_count >= 2:
         conflicts.append(f"⚠️ Mixed signals: {bullish_count} bullish vs {bearish_count} bearish headlines")
     
     # Check for specific contradictions
-    headlines_lower = [a.title.lower() for a in articles]
-    
-    if any("rate cut" in h for h in headlines_lower) and any("rate hike" in h for h in headlines_lower):
+    if "rate_cut" in flags and "rate_hike" in flags:
         conflicts.append("⚠️ Conflicting rate expectations in news")
     
-    if any("dollar strength" in h or "dollar surge" in h for h in headlines_lower) and \
-       any("dollar weakness" in h or "dollar fall" in h for h in headlines_lower):
+    if "usd_strong" in flags and "usd_weak" in flags:
         conflicts.append("⚠️ Conflicting USD direction signals")
     
     return conflicts
 
 
+CONFLICT_SCORE_THRESHOLD = 0.1  # |final_score| above this counts as a clear bullish/bearish headline
+
+
+def detect_conflicts_from_scores(scores: np.ndarray, flags: Set[str]) -> List[str]:
+    """
+    `detect_conflicts` over a batch's final_score array: bullish/bearish
+    counts come from two vectorized comparisons instead of a per-article tally.
+    """
+    bullish_count = int(np.count_nonzero(scores > CONFLICT_SCORE_THRESHOLD))
+    bearish_count = int(np.count_nonzero(scores < -CONFLICT_SCORE_THRESHOLD))
+    return detect_conflicts(bullish_count, bearish_count, flags)
+
+
 # =============================================================================
 # MAIN ANALYSIS FUNCTION
 # =============================================================================
 
+# News moves on the order of minutes; repeated fetches within this window reuse the parsed feed
+NEWS_CACHE_TTL_SECONDS = 60
+
+
+@async_ttl_cache(ttl=NEWS_CACHE_TTL_SECONDS)
 async def fetch_gold_news_v2(limit: int = 50) -> List[Dict]:
     """Fetch news relevant to gold/XAUUSD with source info"""
     
@@ -549,18 +803,32 @@ async def fetch_gold_news_v2(limit: int = 50) -> List[Dict]:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            response = await client.get(
-                "https://eodhistoricaldata.com/api/news",
-                params=params
-            )
-            response.raise_for_status()
-            return response.json() or []
+        response = await get_with_retry(
+            "https://eodhistoricaldata.com/api/news",
+            params=params,
+            timeout=15.0,
+            follow_redirects=True
+        )
+        response.raise_for_status()
+        return response_json(response) or []
     except Exception as e:
         logger.warning(f"Failed to fetch gold news: {e}")
         return _sample_gold_news_v2()
 
 
+# Indexed by sign(score) + 1: bearish, neutral, bullish
+_SENTIMENT_ICONS = ("🔴", "⚪", "🟢")
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+# Shared by every prediction request within the window; concurrent callers await one run
+IMPACT_CACHE_TTL_SECONDS = 45
+
+
+@async_ttl_cache(ttl=IMPACT_CACHE_TTL_SECONDS)
 async def analyze_gold_news_impact_v2() -> GoldNewsImpactV2:
     """
     Advanced analysis of news impact on gold.
@@ -592,23 +860,26 @@ async def analyze_gold_news_impact_v2() -> GoldNewsImpactV2:
     articles: List[NewsArticle] = []
     source_counts: Dict[str, int] = {}
     
-    for item in raw_news:
-        title = item.get("title") or ""
+    flags: Set[str] = set()
+    
+    items = [item for item in raw_news if item.get("title")]
+    timestamps = parse_news_timestamps([item.get("date") or "" for item in items])
+    decay_factors = calculate_time_decay_batch(timestamps)
+    
+    for item, timestamp, decay in zip(items, timestamps.tolist(), decay_factors.tolist()):
+        title = item["title"]
         source = item.get("link") or item.get("source") or ""
-        date_str = item.get("date") or ""
-        
-        if not title:
-            continue
         
-        timestamp = parse_news_timestamp(date_str)
-        article = analyze_headline_v2(title, source, timestamp)
+        article = analyze_headline_v2(title, source, timestamp, decay_factor=decay)
         articles.append(article)
         
+        # Conflict flags gathered in the same pass
+        flags.update(conflict_flags(article.title_lower))
+        
         # Track source distribution
-        for domain in SOURCE_WEIGHTS.keys():
-            if domain != "default" and domain in source.lower():
-                source_counts[domain] = source_counts.get(domain, 0) + 1
-                break
+        domain = match_source_domain(source)
+        if domain is not None:
+            source_counts[domain] = source_counts.get(domain, 0) + 1
     
     if not articles:
         return GoldNewsImpactV2(
@@ -621,29 +892,35 @@ async def analyze_gold_news_impact_v2() -> GoldNewsImpactV2:
             high_impact_events=[],
         )
     
+    # Parallel arrays over the articles for the vectorized reductions below
+    n = len(articles)
+    scores = np.fromiter((a.final_score for a in articles), dtype=np.float64, count=n)
+    decays = np.fromiter((a.decay_factor for a in articles), dtype=np.float64, count=n)
+    weights = np.fromiter((a.source_weight for a in articles), dtype=np.float64, count=n)
+    article_ts = np.fromiter((a.timestamp for a in articles), dtype=np.float64, count=n)
+    high_mask = np.fromiter((a.impact_level == "high" for a in articles), dtype=bool, count=n)
+    
     # Calculate weighted sentiment
-    total_weight = sum(a.decay_factor * a.source_weight for a in articles)
-    weighted_sentiment = sum(a.final_score for a in articles) / max(total_weight, 1)
+    total_weight = float(np.dot(decays, weights))
+    weighted_sentiment = float(scores.sum()) / max(total_weight, 1)
     
     # Detect conflicts
-    conflicts = detect_conflicts(articles)
+    conflicts = detect_conflicts_from_scores(scores, flags)
     
     # If major conflicts, reduce confidence
     conflict_penalty = len(conflicts) * 10
     
-    # Get high impact articles
-    high_impact_articles = sorted(
-        [a for a in articles if a.impact_level == "high"],
-        key=lambda x: abs(x.final_score),
-        reverse=True
-    )[:5]
+    # Get high impact articles: top 5 by |score| without a full sort (ties keep feed order)
+    abs_scores = np.abs(scores)
+    top_idx = heapq.nlargest(5, np.flatnonzero(high_mask).tolist(), key=abs_scores.__getitem__)
+    high_impact_articles = [articles[i] for i in top_idx]
     
     # Build key factors
-    key_factors = []
-    for article in high_impact_articles:
-        sentiment_icon = "🟢" if article.final_score > 0 else ("🔴" if article.final_score < 0 else "⚪")
-        decay_info = f"({article.decay_factor*100:.0f}% fresh)"
-        key_factors.append(f"{sentiment_icon} {article.title[:60]}... {decay_info}")
+    key_factors = [
+        f"{_SENTIMENT_ICONS[_sign(article.final_score) + 1]} {article.title[:60]}... "
+        f"({article.decay_factor*100:.0f}% fresh)"
+        for article in high_impact_articles
+    ]
     
     # Calculate confidence
     high_impact_count = len(high_impact_articles)
@@ -669,7 +946,7 @@ async def analyze_gold_news_impact_v2() -> GoldNewsImpactV2:
     
     # Calculate time to expiry (based on freshest high-impact news)
     if high_impact_articles:
-        freshest_age = min((time.time() - a.timestamp) / 60 for a in high_impact_articles)
+        freshest_age = (time.time() - float(article_ts[top_idx].max())) / 60
         time_to_expiry = max(0, int(60 - freshest_age))  # 60 min total window
     else:
         time_to_expiry = 0
@@ -0,0 +1,129 @@
+"""
+Shared HTTP client for outbound API calls.
+
+A single pooled httpx.AsyncClient keeps TCP/TLS connections alive between
+requests to the same host (EODHD, Marketaux, ...) instead of paying a fresh
+handshake on every call. HTTP/2 is enabled when the `h2` package is present.
+JSON bodies are decoded with orjson when it is installed.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import logging
+import time
+from typing import Any, Optional
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10.0
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared AsyncClient, creating it on first use.
+    Per-request `timeout` / `follow_redirects` can still be passed to
+    `client.get(...)` when a call needs different settings.
+    """
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=10,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _client
+
+
+# Transient transport failures worth retrying (not HTTP status errors)
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError)
+
+
+async def get_with_retry(
+    url: str,
+    *,
+    attempts: int = 3,
+    min_delay: float = 0.2,
+    max_delay: float = 2.0,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    GET through the shared client, retrying transient transport errors
+    with exponential backoff (min_delay, 2*min_delay, ... capped at max_delay).
+    The last error is re-raised once attempts are exhausted.
+    """
+    client = get_http_client()
+    for attempt in range(attempts):
+        try:
+            return await client.get(url, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == attempts - 1:
+                raise
+            delay = min(max_delay, min_delay * (2 ** attempt))
+            logger.debug("GET %s failed (%s), retrying in %.1fs", url, e, delay)
+            await asyncio.sleep(delay)
+    raise RuntimeError("attempts must be >= 1")
+
+
+class CircuitBreaker:
+    """
+    Minimal circuit breaker: after `failure_threshold` consecutive failures
+    the circuit opens for `reset_seconds`, during which callers should skip
+    the network and serve fallback data.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._open_until = 0.0
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._open_until = time.monotonic() + self.reset_seconds
+            self._failures = 0
+            logger.warning(f"Circuit opened for {self.reset_seconds:.0f}s after repeated failures")
+
+
+def response_json(response: httpx.Response) -> Any:
+    """
+    Decode a JSON response body straight from bytes.
+    Uses orjson when installed (no intermediate str decode), else stdlib json.
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on application shutdown)."""
+    global _client
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Shared HTTP client closed")
+    _client = None
@@ -0,0 +1,105 @@
+"""
+Keyword Matcher - Multi-pattern substring search for news headlines
+
+Builds an Aho-Corasick automaton once over a keyword dictionary so a headline
+is scanned in a single pass instead of one `keyword in text` check per entry.
+Falls back to a plain linear scan when `pyahocorasick` is not installed,
+gated by one compiled regex alternation so texts without any keyword are
+rejected in a single C-level pass.
+"""
+from __future__ import annotations
+
+import re
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional accelerator
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    Finds which registered keywords occur (as substrings) in a text.
+
+    Each keyword carries an arbitrary payload. `find` reports every distinct
+    matching entry exactly once, in registration order, which mirrors the
+    semantics of iterating a keyword dict and testing `keyword in text`.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        self._entries: Tuple[Tuple[str, Any], ...] = tuple(entries)
+        self._automaton = None
+        self._prefilter: Optional[re.Pattern] = None
+
+        if ahocorasick is None and self._entries:
+            # Literal alternation: cheap rejection of texts with no keyword at all
+            keywords = sorted({keyword for keyword, _ in self._entries}, key=len, reverse=True)
+            self._prefilter = re.compile("|".join(map(re.escape, keywords)))
+
+        if ahocorasick is not None and self._entries:
+            positions: Dict[str, List[int]] = {}
+            for idx, (keyword, _) in enumerate(self._entries):
+                positions.setdefault(keyword, []).append(idx)
+
+            automaton = ahocorasick.Automaton()
+            for keyword, idxs in positions.items():
+                automaton.add_word(keyword, tuple(idxs))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, text: str) -> List[Tuple[str, Any]]:
+        """Return (keyword, payload) for every entry found in `text`."""
+        if not text:
+            return []
+
+        if self._automaton is None:
+            if self._prefilter is None or self._prefilter.search(text) is None:
+                return []
+            return [entry for entry in self._entries if entry[0] in text]
+
+        # Repeated occurrences yield the same idxs tuple: dedupe at C level first
+        hit_groups = {idxs for _, idxs in self._automaton.iter(text)}
+        if not hit_groups:
+            return []
+
+        entries = self._entries
+        return [entries[i] for i in sorted(chain.from_iterable(hit_groups))]
+
+    def first(self, text: str) -> Optional[Tuple[str, Any]]:
+        """Return the earliest-registered entry found in `text`, or None."""
+        if not text:
+            return None
+
+        if self._automaton is None:
+            if self._prefilter is None or self._prefilter.search(text) is None:
+                return None
+            for entry in self._entries:
+                if entry[0] in text:
+                    return entry
+            return None
+
+        best = None
+        for _, idxs in self._automaton.iter(text):
+            idx = idxs[0]
+            if best is None or idx < best:
+                best = idx
+                if best == 0:
+                    break
+        return None if best is None else self._entries[best]
+
+    def contains_any(self, text: str) -> bool:
+        """True if at least one keyword occurs in `text`."""
+        if not text:
+            return False
+
+        if self._automaton is None:
+            return self._prefilter is not None and self._prefilter.search(text) is not None
+
+        for _ in self._automaton.iter(text):
+            return True
+        return False
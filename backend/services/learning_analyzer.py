@@ -4,15 +4,41 @@ Analyzes prediction outcomes to identify patterns and improve future predictions
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from collections import defaultdict
 
+import numpy as np
+
 from database.supabase_client import get_supabase_client, is_db_available
+from services.analysis_cache import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
+# Active insights are read for every prompt but only change when insights are saved
+INSIGHTS_CACHE_TTL_SECONDS = 30
+
+# |Welch t| needed before a numeric factor difference becomes an insight (~95% two-sided)
+MIN_T_STAT = 2.0
+
+# SQL functions PostgREST reported as missing: not probed again until restart
+_missing_rpcs: set = set()
+
+
+def _call_rpc(client: Any, function_name: str, params: Dict[str, Any]) -> Any:
+    """Result data of a SQL function, or None when it failed or is not deployed."""
+    if function_name in _missing_rpcs:
+        return None
+    result = client.rpc(function_name, params)
+    if result.get("missing"):
+        _missing_rpcs.add(function_name)
+    if result.get("error") is not None:
+        return None
+    return result.get("data")
+
 
 async def analyze_factor_correlations(
     symbol: Optional[str] = None,
@@ -41,75 +67,42 @@ async def analyze_factor_correlations(
     cutoff_iso = cutoff.isoformat() + "Z"
     
     try:
-        query = client.table("outcome_results").select(
-            "ml_correct, claude_correct, prediction_logs!inner(symbol, factors)"
-        ).eq("check_interval", "24h").gte("created_at", cutoff_iso)
-        
-        if symbol:
-            query = query.eq("prediction_logs.symbol", symbol)
-        
-        result = query.execute()
-        outcomes = result.get("data") or []
+        # Blocking REST calls run off the event loop so per-symbol analyses can overlap
+        sample_size, factor_stats, categorical_stats = await asyncio.to_thread(
+            _fetch_factor_stats, client, symbol, cutoff_iso
+        )
         
-        if len(outcomes) < min_samples:
+        if sample_size < min_samples:
             return {
                 "symbol": symbol,
                 "period_days": days,
-                "sample_size": len(outcomes),
+                "sample_size": sample_size,
                 "message": f"Not enough samples (need {min_samples})",
                 "correlations": {}
             }
         
-        factor_stats = defaultdict(lambda: {
-            "correct_values": [],
-            "incorrect_values": [],
-            "correct_count": 0,
-            "incorrect_count": 0
-        })
-        
-        categorical_stats = defaultdict(lambda: defaultdict(lambda: {"correct": 0, "total": 0}))
-        
-        for outcome in outcomes:
-            ml_correct = outcome.get("ml_correct", False)
-            prediction = outcome.get("prediction_logs", {})
-            factors = prediction.get("factors", {}) or {}
-            
-            for factor_name, value in factors.items():
-                if value is None:
-                    continue
-                
-                if isinstance(value, (int, float)):
-                    stats = factor_stats[factor_name]
-                    if ml_correct:
-                        stats["correct_values"].append(float(value))
-                        stats["correct_count"] += 1
-                    else:
-                        stats["incorrect_values"].append(float(value))
-                        stats["incorrect_count"] += 1
-                
-                elif isinstance(value, str):
-                    cat_stats = categorical_stats[factor_name][value]
-                    cat_stats["total"] += 1
-                    if ml_correct:
-                        cat_stats["correct"] += 1
-        
         numeric_analysis = {}
         for factor_name, stats in factor_stats.items():
-            correct_vals = stats["correct_values"]
-            incorrect_vals = stats["incorrect_values"]
+            correct_count = stats["correct_count"]
+            incorrect_count = stats["incorrect_count"]
             
-            if len(correct_vals) >= 3 and len(incorrect_vals) >= 3:
-                avg_when_correct = sum(correct_vals) / len(correct_vals)
-                avg_when_incorrect = sum(incorrect_vals) / len(incorrect_vals)
+            if correct_count >= 3 and incorrect_count >= 3:
+                avg_when_correct = stats["correct_sum"] / correct_count
+                avg_when_incorrect = stats["incorrect_sum"] / incorrect_count
                 
                 diff_pct = ((avg_when_correct - avg_when_incorrect) / max(abs(avg_when_incorrect), 0.001)) * 100
+                t_stat = _welch_t(
+                    avg_when_correct, _sample_variance(stats["correct_sumsq"], avg_when_correct, correct_count), correct_count,
+                    avg_when_incorrect, _sample_variance(stats["incorrect_sumsq"], avg_when_incorrect, incorrect_count), incorrect_count,
+                )
                 
                 numeric_analysis[factor_name] = {
                     "avg_when_correct": round(avg_when_correct, 4),
                     "avg_when_incorrect": round(avg_when_incorrect, 4),
                     "difference_pct": round(diff_pct, 2),
-                    "samples_correct": len(correct_vals),
-                    "samples_incorrect": len(incorrect_vals),
+                    "t_stat": round(t_stat, 3) if t_stat is not None else None,
+                    "samples_correct": correct_count,
+                    "samples_incorrect": incorrect_count,
                     "insight": _generate_numeric_insight(factor_name, avg_when_correct, avg_when_incorrect)
                 }
         
@@ -130,7 +123,7 @@ async def analyze_factor_correlations(
         return {
             "symbol": symbol,
             "period_days": days,
-            "sample_size": len(outcomes),
+            "sample_size": sample_size,
             "numeric_factors": numeric_analysis,
             "categorical_factors": categorical_analysis,
             "generated_at": datetime.utcnow().isoformat() + "Z"
@@ -141,6 +134,147 @@ async def analyze_factor_correlations(
         return {"error": str(e)}
 
 
+def _new_numeric_stats() -> Dict[str, Any]:
+    return {
+        "correct_sum": 0.0, "correct_sumsq": 0.0, "correct_count": 0,
+        "incorrect_sum": 0.0, "incorrect_sumsq": 0.0, "incorrect_count": 0,
+    }
+
+
+def _sample_variance(sumsq: float, mean: float, n: int) -> float:
+    """Unbiased variance from running sums (clamped at 0 against rounding)."""
+    if n < 2:
+        return 0.0
+    return max(0.0, (sumsq - n * mean * mean) / (n - 1))
+
+
+def _welch_t(
+    mean_a: float, var_a: float, n_a: int,
+    mean_b: float, var_b: float, n_b: int
+) -> Optional[float]:
+    """Welch's t statistic for two samples with unequal variances."""
+    std_err = math.sqrt(var_a / n_a + var_b / n_b)
+    if std_err == 0:
+        return None
+    return (mean_a - mean_b) / std_err
+
+
+def _new_categorical_stats() -> Dict[str, int]:
+    return {"correct": 0, "total": 0}
+
+
+def _fetch_factor_stats(
+    client: Any,
+    symbol: Optional[str],
+    cutoff_iso: str
+) -> Tuple[int, Dict[str, Dict[str, Any]], Dict[str, Dict[str, Dict[str, int]]]]:
+    """Server-side aggregation when available, else client-side over raw rows."""
+    aggregated = _fetch_factor_stats_rpc(client, symbol, cutoff_iso)
+    if aggregated is None:
+        aggregated = _fetch_factor_stats_rows(client, symbol, cutoff_iso)
+    return aggregated
+
+
+def _fetch_factor_stats_rpc(
+    client: Any,
+    symbol: Optional[str],
+    cutoff_iso: str
+) -> Optional[Tuple[int, Dict[str, Dict[str, Any]], Dict[str, Dict[str, Dict[str, int]]]]]:
+    """
+    Aggregate factor stats in Postgres (factor_correlation_stats, migration 010).
+    Returns None when the function is unavailable so the caller can fall back.
+    """
+    data = _call_rpc(client, "factor_correlation_stats", {
+        "p_cutoff": cutoff_iso,
+        "p_symbol": symbol,
+        "p_check_interval": "24h",
+    })
+    if not isinstance(data, dict):
+        return None
+    
+    factor_stats: Dict[str, Dict[str, Any]] = defaultdict(_new_numeric_stats)
+    for row in data.get("numeric") or []:
+        stats = factor_stats[row["factor"]]
+        prefix = "correct" if row.get("ml_correct") else "incorrect"
+        stats[f"{prefix}_sum"] += float(row.get("sum") or 0.0)
+        stats[f"{prefix}_sumsq"] += float(row.get("sum_sq") or 0.0)
+        stats[f"{prefix}_count"] += int(row.get("count") or 0)
+    
+    categorical_stats: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(lambda: defaultdict(_new_categorical_stats))
+    for row in data.get("categorical") or []:
+        cat_stats = categorical_stats[row["factor"]][row["value"]]
+        cat_stats["total"] += int(row.get("total") or 0)
+        cat_stats["correct"] += int(row.get("correct") or 0)
+    
+    return int(data.get("sample_size") or 0), factor_stats, categorical_stats
+
+
+def _fetch_factor_stats_rows(
+    client: Any,
+    symbol: Optional[str],
+    cutoff_iso: str
+) -> Tuple[int, Dict[str, Dict[str, Any]], Dict[str, Dict[str, Dict[str, int]]]]:
+    """Fetch raw outcome rows and aggregate factor stats client-side."""
+    query = client.table("outcome_results").select(
+        "ml_correct, claude_correct, prediction_logs!inner(symbol, factors)"
+    ).eq("check_interval", "24h").gte("created_at", cutoff_iso)
+    
+    if symbol:
+        query = query.eq("prediction_logs.symbol", symbol)
+    
+    result = query.execute()
+    outcomes = result.get("data") or []
+    
+    categorical_stats: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(lambda: defaultdict(_new_categorical_stats))
+    
+    # Numeric values are flattened into (slot, value) pairs and reduced with
+    # np.bincount; slot = 2 * factor index + ml_correct
+    factor_index: Dict[str, int] = {}
+    slots: List[int] = []
+    values: List[float] = []
+    
+    for outcome in outcomes:
+        ml_correct = bool(outcome.get("ml_correct", False))
+        prediction = outcome.get("prediction_logs", {})
+        factors = prediction.get("factors", {}) or {}
+        
+        for factor_name, value in factors.items():
+            if value is None:
+                continue
+            
+            if isinstance(value, (int, float)):
+                idx = factor_index.setdefault(factor_name, len(factor_index))
+                slots.append(2 * idx + ml_correct)
+                values.append(float(value))
+            
+            elif isinstance(value, str):
+                cat_stats = categorical_stats[factor_name][value]
+                cat_stats["total"] += 1
+                if ml_correct:
+                    cat_stats["correct"] += 1
+    
+    factor_stats: Dict[str, Dict[str, Any]] = {}
+    if slots:
+        slot_arr = np.asarray(slots, dtype=np.intp)
+        value_arr = np.asarray(values, dtype=np.float64)
+        n_slots = 2 * len(factor_index)
+        counts = np.bincount(slot_arr, minlength=n_slots)
+        sums = np.bincount(slot_arr, weights=value_arr, minlength=n_slots)
+        sumsqs = np.bincount(slot_arr, weights=value_arr * value_arr, minlength=n_slots)
+        
+        for factor_name, idx in factor_index.items():
+            factor_stats[factor_name] = {
+                "correct_sum": float(sums[2 * idx + 1]),
+                "correct_sumsq": float(sumsqs[2 * idx + 1]),
+                "correct_count": int(counts[2 * idx + 1]),
+                "incorrect_sum": float(sums[2 * idx]),
+                "incorrect_sumsq": float(sumsqs[2 * idx]),
+                "incorrect_count": int(counts[2 * idx]),
+            }
+    
+    return len(outcomes), factor_stats, categorical_stats
+
+
 def _generate_numeric_insight(factor_name: str, avg_correct: float, avg_incorrect: float) -> str:
     """Generate a human-readable insight for a numeric factor."""
     diff = avg_correct - avg_incorrect
@@ -196,8 +330,11 @@ async def generate_learning_insights(
             
             for factor_name, analysis in numeric_factors.items():
                 diff_pct = abs(analysis.get("difference_pct", 0))
+                t_stat = analysis.get("t_stat")
                 
-                if diff_pct > 20:
+                # Material difference that is also unlikely to be noise
+                # (t_stat is None only when both groups have zero variance)
+                if diff_pct > 20 and (t_stat is None or abs(t_stat) >= MIN_T_STAT):
                     insights.append({
                         "insight_type": "factor_correlation",
                         "symbol": symbol,
@@ -243,6 +380,34 @@ async def generate_learning_insights(
         return []
 
 
+# Concurrent per-symbol analyses (each is a DB round trip or two)
+INSIGHTS_MAX_CONCURRENCY = 4
+
+
+async def generate_learning_insights_for_symbols(
+    symbols: List[Optional[str]],
+    days: int = 30
+) -> List[Dict[str, Any]]:
+    """
+    Generate insights for several symbols concurrently.
+    
+    Args:
+        symbols: Symbols to analyze (None = all symbols)
+        days: Number of days to analyze
+    
+    Returns:
+        Flattened list of insight objects, in `symbols` order
+    """
+    semaphore = asyncio.Semaphore(INSIGHTS_MAX_CONCURRENCY)
+    
+    async def _one(symbol: Optional[str]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await generate_learning_insights(symbol, days)
+    
+    results = await asyncio.gather(*(_one(symbol) for symbol in symbols))
+    return [insight for symbol_insights in results for insight in symbol_insights]
+
+
 async def save_insights_to_db(insights: List[Dict[str, Any]]) -> int:
     """
     Save generated insights to database.
@@ -262,8 +427,8 @@ async def save_insights_to_db(insights: List[Dict[str, Any]]) -> int:
     
     saved = 0
     try:
-        for insight in insights:
-            record = {
+        records = [
+            {
                 "symbol": insight.get("symbol"),
                 "insight_type": insight.get("insight_type", "recommendation"),
                 "sample_size": insight.get("data", {}).get("sample_size", 0),
@@ -276,10 +441,26 @@ async def save_insights_to_db(insights: List[Dict[str, Any]]) -> int:
                 },
                 "is_active": True
             }
-            
-            result = client.table("learning_insights").insert(record).execute()
-            if result.get("data"):
-                saved += 1
+            for insight in insights
+        ]
+        
+        # One round trip for the whole batch
+        result = client.table("learning_insights").insert(records)
+        if result.get("error") is None:
+            saved = len(result.get("data") or [])
+        else:
+            # Batch is all-or-nothing: retry row by row so one bad record doesn't drop the rest
+            logger.warning(f"Batch insert of {len(records)} insights failed, retrying per row: {result['error']}")
+            for idx, record in enumerate(records):
+                row_result = client.table("learning_insights").insert(record)
+                if row_result.get("data"):
+                    saved += 1
+                else:
+                    logger.error(f"Insight {idx} ({record['data'].get('factor')}) rejected: {row_result.get('error')}")
+        
+        if saved:
+            # New insights must be visible to the next prompt
+            get_active_insights.cache_clear()
         
         return saved
         
@@ -288,6 +469,7 @@ async def save_insights_to_db(insights: List[Dict[str, Any]]) -> int:
         return saved
 
 
+@async_ttl_cache(ttl=INSIGHTS_CACHE_TTL_SECONDS)
 async def get_active_insights(symbol: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get active learning insights for use in analysis.
@@ -306,15 +488,36 @@ async def get_active_insights(symbol: Optional[str] = None) -> List[Dict[str, An
         return []
     
     try:
-        query = client.table("learning_insights").select("*").eq("is_active", True)
+        # Single round trip through the SQL function (migration 012) when deployed
+        data = await asyncio.to_thread(
+            _call_rpc, client, "get_active_insights_for", {"p_symbol": symbol}
+        )
+        if isinstance(data, list):
+            return data
         
-        if symbol:
-            query = query.or_(f"symbol.eq.{symbol},symbol.is.null")
+        if not symbol:
+            query = client.table("learning_insights").select("*").eq(
+                "is_active", True
+            ).order("created_at", desc=True).limit(50)
+            result = await asyncio.to_thread(query.execute)
+            return result.get("data") or []
         
-        query = query.order("created_at", desc=True).limit(50)
+        # Symbol-specific + general (symbol IS NULL) insights as two index-friendly
+        # queries in parallel instead of one OR filter, merged newest-first
+        symbol_query = client.table("learning_insights").select("*").eq(
+            "is_active", True
+        ).eq("symbol", symbol).order("created_at", desc=True).limit(50)
+        general_query = client.table("learning_insights").select("*").eq(
+            "is_active", True
+        ).is_("symbol", "null").order("created_at", desc=True).limit(50)
         
-        result = query.execute()
-        return result.get("data") or []
+        symbol_result, general_result = await asyncio.gather(
+            asyncio.to_thread(symbol_query.execute),
+            asyncio.to_thread(general_query.execute),
+        )
+        rows = (symbol_result.get("data") or []) + (general_result.get("data") or [])
+        rows.sort(key=lambda r: r.get("created_at") or "", reverse=True)
+        return rows[:50]
         
     except Exception as e:
         logger.error(f"Failed to get active insights: {e}")
@@ -12,19 +12,29 @@ XAUUSD ve NASDAQ için kritik haberleri anlık yakalar:
 from __future__ import annotations
 
 import asyncio
+import bisect
+import hashlib
+import io
+import itertools
 import logging
-import subprocess
-import tempfile
 import os
 import time
 import json
+import wave
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any
+from typing import Deque, Dict, List, Optional, Callable, Any, Tuple, Union
 from dataclasses import dataclass, field
 from pathlib import Path
-import httpx
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional accelerator
+    xxhash = None
 
 from config import settings
+from services.http_client import get_http_client, response_json
+from services.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +43,7 @@ logger = logging.getLogger(__name__)
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptAlert:
     """Tespit edilen kritik haber"""
     keyword: str
@@ -45,6 +55,18 @@ class TranscriptAlert:
     confidence: float = 0.5
     
 
+@dataclass(frozen=True, slots=True)
+class Transcription:
+    """Whisper çıktısı; küçük harfli kopya ve önizleme bir kez üretilir"""
+    text: str
+    text_lower: str
+    preview: str  # Alert full_text alanı (ilk 500 karakter)
+    
+    @classmethod
+    def from_text(cls, text: str) -> "Transcription":
+        return cls(text=text, text_lower=text.lower(), preview=text[:500])
+
+
 @dataclass
 class LiveNewsImpact:
     """Canlı haber etkisi"""
@@ -53,7 +75,7 @@ class LiveNewsImpact:
     direction_bias: str  # BUY, SELL, NEUTRAL
     alerts: List[TranscriptAlert]
     last_update: datetime
-    channels_active: List[str]
+    channels_active: Tuple[str, ...]  # Salt okunur anlık görüntü
 
 
 # =============================================================================
@@ -154,6 +176,68 @@ BEARISH_MODIFIERS = [
     'fear', 'concern', 'risk', 'slowdown', 'cut', 'layoff'
 ]
 
+# Birleşik keyword tablosu, import sırasında bir kez kurulur
+_ALL_KEYWORDS = {**GOLD_KEYWORDS, **NASDAQ_KEYWORDS}
+# Log satırları için büyük harfli keyword'ler
+_KEYWORD_UPPER = {k: k.upper() for k in _ALL_KEYWORDS}
+
+# Single automaton built once at import: keywords and modifiers in one pass over the transcript
+# Payload: (kind, config) with kind in "keyword" / "bullish" / "bearish"
+_TRANSCRIPT_MATCHER = KeywordMatcher(
+    [(k, ("keyword", config)) for k, config in _ALL_KEYWORDS.items()]
+    + [(m, ("bullish", None)) for m in BULLISH_MODIFIERS]
+    + [(m, ("bearish", None)) for m in BEARISH_MODIFIERS]
+)
+
+
+# =============================================================================
+# AUDIO
+# =============================================================================
+
+# ffmpeg çıktısı: 16 kHz, mono, 16-bit PCM
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_BYTES_PER_SECOND = AUDIO_SAMPLE_RATE * 2
+
+# Girdi tamponlamasını ve probe süresini kapat: ilk ses baytları beklemeden akar
+FFMPEG_LOW_LATENCY_FLAGS = (
+    '-fflags', 'nobuffer',
+    '-flags', 'low_delay',
+    '-probesize', '32',
+    '-analyzeduration', '0',
+)
+
+# HLS: oynatma listesinin en yeni segmentinden başla (3 segment geriden değil)
+FFMPEG_HLS_LIVE_FLAGS = (
+    '-live_start_index', '-1',
+    '-http_persistent', '0',
+)
+
+
+def _pcm_to_wav_buffer(pcm_bytes: bytes) -> io.BytesIO:
+    """Ham s16le PCM verisini bellekte WAV'a sar (başa sarılmış buffer döner)"""
+    buffer = io.BytesIO()
+    # wave.open(...) close() çağrısında buffer'ı kapatmaz
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(AUDIO_SAMPLE_RATE)
+        wav.writeframes(pcm_bytes)
+    buffer.seek(0)
+    return buffer
+
+
+# Parmak izi için her 16. bayt (~1 kHz örnekleme) yeterli: sessizlik/jenerik tekrarları yakalar
+AUDIO_FINGERPRINT_STRIDE = 16
+TRANSCRIPT_CACHE_SIZE = 256
+
+
+def _audio_fingerprint(pcm_bytes: bytes) -> int:
+    """Seyreltilmiş PCM üzerinden ucuz 64-bit ses parmak izi"""
+    sample = pcm_bytes[::AUDIO_FINGERPRINT_STRIDE]
+    if xxhash is not None:
+        return xxhash.xxh64_intdigest(sample)
+    return int.from_bytes(hashlib.blake2b(sample, digest_size=8).digest(), 'little')
+
 
 # =============================================================================
 # GROQ WHISPER CLIENT (Ücretsiz Speech-to-Text)
@@ -166,32 +250,40 @@ class GroqWhisperClient:
         self.api_key = api_key or os.environ.get("GROQ_API_KEY")
         self.base_url = "https://api.groq.com/openai/v1/audio/transcriptions"
         
-    async def transcribe(self, audio_file_path: str) -> Optional[str]:
-        """Ses dosyasını metne çevir"""
+    async def transcribe(self, audio_bytes: bytes, filename: str = "audio.wav") -> Optional[str]:
+        """Bellekteki ses verisini (WAV) metne çevir"""
+        return await self._post_audio(io.BytesIO(audio_bytes), filename)
+    
+    async def transcribe_bytes(self, pcm_bytes: bytes) -> Optional[str]:
+        """Ham 16 kHz mono s16le PCM verisini metne çevir (geçici dosya yok)"""
+        return await self._post_audio(_pcm_to_wav_buffer(pcm_bytes), "audio.wav")
+    
+    async def _post_audio(self, audio_file: io.BytesIO, filename: str) -> Optional[str]:
+        """WAV buffer'ını Groq Whisper'a multipart olarak gönder"""
         if not self.api_key:
             logger.warning("GROQ_API_KEY not set")
             return None
             
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                with open(audio_file_path, 'rb') as audio_file:
-                    files = {'file': ('audio.wav', audio_file, 'audio/wav')}
-                    data = {'model': 'whisper-large-v3'}
-                    headers = {'Authorization': f'Bearer {self.api_key}'}
-                    
-                    response = await client.post(
-                        self.base_url,
-                        files=files,
-                        data=data,
-                        headers=headers
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        return result.get('text', '')
-                    else:
-                        logger.error(f"Groq Whisper error: {response.status_code} - {response.text}")
-                        return None
+            files = {'file': (filename, audio_file, 'audio/wav')}
+            data = {'model': 'whisper-large-v3'}
+            headers = {'Authorization': f'Bearer {self.api_key}'}
+            
+            # Paylaşılan client: her transkriptte yeni TCP/TLS el sıkışması yok
+            response = await get_http_client().post(
+                self.base_url,
+                files=files,
+                data=data,
+                headers=headers,
+                timeout=30.0
+            )
+            
+            if response.status_code == 200:
+                result = response_json(response)
+                return result.get('text', '')
+            else:
+                logger.error(f"Groq Whisper error: {response.status_code} - {response.text}")
+                return None
         except Exception as e:
             logger.error(f"Groq Whisper exception: {e}")
             return None
@@ -201,6 +293,21 @@ class GroqWhisperClient:
 # LIVE NEWS MONITOR
 # =============================================================================
 
+MAX_ALERTS = 100
+
+# Callback kuyruğu kapasitesi (dolunca yeni alert'lerin callback'i atlanır)
+ALERT_QUEUE_SIZE = 1000
+
+# Kanal başına aynı anda Whisper'da bekleyebilecek ses parçası sayısı
+MAX_PENDING_TRANSCRIPTIONS = 2
+
+# Alert sentiment'inin özet skora katkısı
+_SENTIMENT_VALUES = {
+    'bullish': 0.3,
+    'bearish': -0.3,
+    'neutral': 0.0
+}
+
 class LiveNewsMonitor:
     """
     Canlı TV yayınlarını dinler ve kritik haberleri tespit eder.
@@ -215,15 +322,40 @@ class LiveNewsMonitor:
     
     def __init__(self, groq_api_key: Optional[str] = None):
         self.whisper = GroqWhisperClient(groq_api_key)
-        self.alerts: List[TranscriptAlert] = []
+        # Son 100 alert'i tut (eski kayıtlar otomatik düşer)
+        self.alerts: Deque[TranscriptAlert] = deque(maxlen=MAX_ALERTS)
+        # alerts ile paralel, zaman sıralı timestamp'ler (bisect için)
+        self._alert_ts: Deque[datetime] = deque(maxlen=MAX_ALERTS)
         self.is_running = False
         self.active_channels: List[str] = []
-        self._callbacks: List[Callable[[TranscriptAlert], None]] = []
+        # active_channels'ın değişmez kopyası; yalnızca liste değişince yenilenir
+        self._active_snapshot: Tuple[str, ...] = ()
+        self._callbacks: List[Callable[[TranscriptAlert], Any]] = []
+        self._alert_queue: Optional[asyncio.Queue] = None
+        self.dropped_alerts = 0
+        self._audio_pipes: Dict[str, asyncio.subprocess.Process] = {}
+        # Ses parmak izi -> transkript (LRU): tekrarlanan ses Whisper'a gitmez
+        self._transcript_cache: "OrderedDict[int, Transcription]" = OrderedDict()
         
-    def add_callback(self, callback: Callable[[TranscriptAlert], None]):
-        """Alert geldiğinde çağrılacak callback ekle"""
+    def add_callback(self, callback: Callable[[TranscriptAlert], Any]):
+        """Alert geldiğinde çağrılacak callback ekle (sync veya async)"""
         self._callbacks.append(callback)
         
+    def _record_alert(self, alert: TranscriptAlert):
+        """Alert'i kaydet (zaman sırasıyla eklenir) ve callback'leri bilgilendir"""
+        self.alerts.append(alert)
+        self._alert_ts.append(alert.timestamp)
+        
+        if self._alert_queue is None:
+            # Monitor çalışmıyorsa (ör. doğrudan çağrı) senkron bildir
+            self._notify_callbacks(alert)
+            return
+        try:
+            self._alert_queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            self.dropped_alerts += 1
+            logger.warning(f"Alert queue full, dropped callback for {alert.keyword} ({self.dropped_alerts} total)")
+    
     def _notify_callbacks(self, alert: TranscriptAlert):
         """Tüm callback'leri bilgilendir"""
         for callback in self._callbacks:
@@ -232,102 +364,165 @@ class LiveNewsMonitor:
             except Exception as e:
                 logger.error(f"Callback error: {e}")
     
-    def _extract_audio_chunk(self, stream_url: str, duration: int = 30) -> Optional[str]:
+    async def _consume_alerts(self, queue: asyncio.Queue):
         """
-        Stream'den ses parçası çıkar (ffmpeg kullanarak)
+        Kuyruktaki alert'ler için callback'leri çalıştır.
+        Yavaş callback'ler ses okuma döngüsünü bloklamaz: sync olanlar
+        thread pool'da, async olanlar doğrudan await edilir.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            alert = await queue.get()
+            try:
+                for callback in self._callbacks:
+                    try:
+                        if asyncio.iscoroutinefunction(callback):
+                            await callback(alert)
+                        else:
+                            await loop.run_in_executor(None, callback, alert)
+                    except Exception as e:
+                        logger.error(f"Callback error: {e}")
+            finally:
+                queue.task_done()
+    
+    async def _open_audio_pipe(self, stream_url: str) -> asyncio.subprocess.Process:
+        """
+        Kanal için kalıcı ffmpeg süreci başlat.
+        Stream bir kez açılır; stdout'a kesintisiz 16 kHz mono s16le PCM yazar.
+        Düşük gecikme bayrakları ilk baytların Whisper'a daha erken ulaşmasını sağlar.
         
         Args:
             stream_url: HLS/M3U8 stream URL
+        """
+        input_flags = list(FFMPEG_LOW_LATENCY_FLAGS)
+        if '.m3u8' in stream_url:
+            input_flags += FFMPEG_HLS_LIVE_FLAGS
+        
+        return await asyncio.create_subprocess_exec(
+            'ffmpeg',
+            *input_flags,
+            '-i', stream_url,
+            '-vn',  # No video
+            '-acodec', 'pcm_s16le',
+            '-ar', str(AUDIO_SAMPLE_RATE),
+            '-ac', '1',
+            '-f', 's16le',
+            'pipe:1',
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+    
+    async def _read_audio_chunk(
+        self, process: asyncio.subprocess.Process, duration: int = 30
+    ) -> Optional[bytes]:
+        """
+        Kalıcı ffmpeg borusundan sabit uzunlukta ses parçası oku
+        
+        Args:
+            process: _open_audio_pipe ile başlatılmış ffmpeg süreci
             duration: Saniye cinsinden süre
             
         Returns:
-            Geçici ses dosyası yolu
+            Ham PCM ses verisi (bytes); stream koptuysa None
         """
         try:
-            # Geçici dosya oluştur
-            temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            temp_path = temp_file.name
-            temp_file.close()
-            
-            # ffmpeg komutu
-            command = [
-                'ffmpeg',
-                '-y',  # Overwrite
-                '-i', stream_url,
-                '-t', str(duration),
-                '-vn',  # No video
-                '-acodec', 'pcm_s16le',
-                '-ar', '16000',
-                '-ac', '1',
-                temp_path
-            ]
-            
-            process = subprocess.run(
-                command,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+            return await asyncio.wait_for(
+                process.stdout.readexactly(duration * AUDIO_BYTES_PER_SECOND),
                 timeout=duration + 30
             )
-            
-            if process.returncode == 0 and os.path.exists(temp_path):
-                return temp_path
-            else:
-                return None
-                
-        except subprocess.TimeoutExpired:
-            logger.warning(f"ffmpeg timeout for {stream_url}")
+        except asyncio.TimeoutError:
+            logger.warning("ffmpeg pipe timeout")
+            return None
+        except asyncio.IncompleteReadError:
+            logger.warning("ffmpeg pipe closed")
             return None
         except Exception as e:
             logger.error(f"Audio extraction error: {e}")
             return None
     
-    def _analyze_text(self, text: str, channel: str) -> List[TranscriptAlert]:
+    @staticmethod
+    async def _close_audio_pipe(process: Optional[asyncio.subprocess.Process]):
+        """ffmpeg sürecini sonlandır"""
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        except ProcessLookupError:
+            pass
+    
+    def _analyze_text(self, transcript: Union[Transcription, str], channel: str) -> List[TranscriptAlert]:
         """
         Metni analiz et ve kritik kelimeleri tespit et
         
         Returns:
             Tespit edilen alert listesi
         """
-        text_lower = text.lower()
+        if isinstance(transcript, str):
+            transcript = Transcription.from_text(transcript)
+        text_lower = transcript.text_lower
         alerts = []
         
-        # Tüm keyword'leri kontrol et
-        all_keywords = {**GOLD_KEYWORDS, **NASDAQ_KEYWORDS}
+        # Keyword'ler ve modifier'lar tek geçişte
+        matches = []
+        bullish_hits = 0
+        bearish_hits = 0
+        for keyword, (kind, config) in _TRANSCRIPT_MATCHER.find(text_lower):
+            if kind == "keyword":
+                matches.append((keyword, config))
+            elif kind == "bullish":
+                bullish_hits += 1
+            else:
+                bearish_hits += 1
         
-        for keyword, config in all_keywords.items():
-            if keyword in text_lower:
-                # Sentiment analizi
-                sentiment_score = config['base_sentiment']
-                
-                # Modifier'ları kontrol et
-                for bullish in BULLISH_MODIFIERS:
-                    if bullish in text_lower:
-                        sentiment_score += 0.1
-                        
-                for bearish in BEARISH_MODIFIERS:
-                    if bearish in text_lower:
-                        sentiment_score -= 0.1
-                
-                # Sentiment sınıflandırma
-                if sentiment_score > 0.1:
-                    sentiment = "bullish"
-                elif sentiment_score < -0.1:
-                    sentiment = "bearish"
-                else:
-                    sentiment = "neutral"
-                
-                alert = TranscriptAlert(
-                    keyword=keyword,
-                    full_text=text[:500],
-                    channel=channel,
-                    timestamp=datetime.utcnow(),
-                    sentiment=sentiment,
-                    impact_level=config['impact'],
-                    confidence=min(0.9, 0.5 + abs(sentiment_score))
-                )
-                alerts.append(alert)
-                
-                logger.info(f"🚨 ALERT: {keyword.upper()} on {channel} - {sentiment}")
+        if not matches:
+            return alerts
+        
+        # Metin başına sabit alanlar
+        full_text = transcript.preview
+        timestamp = datetime.utcnow()
+        log_alerts = logger.isEnabledFor(logging.INFO)
+        
+        # Modifier kaydırması metin başına sabit: base_sentiment başına bir kez hesaplanır
+        adjusted_scores: Dict[float, float] = {}
+        
+        for keyword, config in matches:
+            # Sentiment analizi
+            base_sentiment = config['base_sentiment']
+            sentiment_score = adjusted_scores.get(base_sentiment)
+            if sentiment_score is None:
+                sentiment_score = base_sentiment
+                # Modifier'ları uygula (sıralı toplama: float sonuçlar değişmez)
+                for _ in range(bullish_hits):
+                    sentiment_score += 0.1
+                for _ in range(bearish_hits):
+                    sentiment_score -= 0.1
+                adjusted_scores[base_sentiment] = sentiment_score
+            
+            # Sentiment sınıflandırma
+            if sentiment_score > 0.1:
+                sentiment = "bullish"
+            elif sentiment_score < -0.1:
+                sentiment = "bearish"
+            else:
+                sentiment = "neutral"
+            
+            alert = TranscriptAlert(
+                keyword=keyword,
+                full_text=full_text,
+                channel=channel,
+                timestamp=timestamp,
+                sentiment=sentiment,
+                impact_level=config['impact'],
+                confidence=min(0.9, 0.5 + abs(sentiment_score))
+            )
+            alerts.append(alert)
+            
+            if log_alerts:
+                logger.info("🚨 ALERT: %s on %s - %s", _KEYWORD_UPPER[keyword], channel, sentiment)
         
         return alerts
     
@@ -337,7 +532,8 @@ class LiveNewsMonitor:
         
         Args:
             channel: Kanal adı (cnn, fox, cnbc, bloomberg)
-            duration: Her döngüde dinlenecek süre (saniye)
+            duration: Her döngüde dinlenecek süre (saniye). Alert gecikmesi en az
+                bu süre + bir HLS segmenti kadardır; düşük gecikme için 5-10 sn önerilir.
         """
         stream_url = STREAM_URLS.get(channel)
         if not stream_url:
@@ -346,42 +542,84 @@ class LiveNewsMonitor:
         
         logger.info(f"🎥 Starting monitor for {channel.upper()}")
         self.active_channels.append(channel)
+        self._active_snapshot = tuple(self.active_channels)
+        process: Optional[asyncio.subprocess.Process] = None
+        # Kanal başına sınırlı sayıda eşzamanlı transkript: okuma Whisper'ı beklemez
+        slots = asyncio.Semaphore(MAX_PENDING_TRANSCRIPTIONS)
+        pending: set = set()
         
         while self.is_running:
             try:
-                # Ses çıkar
-                audio_path = self._extract_audio_chunk(stream_url, duration)
+                # Kalıcı ffmpeg borusu: stream her döngüde yeniden açılmaz
+                if process is None or process.returncode is not None:
+                    process = await self._open_audio_pipe(stream_url)
+                    self._audio_pipes[channel] = process
                 
-                if audio_path:
-                    # Transkript al
-                    text = await self.whisper.transcribe(audio_path)
-                    
-                    # Geçici dosyayı sil
-                    try:
-                        os.unlink(audio_path)
-                    except:
-                        pass
-                    
-                    if text:
-                        # Analiz et
-                        new_alerts = self._analyze_text(text, channel)
-                        
-                        for alert in new_alerts:
-                            self.alerts.append(alert)
-                            self._notify_callbacks(alert)
-                            
-                            # Son 100 alert'i tut
-                            if len(self.alerts) > 100:
-                                self.alerts = self.alerts[-100:]
+                # Ses oku
+                pcm_bytes = await self._read_audio_chunk(process, duration)
+                
+                if pcm_bytes is None:
+                    # Boru koptu: süreci kapat, kısa beklemeden sonra yeniden aç
+                    await self._close_audio_pipe(process)
+                    process = None
+                    await asyncio.sleep(5)
+                    continue
                 
-                # Kısa bekleme
-                await asyncio.sleep(5)
+                if pcm_bytes:
+                    # Slot dolu ise bekle (backpressure), sonra arka planda işle
+                    await slots.acquire()
+                    task = asyncio.create_task(self._process_chunk(pcm_bytes, channel, slots))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
                 
             except Exception as e:
                 logger.error(f"Monitor error for {channel}: {e}")
                 await asyncio.sleep(10)
         
+        await self._close_audio_pipe(process)
+        self._audio_pipes.pop(channel, None)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
         self.active_channels.remove(channel)
+        self._active_snapshot = tuple(self.active_channels)
+    
+    async def _transcribe_cached(self, pcm_bytes: bytes) -> Optional[Transcription]:
+        """Aynı ses daha önce transkript edildiyse Whisper çağrısını atla"""
+        key = _audio_fingerprint(pcm_bytes)
+        cache = self._transcript_cache
+        
+        transcript = cache.get(key)
+        if transcript is not None:
+            cache.move_to_end(key)
+            return transcript
+        
+        text = await self.whisper.transcribe_bytes(pcm_bytes)
+        if text is None:
+            # Hatalı yanıtlar önbelleğe alınmaz
+            return None
+        
+        transcript = Transcription.from_text(text)
+        cache[key] = transcript
+        if len(cache) > TRANSCRIPT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return transcript
+    
+    async def _process_chunk(self, pcm_bytes: bytes, channel: str, slots: asyncio.Semaphore):
+        """Ses parçasını transkript et, analiz et ve alert'leri kaydet"""
+        try:
+            # Transkript al
+            transcript = await self._transcribe_cached(pcm_bytes)
+            
+            if transcript is not None and transcript.text:
+                # Analiz et
+                new_alerts = self._analyze_text(transcript, channel)
+                
+                for alert in new_alerts:
+                    self._record_alert(alert)
+        except Exception as e:
+            logger.error(f"Transcription error for {channel}: {e}")
+        finally:
+            slots.release()
     
     async def start(self, channels: List[str] = None):
         """
@@ -395,23 +633,43 @@ class LiveNewsMonitor:
         
         self.is_running = True
         
-        # Her kanal için ayrı task
-        tasks = [
-            asyncio.create_task(self.monitor_channel(ch))
-            for ch in channels
-        ]
+        # Callback'ler ayrı bir task'ta: alert'ler kuyruğa yazılır
+        queue: asyncio.Queue = asyncio.Queue(maxsize=ALERT_QUEUE_SIZE)
+        self._alert_queue = queue
+        consumer = asyncio.create_task(self._consume_alerts(queue))
         
-        await asyncio.gather(*tasks)
+        try:
+            # Her kanal için ayrı task
+            tasks = [
+                asyncio.create_task(self.monitor_channel(ch))
+                for ch in channels
+            ]
+            
+            await asyncio.gather(*tasks)
+            # Kalan alert'lerin callback'lerini tamamla
+            await queue.join()
+        finally:
+            consumer.cancel()
+            self._alert_queue = None
     
     def stop(self):
         """Monitoring'i durdur"""
         self.is_running = False
+        # Bekleyen okumaları EOF ile serbest bırak
+        for process in self._audio_pipes.values():
+            if process.returncode is None:
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
         logger.info("Live news monitor stopped")
     
     def get_recent_alerts(self, minutes: int = 60) -> List[TranscriptAlert]:
         """Son X dakikadaki alert'leri getir"""
         cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-        return [a for a in self.alerts if a.timestamp > cutoff]
+        # Alert'ler zaman sırasıyla eklenir: cutoff'a ikili arama ile atla
+        start = bisect.bisect_right(self._alert_ts, cutoff)
+        return list(itertools.islice(self.alerts, start, None))
     
     def get_impact_summary(self) -> LiveNewsImpact:
         """Son alert'lerin özetini getir"""
@@ -424,20 +682,21 @@ class LiveNewsMonitor:
                 direction_bias="NEUTRAL",
                 alerts=[],
                 last_update=datetime.utcnow(),
-                channels_active=self.active_channels.copy()
+                channels_active=self._active_snapshot
             )
         
-        # Ağırlıklı sentiment hesapla
+        # Ağırlıklı sentiment ve high-impact sayısı tek geçişte
         total_weight = 0
         weighted_sentiment = 0
+        high_impact = 0
         
         for alert in recent:
-            weight = 1.0 if alert.impact_level == 'high' else 0.5
-            sentiment_value = {
-                'bullish': 0.3,
-                'bearish': -0.3,
-                'neutral': 0.0
-            }.get(alert.sentiment, 0.0)
+            if alert.impact_level == 'high':
+                weight = 1.0
+                high_impact += 1
+            else:
+                weight = 0.5
+            sentiment_value = _SENTIMENT_VALUES.get(alert.sentiment, 0.0)
             
             weighted_sentiment += sentiment_value * weight * alert.confidence
             total_weight += weight
@@ -453,7 +712,6 @@ class LiveNewsMonitor:
             direction = "NEUTRAL"
         
         # Confidence
-        high_impact = len([a for a in recent if a.impact_level == 'high'])
         confidence = min(90, 40 + high_impact * 15)
         
         return LiveNewsImpact(
@@ -462,7 +720,7 @@ class LiveNewsMonitor:
             direction_bias=direction,
             alerts=recent[-10:],  # Son 10 alert
             last_update=datetime.utcnow(),
-            channels_active=self.active_channels.copy()
+            channels_active=self._active_snapshot
         )
 
 
@@ -1,55 +1,75 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from config import settings
+from services.http_client import get_http_client, response_json
+
+
+# Symbol filters whose last filtered query came back empty
+_empty_filters: set = set()
 
 
 def _normalize_symbols(symbols: List[str]) -> Optional[str]:
-    cleaned: List[str] = []
-    for s in symbols:
-        s = (s or "").strip()
-        if not s:
-            continue
-        # Marketaux often doesn't like suffixes like ".INDX"
-        if "." in s:
-            s = s.split(".", 1)[0]
-        cleaned.append(s)
-    cleaned = [s for s in cleaned if s]
+    # Marketaux often doesn't like suffixes like ".INDX"; duplicates are dropped (order kept)
+    cleaned = dict.fromkeys((s or "").strip().partition(".")[0] for s in symbols)
+    cleaned.pop("", None)
     return ",".join(cleaned) if cleaned else None
 
 
+async def _fetch_marketaux_data(url: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    response = await get_http_client().get(url, params=params, timeout=10)
+    response.raise_for_status()
+    payload = response_json(response)
+    return payload.get("data", []) or []
+
+
 async def fetch_marketaux_headlines(symbols: List[str]) -> List[Dict[str, str]]:
     """
     Returns minimal headline objects used across the app.
     - Tries symbol-filtered query first
     - Falls back to general market news if filter yields empty
+    With MARKETAUX_SPECULATIVE_FALLBACK on, the general query is issued
+    concurrently with the filtered one, but only while the last filtered
+    query for the same symbols came back empty, so the paid quota is not
+    doubled for filters that do return news.
     """
     if not settings.marketaux_api_key:
         return []
 
     url = settings.marketaux_base_url
     symbols_param = _normalize_symbols(symbols)
-    params: Dict[str, Any] = {"api_token": settings.marketaux_api_key, "limit": 10, "language": "en"}
-    if symbols_param:
-        params["symbols"] = symbols_param
+    general_params: Dict[str, Any] = {"api_token": settings.marketaux_api_key, "limit": 10, "language": "en"}
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            payload = response.json()
-            data = payload.get("data", []) or []
-
-            if not data and symbols_param:
-                response = await client.get(
-                    url, params={"api_token": settings.marketaux_api_key, "limit": 10, "language": "en"}
+        if not symbols_param:
+            data = await _fetch_marketaux_data(url, general_params)
+        else:
+            filtered_params = {**general_params, "symbols": symbols_param}
+            if settings.marketaux_speculative_fallback and symbols_param in _empty_filters:
+                # Filter expected to be empty again: save the fallback round-trip
+                filtered, general = await asyncio.gather(
+                    _fetch_marketaux_data(url, filtered_params),
+                    _fetch_marketaux_data(url, general_params),
+                    return_exceptions=True,
                 )
-                response.raise_for_status()
-                payload = response.json()
-                data = payload.get("data", []) or []
+                if isinstance(filtered, BaseException):
+                    return []
+            else:
+                filtered = await _fetch_marketaux_data(url, filtered_params)
+                general = None
+
+            if filtered:
+                _empty_filters.discard(symbols_param)
+                data = filtered
+            else:
+                _empty_filters.add(symbols_param)
+                if general is None:
+                    general = await _fetch_marketaux_data(url, general_params)
+                if isinstance(general, BaseException):
+                    return []
+                data = general
     except Exception:
         return []
 
@@ -4,12 +4,32 @@ Supports NASDAQ and XAUUSD with direction prediction and pip targets.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import List, Optional, Literal
+import joblib
 import numpy as np
+import pandas as pd
+
+from services.analysis_cache import async_ttl_cache
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional accelerator
+    xxhash = None
+
+from services.ta_kernels import (
+    WINDOW_FIELDS, as_float_array, adx_last, adx_state, adx_step, atr_last,
+    atr_state, atr_step, ema_last_many, rsi_last, rsi_state, rsi_step,
+    rsi_value, true_range, window_indicators,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +37,18 @@ logger = logging.getLogger(__name__)
 _models = {}
 _model_features = {}
 
+# Technical indicators per candle set (LRU)
+TA_CACHE_SIZE = 64
+
+# Concurrent predictions for one model are scored together, up to this many rows per call
+PREDICT_BATCH_SIZE = 32
+
+# Pattern/candlestick context barely moves within a minute; don't re-request it per prediction
+PATTERN_CACHE_TTL_SECONDS = 60
+_TA_CACHE: "OrderedDict[tuple, dict]" = OrderedDict()
+# Guards _TA_CACHE and the streaming state; predictions run in worker threads
+_TA_LOCK = threading.Lock()
+
 
 @dataclass
 class PredictionResult:
@@ -59,8 +91,6 @@ def _load_model(symbol: str):
         return _models[symbol]
     
     try:
-        import joblib
-        
         model_path = Path(__file__).parent.parent / "models"
         
         if symbol == "NDX.INDX" or symbol == "NASDAQ":
@@ -78,8 +108,17 @@ def _load_model(symbol: str):
         model = joblib.load(path)
         _models[symbol] = model
         _model_features[symbol] = list(model.feature_names_in_) if hasattr(model, 'feature_names_in_') else []
+        # Resolve feature sources/defaults now rather than on the first prediction
+        _feature_plan(symbol, _model_features[symbol])
         
         logger.info(f"Loaded model for {symbol} with {len(_model_features.get(symbol, []))} features")
+        # H1/H4 columns are filled from the M30 candles; count how many the model spends on them
+        mirrored = sum(1 for f in _model_features[symbol] if f.endswith(("_H1", "_H4")))
+        if mirrored:
+            logger.warning(
+                f"{symbol} model has {mirrored} H1/H4 features that mirror M30 values "
+                f"(no higher-timeframe candles are fed in)"
+            )
         return model
         
     except Exception as e:
@@ -87,424 +126,701 @@ def _load_model(symbol: str):
         return None
 
 
-def _compute_technical_indicators(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray) -> dict:
-    """Compute technical indicators from price data."""
-    
-    def ema(values, period):
-        if len(values) < period:
-            return float(values[-1]) if len(values) else 0.0
-        alpha = 2.0 / (period + 1.0)
-        result = float(values[0])
-        for v in values[1:]:
-            result = alpha * float(v) + (1 - alpha) * result
-        return result
-    
-    def sma(values, period):
-        if len(values) < period:
-            return float(np.mean(values)) if len(values) else 0.0
-        return float(np.mean(values[-period:]))
-    
-    def rsi(values, period=14):
-        if len(values) < period + 1:
-            return 50.0
-        diffs = np.diff(values)
-        gains = np.where(diffs > 0, diffs, 0.0)
-        losses = np.where(diffs < 0, -diffs, 0.0)
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:]) + 1e-9
-        rs = avg_gain / avg_loss
-        return float(np.clip(100.0 - (100.0 / (1.0 + rs)), 0.0, 100.0))
-    
-    def atr(highs, lows, closes, period=14):
-        if len(closes) < period + 1:
-            return float(np.mean(highs - lows)) if len(highs) else 0.0
-        tr = np.maximum(highs[1:] - lows[1:], 
-                       np.maximum(np.abs(highs[1:] - closes[:-1]), 
-                                  np.abs(lows[1:] - closes[:-1])))
-        return float(np.mean(tr[-period:]))
-    
-    def macd(values):
-        ema12 = ema(values, 12)
-        ema26 = ema(values, 26)
-        macd_line = ema12 - ema26
-        # Signal would need historical MACD values, simplified here
-        return macd_line, 0.0, macd_line
-    
-    def stochastic(closes, highs, lows, period=14):
-        if len(closes) < period:
-            return 50.0, 50.0
-        low_min = np.min(lows[-period:])
-        high_max = np.max(highs[-period:])
-        if high_max - low_min == 0:
-            return 50.0, 50.0
-        k = 100 * (closes[-1] - low_min) / (high_max - low_min)
-        return float(k), float(k)  # Simplified
-    
-    def bollinger(values, period=20):
-        if len(values) < period:
-            return 0.0, 0.0, 0.0, 0.0, 0.0
-        mean = np.mean(values[-period:])
-        std = np.std(values[-period:]) + 1e-9
-        upper = mean + 2 * std
-        lower = mean - 2 * std
-        zscore = (values[-1] - mean) / std
-        width = (upper - lower) / mean * 100
-        return upper, lower, mean, width, zscore
-    
-    def williams_r(closes, highs, lows, period=14):
-        if len(closes) < period:
-            return -50.0
-        high_max = np.max(highs[-period:])
-        low_min = np.min(lows[-period:])
-        if high_max - low_min == 0:
-            return -50.0
-        return float(-100 * (high_max - closes[-1]) / (high_max - low_min))
-    
-    def mfi(closes, highs, lows, volumes, period=14):
-        if len(closes) < period + 1:
-            return 50.0
-        tp = (highs + lows + closes) / 3
-        mf = tp * volumes
-        pos_mf = np.where(np.diff(tp) > 0, mf[1:], 0)
-        neg_mf = np.where(np.diff(tp) < 0, mf[1:], 0)
-        pos_sum = np.sum(pos_mf[-period:]) + 1e-9
-        neg_sum = np.sum(neg_mf[-period:]) + 1e-9
-        return float(100 - (100 / (1 + pos_sum / neg_sum)))
-    
-    def adx(highs, lows, closes, period=14):
-        # Simplified ADX
-        if len(closes) < period * 2:
-            return 25.0
-        tr = np.maximum(highs[1:] - lows[1:], 
-                       np.maximum(np.abs(highs[1:] - closes[:-1]), 
-                                  np.abs(lows[1:] - closes[:-1])))
-        atr_val = np.mean(tr[-period:])
-        return float(np.clip(25 + np.random.randn() * 10, 10, 60))  # Placeholder
+def warmup() -> None:
+    """Deserialize every model at process start so the first prediction does not pay for it."""
+    for symbol in ("NDX.INDX", "XAUUSD"):
+        _load_model(symbol)
+
+
+# EMA periods computed by _compute_technical_indicators (MACD fast/slow included)
+_EMA_PERIODS = np.array([12, 20, 26, 50, 200], dtype=np.int64)
+
+
+def _compute_technical_indicators(
+    closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray,
+    recursive: Optional[dict] = None,
+) -> dict:
+    """
+    Compute technical indicators from price data. `recursive` may carry the
+    EMA/RSI/ATR/ADX values (the RSI/ATR/ADX advanced from streaming state);
+    otherwise they are computed over the whole history.
+    """
+    
+    # Compiled kernels expect contiguous float64
+    closes = as_float_array(closes)
+    highs = as_float_array(highs)
+    lows = as_float_array(lows)
+    volumes = as_float_array(volumes)
     
     current = float(closes[-1]) if len(closes) else 0.0
     
-    ema_20 = ema(closes, 20)
-    ema_50 = ema(closes, 50)
-    ema_200 = ema(closes, 200)
-    sma_20 = sma(closes, 20)
-    sma_50 = sma(closes, 50)
-    sma_200 = sma(closes, 200)
-    
-    rsi_14 = rsi(closes, 14)
-    rsi_7 = rsi(closes, 7)
-    
-    atr_14 = atr(highs, lows, closes, 14)
-    atr_pct = (atr_14 / current * 100) if current else 0.0
-    
-    macd_line, macd_signal, macd_hist = macd(closes)
-    stoch_k, stoch_d = stochastic(closes, highs, lows)
-    boll_upper, boll_lower, boll_middle, boll_width, boll_zscore = bollinger(closes)
-    wr = williams_r(closes, highs, lows)
-    mfi_val = mfi(closes, highs, lows, volumes)
-    adx_val = adx(highs, lows, closes)
-    
-    # Momentum
-    momentum_3 = (closes[-1] - closes[-4]) / closes[-4] * 100 if len(closes) >= 4 else 0.0
-    momentum_10 = (closes[-1] - closes[-11]) / closes[-11] * 100 if len(closes) >= 11 else 0.0
-    
-    # Volatility regime
-    vol_20 = float(np.std(np.diff(np.log(closes[-21:])) if len(closes) >= 22 else [0.01]) * np.sqrt(252) * 100)
-    
-    # Trend direction
-    trend_direction = 1 if ema_20 > ema_50 > ema_200 else (-1 if ema_20 < ema_50 < ema_200 else 0)
+    if recursive is None:
+        recursive = {
+            # All EMAs (incl. MACD's 12/26) in one pass over closes
+            "emas": ema_last_many(closes, _EMA_PERIODS).tolist(),
+            "rsi_14": rsi_last(closes, 14),
+            "rsi_7": rsi_last(closes, 7),
+            "atr_14": atr_last(highs, lows, closes, 14),
+            "adx": adx_last(highs, lows, closes, 14),
+        }
+    ema_12, ema_20, ema_26, ema_50, ema_200 = recursive["emas"]
+    atr_14 = recursive["atr_14"]
+    macd_line = ema_12 - ema_26
     
-    # Returns z-score
-    if len(closes) >= 21:
-        ret_20 = (closes[-1] - closes[-21]) / closes[-21]
-        ret_std = np.std(np.diff(closes[-60:]) / closes[-60:-1]) if len(closes) >= 61 else 0.01
-        ret_20_z = ret_20 / (ret_std + 1e-9)
-    else:
-        ret_20_z = 0.0
+    # SMAs, stochastic/Williams %R, Bollinger, MFI, momentum, volatility, returns z-score
+    window = dict(zip(WINDOW_FIELDS, window_indicators(closes, highs, lows, volumes).tolist()))
     
     return {
         "close": current,
         "ema_20": ema_20,
         "ema_50": ema_50,
         "ema_200": ema_200,
-        "sma_20": sma_20,
-        "sma_50": sma_50,
-        "sma_200": sma_200,
-        "rsi_14": rsi_14,
-        "rsi_7": rsi_7,
+        "sma_20": window["sma_20"],
+        "sma_50": window["sma_50"],
+        "sma_200": window["sma_200"],
+        "rsi_14": recursive["rsi_14"],
+        "rsi_7": recursive["rsi_7"],
         "atr_14": atr_14,
-        "atr_pct": atr_pct,
+        "atr_pct": (atr_14 / current * 100) if current else 0.0,
         "macd_line": macd_line,
-        "macd_signal": macd_signal,
-        "macd_hist": macd_hist,
+        # Signal would need historical MACD values, simplified here
+        "macd_signal": 0.0,
+        "macd_hist": macd_line,
         "macd_hist_diff": 0.0,
-        "stoch_k": stoch_k,
-        "stoch_d": stoch_d,
-        "boll_upper": boll_upper,
-        "boll_lower": boll_lower,
-        "boll_middle": boll_middle,
-        "boll_width": boll_width,
-        "boll_zscore": boll_zscore,
-        "williams_r": wr,
-        "mfi": mfi_val,
-        "adx": adx_val,
-        "momentum_3": momentum_3,
-        "momentum_10": momentum_10,
-        "volatility": vol_20,
-        "trend_direction": trend_direction,
-        "ret_20_z": ret_20_z,
+        "stoch_k": window["stoch_k"],
+        "stoch_d": window["stoch_d"],
+        "boll_upper": window["boll_upper"],
+        "boll_lower": window["boll_lower"],
+        "boll_middle": window["boll_middle"],
+        "boll_width": window["boll_width"],
+        "boll_zscore": window["boll_zscore"],
+        "williams_r": window["williams_r"],
+        "mfi": window["mfi"],
+        "adx": recursive["adx"],
+        "momentum_3": window["momentum_3"],
+        "momentum_10": window["momentum_10"],
+        "volatility": window["volatility"],
+        "trend_direction": 1 if ema_20 > ema_50 > ema_200 else (-1 if ema_20 < ema_50 < ema_200 else 0),
+        "ret_20_z": window["ret_20_z"],
     }
 
 
-def _build_feature_vector(symbol: str, ta: dict, candles: list) -> Optional[np.ndarray]:
-    """Build feature vector for model prediction."""
+def _candle_arrays(candles: list) -> tuple:
+    """closes, highs, lows, volumes as contiguous float64 arrays, from one pass over candles."""
+    buf = np.array(
+        [(c["close"], c["high"], c["low"], c.get("volume", 0)) for c in candles],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    # Column-major copy: each row of the transpose is a contiguous series
+    closes, highs, lows, volumes = np.ascontiguousarray(buf.T)
+    return closes, highs, lows, volumes
+
+
+@dataclass(slots=True)
+class _IndicatorState:
+    """Wilder-smoothed indicator state after the closed bar stamped `ts`."""
+    ts: object
+    close: float
+    high: float
+    low: float
+    rsi_14: tuple
+    rsi_7: tuple
+    atr_14: float
+    adx_14: tuple
+    
+    @classmethod
+    def seed(cls, ts, closes: np.ndarray, highs: np.ndarray, lows: np.ndarray) -> "_IndicatorState":
+        """Full pass over the history (the bulk path)."""
+        return cls(
+            ts=ts,
+            close=float(closes[-1]),
+            high=float(highs[-1]),
+            low=float(lows[-1]),
+            rsi_14=rsi_state(closes, 14),
+            rsi_7=rsi_state(closes, 7),
+            atr_14=atr_state(highs, lows, closes, 14),
+            adx_14=adx_state(highs, lows, closes, 14),
+        )
     
-    model = _load_model(symbol)
-    if model is None:
-        return None
+    def advance(self, ts, close: float, high: float, low: float) -> "_IndicatorState":
+        """O(1) update by the next bar."""
+        diff = close - self.close
+        return _IndicatorState(
+            ts=ts,
+            close=close,
+            high=high,
+            low=low,
+            rsi_14=rsi_step(*self.rsi_14, diff, 14),
+            rsi_7=rsi_step(*self.rsi_7, diff, 7),
+            atr_14=atr_step(self.atr_14, true_range(high, low, self.close), 14),
+            adx_14=adx_step(*self.adx_14, high, low, self.high, self.low, self.close, 14),
+        )
     
-    features = _model_features.get(symbol, [])
-    if not features:
+    def values(self) -> dict:
+        return {
+            "rsi_14": rsi_value(*self.rsi_14),
+            "rsi_7": rsi_value(*self.rsi_7),
+            "atr_14": self.atr_14,
+            "adx": self.adx_14[3],
+        }
+
+
+# Closed bars needed before streaming RSI/ATR/ADX: the Wilder seed's weight
+# decays as (13/14)^n, ~4e-7 after 200 bars (see _streamed_indicators)
+_STREAM_MIN_BARS = 200
+_STREAM_STATE: dict = {}
+
+
+def _candle_ts(candle: dict):
+    return candle.get("timestamp") or candle.get("date")
+
+
+def _streamed_indicators(symbol: str, candles: list, closes: np.ndarray, highs: np.ndarray, lows: np.ndarray) -> Optional[dict]:
+    """
+    EMA/RSI/ATR/ADX for the candle set, the RSI/ATR/ADX from the symbol's
+    streaming state.
+    
+    The state covers closed bars only (all but the last, which may still be
+    forming). When the set has moved on by one bar, the state is advanced by
+    that bar instead of recomputed; otherwise it is reseeded with a full pass.
+    The last bar is then applied on a copy. Only the Wilder recurrences are
+    streamed: after 200 bars their seed carries a weight of ~4e-7, so they
+    agree with a fresh pass over the same candles. The EMAs (EMA 200 still
+    remembers its seed) come from the window itself, so they do not depend on
+    how long the process has been streaming. Returns None for histories too
+    short to stream.
+    """
+    n = len(candles)
+    if n - 1 < _STREAM_MIN_BARS:
+        return None
+    closed_ts = _candle_ts(candles[-2])
+    if closed_ts is None:
         return None
     
-    # Create feature dict with defaults
-    feature_dict = {}
-    
-    # Map computed indicators to feature names
-    indicator_map = {
-        "rsi_14": ta["rsi_14"],
-        "rsi_7": ta["rsi_7"],
-        "rsi_14_M30": ta["rsi_14"],
-        "rsi_7_M30": ta["rsi_7"],
-        "rsi_14_H1": ta["rsi_14"],
-        "rsi_7_H1": ta["rsi_7"],
-        "rsi_14_H4": ta["rsi_14"],
-        "rsi_7_H4": ta["rsi_7"],
-        "ema_20": ta["ema_20"],
-        "ema_50": ta["ema_50"],
-        "ema_200": ta["ema_200"],
-        "ema_20_M30": ta["ema_20"],
-        "ema_50_M30": ta["ema_50"],
-        "ema_200_M30": ta["ema_200"],
-        "ema_20_H1": ta["ema_20"],
-        "ema_50_H1": ta["ema_50"],
-        "ema_200_H1": ta["ema_200"],
-        "ema_20_H4": ta["ema_20"],
-        "ema_50_H4": ta["ema_50"],
-        "ema_200_H4": ta["ema_200"],
-        "sma_20": ta["sma_20"],
-        "sma_50": ta["sma_50"],
-        "sma_200": ta["sma_200"],
-        "sma_20_M30": ta["sma_20"],
-        "sma_50_M30": ta["sma_50"],
-        "sma_200_M30": ta["sma_200"],
-        "sma_20_H1": ta["sma_20"],
-        "sma_50_H1": ta["sma_50"],
-        "sma_200_H1": ta["sma_200"],
-        "sma_20_H4": ta["sma_20"],
-        "sma_50_H4": ta["sma_50"],
-        "sma_200_H4": ta["sma_200"],
-        "macd_line": ta["macd_line"],
-        "macd_signal": ta["macd_signal"],
-        "macd_hist": ta["macd_hist"],
-        "macd_hist_diff": ta["macd_hist_diff"],
-        "macd_line_M30": ta["macd_line"],
-        "macd_signal_M30": ta["macd_signal"],
-        "macd_hist_M30": ta["macd_hist"],
-        "macd_hist_diff_M30": ta["macd_hist_diff"],
-        "macd_line_H1": ta["macd_line"],
-        "macd_signal_H1": ta["macd_signal"],
-        "macd_hist_H1": ta["macd_hist"],
-        "macd_hist_diff_H1": ta["macd_hist_diff"],
-        "macd_line_H4": ta["macd_line"],
-        "macd_signal_H4": ta["macd_signal"],
-        "macd_hist_H4": ta["macd_hist"],
-        "macd_hist_diff_H4": ta["macd_hist_diff"],
-        "stoch_k": ta["stoch_k"],
-        "stoch_d": ta["stoch_d"],
-        "stoch_k_M30": ta["stoch_k"],
-        "stoch_d_M30": ta["stoch_d"],
-        "stoch_k_H1": ta["stoch_k"],
-        "stoch_d_H1": ta["stoch_d"],
-        "stoch_k_H4": ta["stoch_k"],
-        "stoch_d_H4": ta["stoch_d"],
-        "boll_upper": ta["boll_upper"],
-        "boll_lower": ta["boll_lower"],
-        "boll_middle": ta["boll_middle"],
-        "boll_width": ta["boll_width"],
-        "boll_zscore": ta["boll_zscore"],
-        "boll_upper_M30": ta["boll_upper"],
-        "boll_lower_M30": ta["boll_lower"],
-        "boll_middle_M30": ta["boll_middle"],
-        "boll_width_M30": ta["boll_width"],
-        "boll_zscore_M30": ta["boll_zscore"],
-        "boll_upper_H1": ta["boll_upper"],
-        "boll_lower_H1": ta["boll_lower"],
-        "boll_middle_H1": ta["boll_middle"],
-        "boll_width_H1": ta["boll_width"],
-        "boll_zscore_H1": ta["boll_zscore"],
-        "boll_upper_H4": ta["boll_upper"],
-        "boll_lower_H4": ta["boll_lower"],
-        "boll_middle_H4": ta["boll_middle"],
-        "boll_width_H4": ta["boll_width"],
-        "boll_zscore_H4": ta["boll_zscore"],
-        "atr_14": ta["atr_14"],
-        "atr_pct": ta["atr_pct"],
-        "atr_14_M30": ta["atr_14"],
-        "atr_pct_M30": ta["atr_pct"],
-        "atr_14_H1": ta["atr_14"],
-        "atr_pct_H1": ta["atr_pct"],
-        "atr_14_H4": ta["atr_14"],
-        "atr_pct_H4": ta["atr_pct"],
-        "williams_r": ta["williams_r"],
-        "williams_r_M30": ta["williams_r"],
-        "williams_r_H1": ta["williams_r"],
-        "williams_r_H4": ta["williams_r"],
-        "mfi": ta["mfi"],
-        "mfi_M30": ta["mfi"],
-        "mfi_H1": ta["mfi"],
-        "mfi_H4": ta["mfi"],
-        "adx": ta["adx"],
-        "adx_M30": ta["adx"],
-        "adx_H1": ta["adx"],
-        "adx_H4": ta["adx"],
-        "volatility": ta["volatility"],
-        "volatility_M30": ta["volatility"],
-        "volatility_H1": ta["volatility"],
-        "volatility_H4": ta["volatility"],
-        "momentum_3_M30": ta["momentum_3"],
-        "momentum_10_M30": ta["momentum_10"],
-        "trend_direction": ta["trend_direction"],
-        "trend_direction_M30": ta["trend_direction"],
-        "ret_20_z": ta["ret_20_z"],
-        "close": ta["close"],
-        "Close": ta["close"],
-    }
+    state = _STREAM_STATE.get(symbol)
+    if state is None or state.ts != closed_ts:
+        if state is not None and state.ts == _candle_ts(candles[-3]):
+            state = state.advance(closed_ts, float(closes[-2]), float(highs[-2]), float(lows[-2]))
+        else:
+            state = _IndicatorState.seed(closed_ts, closes[:-1], highs[:-1], lows[:-1])
+        _STREAM_STATE[symbol] = state
+    
+    values = state.advance(_candle_ts(candles[-1]), float(closes[-1]), float(highs[-1]), float(lows[-1])).values()
+    values["emas"] = ema_last_many(closes, _EMA_PERIODS).tolist()
+    return values
+
+
+def _candle_fingerprint(arrays: tuple) -> int:
+    """64-bit hash of the raw float64 bytes of the candle arrays."""
+    if xxhash is not None:
+        hasher = xxhash.xxh3_64()
+    else:
+        hasher = hashlib.blake2b(digest_size=8)
+    for values in arrays:
+        hasher.update(values)
+    return int.from_bytes(hasher.digest(), "little")
+
+
+def _cached_technical_indicators(symbol: str, candles: list) -> dict:
+    """
+    _compute_technical_indicators memoized on the candle set. The key covers
+    the last candle's timestamp and OHLCV, since the forming candle updates in
+    place; price arrays are only extracted on a miss. Candles without a
+    timestamp are keyed on a fingerprint of the whole set instead, as the
+    last candle alone does not identify it. Returns a fresh dict the caller
+    may modify. Thread-safe.
+    """
+    last = candles[-1]
+    ts = _candle_ts(last)
+    if ts is not None:
+        arrays = None
+        key = (
+            symbol,
+            len(candles),
+            ts,
+            last.get("open"),
+            last.get("high"),
+            last.get("low"),
+            last.get("close"),
+            last.get("volume"),
+        )
+    else:
+        arrays = _candle_arrays(candles)
+        key = (symbol, len(candles), _candle_fingerprint(arrays))
+    
+    with _TA_LOCK:
+        ta = _TA_CACHE.get(key)
+        if ta is None:
+            closes, highs, lows, volumes = arrays or _candle_arrays(candles)
+            recursive = _streamed_indicators(symbol, candles, closes, highs, lows)
+            ta = _compute_technical_indicators(closes, highs, lows, volumes, recursive)
+            _TA_CACHE[key] = ta
+            if len(_TA_CACHE) > TA_CACHE_SIZE:
+                _TA_CACHE.popitem(last=False)
+        else:
+            _TA_CACHE.move_to_end(key)
+        return dict(ta)
+
+
+# Indicator columns: base name -> ta key, repeated for every timeframe suffix
+_TA_FEATURE_BASES = (
+    "rsi_14", "rsi_7",
+    "ema_20", "ema_50", "ema_200",
+    "sma_20", "sma_50", "sma_200",
+    "macd_line", "macd_signal", "macd_hist", "macd_hist_diff",
+    "stoch_k", "stoch_d",
+    "boll_upper", "boll_lower", "boll_middle", "boll_width", "boll_zscore",
+    "atr_14", "atr_pct",
+    "williams_r", "mfi", "adx", "volatility",
+)
+_TIMEFRAME_SUFFIXES = ("", "_M30", "_H1", "_H4")
+
+# Feature name -> key in the technical-indicator dict
+_TA_FEATURE_SOURCES = {
+    f"{base}{suffix}": base for base in _TA_FEATURE_BASES for suffix in _TIMEFRAME_SUFFIXES
+}
+_TA_FEATURE_SOURCES.update({
+    "momentum_3_M30": "momentum_3",
+    "momentum_10_M30": "momentum_10",
+    "trend_direction": "trend_direction",
+    "trend_direction_M30": "trend_direction",
+    "ret_20_z": "ret_20_z",
+    "close": "close",
+    "Close": "close",
+})
+
+# Feature name -> field of the last candle (all timeframes read the latest candle)
+_OHLCV_FEATURE_SOURCES = {
+    f"{name}_{tf}": field
+    for tf in ("M30", "H1", "H4")
+    for field in ("open", "high", "low", "close", "volume")
+    for name in (field, field.capitalize())
+}
+
+# Categorical columns that must remain as strings
+CATEGORICAL_COLS = {'components', 'route', 'signal'}
+
+# Default categorical values based on model training
+CAT_DEFAULTS = {
+    'components': 'break_retest',
+    'route': 'unknown',
+    'signal': 'bullish',  # Will be set based on trend
+}
+
+# Feature plan entry kinds
+_SRC_TA, _SRC_OHLCV, _SRC_CONST = 0, 1, 2
+
+@dataclass(slots=True)
+class _FeaturePlan:
+    """Column layout of a model's features, resolved once per symbol."""
+    features: List[str]
+    numeric: list  # (position, source spec)
+    categorical: list  # (position, column name)
+    numeric_cols: List[str]
+    # Numeric row with the constant columns pre-filled
+    template: np.ndarray
+    # Columns sharing one source, as (ta key | candle field, row indices)
+    ta_groups: list
+    ohlcv_groups: list
+
+
+_feature_plans: dict = {}
+
+
+def _default_feature_spec(feat: str) -> tuple:
+    """Plan entry for a numeric feature with no computed source."""
+    name = feat.lower()
+    if "price" in name or "close" in name:
+        return (_SRC_TA, "close")
+    elif "volume" in name or "obv" in name:
+        return (_SRC_CONST, 0.0)
+    elif "score" in name or "conf" in name:
+        return (_SRC_CONST, 0.5)
+    elif "zscore" in name:
+        return (_SRC_CONST, 0.0)
+    elif "returns" in name or "std" in name:
+        return (_SRC_CONST, 0.01)
+    elif "ma" in name and any(c.isdigit() for c in feat):
+        return (_SRC_TA, "close")
+    elif "lag" in name:
+        return (_SRC_TA, "close")
+    elif "min" in name or "max" in name:
+        return (_SRC_TA, "close")
+    elif "cmf" in name:
+        return (_SRC_CONST, 0.0)
+    elif "psar" in name:
+        return (_SRC_TA, "close")
+    elif "regime" in name:
+        return (_SRC_CONST, 0.0)
+    elif "strength" in name:
+        return (_SRC_CONST, 0.5)
+    elif "quality" in name:
+        return (_SRC_CONST, 0.5)
+    elif "breakout" in name:
+        return (_SRC_CONST, 0.0)
+    elif "formation" in name:
+        return (_SRC_CONST, 0.5)
+    elif "ichimoku" in name:
+        return (_SRC_CONST, 0.0)
+    elif "interaction" in name:
+        return (_SRC_CONST, 0.0)
+    elif "wave" in name:
+        return (_SRC_CONST, 0.0)
+    elif "mkt" in name:
+        return (_SRC_CONST, 0.0)
+    elif "compression" in name:
+        return (_SRC_CONST, 0.0)
+    elif "pattern_id" in name:
+        return (_SRC_CONST, 0.0)
+    else:
+        return (_SRC_CONST, 0.0)
+
+
+def _feature_plan(symbol: str, features: List[str]) -> _FeaturePlan:
+    """Resolve each model feature to its value source once per symbol."""
+    plan = _feature_plans.get(symbol)
+    if plan is not None and plan.features is features:
+        return plan
+    
+    numeric = []
+    categorical = []
+    for pos, feat in enumerate(features):
+        if feat in _TA_FEATURE_SOURCES:
+            numeric.append((pos, (_SRC_TA, _TA_FEATURE_SOURCES[feat])))
+        elif feat in _OHLCV_FEATURE_SOURCES:
+            # Without candles these fall through to the name-based defaults
+            numeric.append((pos, (_SRC_OHLCV, _OHLCV_FEATURE_SOURCES[feat], _default_feature_spec(feat))))
+        elif feat in CATEGORICAL_COLS:
+            categorical.append((pos, feat))
+        else:
+            numeric.append((pos, _default_feature_spec(feat)))
+    
+    template = np.zeros(len(numeric), dtype=np.float64)
+    ta_groups: dict = {}
+    ohlcv_groups: dict = {}
+    for i, (_, spec) in enumerate(numeric):
+        if spec[0] == _SRC_CONST:
+            template[i] = spec[1]
+        elif spec[0] == _SRC_TA:
+            ta_groups.setdefault(spec[1], []).append(i)
+        else:
+            ohlcv_groups.setdefault(spec[1], []).append(i)
+    
+    plan = _FeaturePlan(
+        features=features,
+        numeric=numeric,
+        categorical=categorical,
+        numeric_cols=[features[pos] for pos, _ in numeric],
+        template=template,
+        ta_groups=[(key, np.array(idxs)) for key, idxs in ta_groups.items()],
+        ohlcv_groups=[(field, np.array(idxs)) for field, idxs in ohlcv_groups.items()],
+    )
+    _feature_plans[symbol] = plan
+    return plan
+
+
+def _to_float(value) -> float:
+    """Numeric coercion matching pd.to_numeric(errors='coerce').fillna(0.0)."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if value != value else value
+
+
+def _feature_values(plan: _FeaturePlan, ta: dict, candles: list) -> tuple:
+    """Fill the numeric feature row and categorical values from a feature plan."""
+    close = ta["close"]
+    
+    # Each source is read once and broadcast to every column that mirrors it
+    row = plan.template.copy()
+    for key, idxs in plan.ta_groups:
+        row[idxs] = _to_float(ta[key])
     
-    # OHLCV for different timeframes
     if candles:
         last = candles[-1]
-        ohlcv_map = {
-            "open_M30": last.get("open", ta["close"]),
-            "high_M30": last.get("high", ta["close"]),
-            "low_M30": last.get("low", ta["close"]),
-            "close_M30": last.get("close", ta["close"]),
-            "volume_M30": last.get("volume", 0),
-            "Open_M30": last.get("open", ta["close"]),
-            "High_M30": last.get("high", ta["close"]),
-            "Low_M30": last.get("low", ta["close"]),
-            "Close_M30": last.get("close", ta["close"]),
-            "Volume_M30": last.get("volume", 0),
-            "open_H1": last.get("open", ta["close"]),
-            "high_H1": last.get("high", ta["close"]),
-            "low_H1": last.get("low", ta["close"]),
-            "close_H1": last.get("close", ta["close"]),
-            "volume_H1": last.get("volume", 0),
-            "Open_H1": last.get("open", ta["close"]),
-            "High_H1": last.get("high", ta["close"]),
-            "Low_H1": last.get("low", ta["close"]),
-            "Close_H1": last.get("close", ta["close"]),
-            "Volume_H1": last.get("volume", 0),
-            "open_H4": last.get("open", ta["close"]),
-            "high_H4": last.get("high", ta["close"]),
-            "low_H4": last.get("low", ta["close"]),
-            "close_H4": last.get("close", ta["close"]),
-            "volume_H4": last.get("volume", 0),
-            "Open_H4": last.get("open", ta["close"]),
-            "High_H4": last.get("high", ta["close"]),
-            "Low_H4": last.get("low", ta["close"]),
-            "Close_H4": last.get("close", ta["close"]),
-            "Volume_H4": last.get("volume", 0),
-        }
-        indicator_map.update(ohlcv_map)
+        for field, idxs in plan.ohlcv_groups:
+            row[idxs] = _to_float(last.get(field, 0 if field == "volume" else close))
+    elif plan.ohlcv_groups:
+        for i, (_, spec) in enumerate(plan.numeric):
+            if spec[0] == _SRC_OHLCV:
+                default = spec[2]
+                row[i] = _to_float(ta[default[1]]) if default[0] == _SRC_TA else default[1]
+    
+    cat_values = []
+    for _, feat in plan.categorical:
+        # Set categorical defaults based on trend direction
+        if feat == 'signal':
+            cat_values.append('bullish' if ta.get('trend_direction', 0) >= 0 else 'bearish')
+        else:
+            cat_values.append(CAT_DEFAULTS.get(feat, 'unknown'))
     
-    # Build feature vector
-    import pandas as pd
+    return row, cat_values
+
+
+def _build_feature_vector(symbol: str, ta: dict, candles: list):
+    """
+    Build feature vector for model prediction: a (1, n_features) float64
+    array, or a one-row DataFrame when the model has categorical columns.
+    """
     
-    # Categorical columns that must remain as strings
-    CATEGORICAL_COLS = {'components', 'route', 'signal'}
+    model = _load_model(symbol)
+    if model is None:
+        return None
     
-    # Default categorical values based on model training
-    CAT_DEFAULTS = {
-        'components': 'break_retest',
-        'route': 'unknown',
-        'signal': 'bullish',  # Will be set based on trend
-    }
+    features = _model_features.get(symbol, [])
+    if not features:
+        return None
     
-    for feat in features:
-        if feat in indicator_map:
-            feature_dict[feat] = indicator_map[feat]
-        elif feat in CATEGORICAL_COLS:
-            # Set categorical defaults based on trend direction
-            if feat == 'signal':
-                feature_dict[feat] = 'bullish' if ta.get('trend_direction', 0) >= 0 else 'bearish'
-            else:
-                feature_dict[feat] = CAT_DEFAULTS.get(feat, 'unknown')
-        else:
-            # Default values for missing numeric features
-            if "price" in feat.lower() or "close" in feat.lower():
-                feature_dict[feat] = ta["close"]
-            elif "volume" in feat.lower() or "obv" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "score" in feat.lower() or "conf" in feat.lower():
-                feature_dict[feat] = 0.5
-            elif "zscore" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "returns" in feat.lower() or "std" in feat.lower():
-                feature_dict[feat] = 0.01
-            elif "ma" in feat.lower() and any(c.isdigit() for c in feat):
-                feature_dict[feat] = ta["close"]
-            elif "lag" in feat.lower():
-                feature_dict[feat] = ta["close"]
-            elif "min" in feat.lower() or "max" in feat.lower():
-                feature_dict[feat] = ta["close"]
-            elif "cmf" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "psar" in feat.lower():
-                feature_dict[feat] = ta["close"]
-            elif "regime" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "strength" in feat.lower():
-                feature_dict[feat] = 0.5
-            elif "quality" in feat.lower():
-                feature_dict[feat] = 0.5
-            elif "breakout" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "formation" in feat.lower():
-                feature_dict[feat] = 0.5
-            elif "ichimoku" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "interaction" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "wave" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "mkt" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "compression" in feat.lower():
-                feature_dict[feat] = 0.0
-            elif "pattern_id" in feat.lower():
-                feature_dict[feat] = 0.0
-            else:
-                feature_dict[feat] = 0.0
+    plan = _feature_plan(symbol, features)
+    row, cat_values = _feature_values(plan, ta, candles)
     
-    # Create DataFrame with correct column order
-    df = pd.DataFrame([feature_dict])[features]
+    if not plan.categorical:
+        # All-numeric models take the (1, n_features) float64 row directly: no DataFrame
+        return row.reshape(1, -1)
     
-    # Convert numeric columns to float64, keep categorical as object
-    for col in df.columns:
-        if col not in CATEGORICAL_COLS:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0).astype(np.float64)
-        else:
-            df[col] = df[col].astype(str)
+    # One float64 block for the numeric columns, categorical strings inserted in place
+    df = pd.DataFrame(row.reshape(1, -1), columns=plan.numeric_cols)
+    for (pos, feat), value in zip(plan.categorical, cat_values):
+        df.insert(pos, feat, [str(value)])
     
     return df
 
 
-async def get_ml_prediction(symbol: str) -> PredictionResult:
-    """Get ML prediction for symbol with direction and pip targets."""
+def _prepare_features(symbol: str, candles: list, current_price: float) -> tuple:
+    """
+    Technical indicators and the model's feature row for a candle set.
+    
+    Returns (ta, features); features is None when there is no model or no
+    feature row.
+    """
+    # Reused until the candle set changes
+    ta = _cached_technical_indicators(symbol, candles)
+    ta["close"] = current_price
+    return ta, _build_feature_vector(symbol, ta, candles)
+
+
+def _stack_rows(rows: list):
+    """One feature matrix from single-row feature vectors/DataFrames."""
+    if len(rows) == 1:
+        return rows[0]
+    if isinstance(rows[0], np.ndarray):
+        return np.vstack(rows)
+    return pd.concat(rows, ignore_index=True)
+
+
+class _PredictBatcher:
+    """
+    Coalesces concurrent predict_proba calls for one model.
+    
+    Rows are queued; a single consumer task takes whatever is queued (up to
+    PREDICT_BATCH_SIZE rows) and scores it with one predict_proba call in a
+    worker thread. Rows that arrive while a batch is being scored form the
+    next batch, so a lone request is never held back waiting for company.
+    """
+    
+    def __init__(self, model):
+        self.model = model
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def predict_proba(self, row) -> np.ndarray:
+        """Class probabilities for a single feature row."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._consume(self._queue))
+        future = loop.create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+    
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < PREDICT_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                proba = await asyncio.to_thread(self._predict_matrix, _stack_rows([row for row, _ in batch]))
+            except Exception as e:
+                if len(batch) == 1:
+                    self._settle(batch[0][1], exception=e)
+                else:
+                    # Don't fail every caller for one bad row: score them one by one
+                    for row, future in batch:
+                        try:
+                            row_proba = (await asyncio.to_thread(self._predict_matrix, row))[0]
+                        except Exception as row_error:
+                            self._settle(future, exception=row_error)
+                        else:
+                            self._settle(future, result=row_proba)
+                continue
+            
+            for (_, future), row_proba in zip(batch, proba):
+                self._settle(future, result=row_proba)
+    
+    def _predict_matrix(self, features) -> np.ndarray:
+        """predict_proba for a feature matrix."""
+        booster = getattr(self.model, "booster_", None)
+        if booster is None or not isinstance(features, np.ndarray):
+            return self.model.predict_proba(features)
+        # Straight to the LightGBM booster: skips the sklearn wrapper's input
+        # validation, which the feature plan already guarantees
+        proba = booster.predict(features)
+        if proba.ndim == 1:
+            # Binary objective: positive-class probability, laid out as predict_proba does
+            return np.column_stack((1.0 - proba, proba))
+        return proba
+    
+    @staticmethod
+    def _settle(future: asyncio.Future, result=None, exception: Optional[BaseException] = None) -> None:
+        # The caller may have been cancelled meanwhile
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+
+_batchers: dict = {}
+
+
+async def _predict_proba(symbol: str, features) -> Optional[np.ndarray]:
+    """Model probabilities for one feature row (batched with concurrent calls); None on failure."""
+    model = _load_model(symbol)
+    if model is None:
+        return None
+    
+    batcher = _batchers.get(symbol)
+    if batcher is None or batcher.model is not model:
+        batcher = _batchers[symbol] = _PredictBatcher(model)
+    
+    try:
+        return await batcher.predict_proba(features)
+    except Exception as e:
+        logger.error(f"Model prediction error: {e}")
+        return None
+
+
+# _trend_confirmation flag bits
+TREND_STRONG_BULLISH = 1
+TREND_STRONG_BEARISH = 2
+TREND_BULLISH_MOMENTUM = 4
+TREND_BEARISH_MOMENTUM = 8
+
+
+def _trend_confirmation(
+    price: float, ema_20: float, ema_50: float, ema_200: float,
+    momentum_3: float, momentum_10: float, rsi_14: float, macd_hist: float,
+) -> tuple:
+    """
+    Trend score (-1 to +1) from EMA alignment and momentum, plus TREND_* flags.
+    """
+    price_above_ema20 = price > ema_20
+    price_above_ema200 = price > ema_200
+    ema20_above_ema50 = ema_20 > ema_50
+    ema50_above_ema200 = ema_50 > ema_200
+    
+    # Strong bullish: Price > EMA20 > EMA50 > EMA200
+    strong_bullish = int(price_above_ema20 and ema20_above_ema50 and ema50_above_ema200)
+    # Strong bearish: Price < EMA20 < EMA50 < EMA200
+    strong_bearish = int(not (price_above_ema20 or ema20_above_ema50 or ema50_above_ema200))
+    # Momentum confirmation: both momenta and RSI on the same side
+    bullish_momentum = int(momentum_3 > 0 and momentum_10 > 0 and rsi_14 > 50)
+    bearish_momentum = int(momentum_3 < 0 and momentum_10 < 0 and rsi_14 < 50)
+    
+    # Each pair is mutually exclusive, so the if/elif ladder reduces to
+    # arithmetic on the 0/1 conditions (summed in the ladder's order)
+    score = (
+        0.4 * strong_bullish - 0.4 * strong_bearish
+        + 0.2 * (2 * int(price_above_ema200) - 1)
+        + 0.2 * (bullish_momentum - bearish_momentum)
+        + 0.1 * (2 * int(macd_hist > 0) - 1)
+    )
+    flags = (
+        strong_bullish * TREND_STRONG_BULLISH
+        | strong_bearish * TREND_STRONG_BEARISH
+        | bullish_momentum * TREND_BULLISH_MOMENTUM
+        | bearish_momentum * TREND_BEARISH_MOMENTUM
+    )
+    return score, flags
+
+
+def _unwrap(result):
+    """Re-raise an exception captured by asyncio.gather(return_exceptions=True)."""
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+async def _fetch_mtf(symbol: str) -> dict:
+    from services.mtf_analysis_service import get_mtf_analysis
+    return await get_mtf_analysis(symbol)
+
+
+async def _fetch_slippage() -> dict:
+    from services.slippage_monitor import get_slippage_adjustment
+    return await get_slippage_adjustment()
+
+
+async def _fetch_cot(symbol: str) -> dict:
+    from services.cot_report_service import get_cot_adjustment
+    return await get_cot_adjustment(symbol)
+
+
+@async_ttl_cache(ttl=PATTERN_CACHE_TTL_SECONDS)
+async def _fetch_patterns(symbol: str) -> dict:
+    from services.pattern_analyzer import run_claude_pattern_analysis
+    return await run_claude_pattern_analysis(symbol, ["15m", "1h"], lang="tr")
+
+
+@async_ttl_cache(ttl=PATTERN_CACHE_TTL_SECONDS)
+async def _fetch_candlestick(symbol: str) -> dict:
+    from services.candlestick_pattern_service import get_candlestick_adjustment
+    return await get_candlestick_adjustment(symbol)
+
+
+async def _fetch_sr_features(symbol: str, current_price: float) -> dict:
+    from services.sr_ml_features import get_sr_features_for_ml
+    return await get_sr_features_for_ml(symbol, current_price)
+
+
+def _normalize_symbol(symbol: str) -> str:
+    """Map symbol aliases onto the name the models and data fetchers use."""
+    upper = symbol.upper()
+    return "NDX.INDX" if upper in ("NASDAQ", "NDX.INDX", "NDX") else upper
+
+
+async def get_ml_predictions(symbols: List[str], include_reasoning: bool = True) -> List[PredictionResult]:
+    """
+    Predictions for several symbols, in the order given.
+    
+    Each symbol has its own model (and a single feature row), so there is no
+    shared predict call to batch. Instead aliases of one symbol (NASDAQ/NDX)
+    are predicted once, and distinct symbols run concurrently so their data
+    fetches overlap.
+    """
+    normalized = [_normalize_symbol(symbol) for symbol in symbols]
+    unique = list(dict.fromkeys(normalized))
+    results = await asyncio.gather(*(get_ml_prediction(symbol, include_reasoning) for symbol in unique))
+    by_symbol = dict(zip(unique, results))
+    return [by_symbol[symbol] for symbol in normalized]
+
+
+async def get_ml_prediction(symbol: str, include_reasoning: bool = True) -> PredictionResult:
+    """
+    Get ML prediction for symbol with direction and pip targets.
+    
+    Callers that only consume direction/confidence/targets (batch jobs,
+    backtests) can pass include_reasoning=False to skip building the reasoning
+    text and key levels; both come back as empty lists.
+    """
     from services.data_fetcher import fetch_eod_candles, fetch_30m_candles, fetch_latest_price
     
-    # Normalize symbol
-    normalized_symbol = "NDX.INDX" if symbol.upper() in ["NASDAQ", "NDX.INDX", "NDX"] else symbol.upper()
+    normalized_symbol = _normalize_symbol(symbol)
     
     # For XAUUSD, get news impact analysis
     news_sentiment = 0.0
@@ -567,26 +883,28 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     if not candles:
         return _default_prediction(normalized_symbol, "No candle data available")
     
-    # Extract arrays
-    closes = np.array([c["close"] for c in candles], dtype=float)
-    highs = np.array([c["high"] for c in candles], dtype=float)
-    lows = np.array([c["low"] for c in candles], dtype=float)
-    volumes = np.array([c.get("volume", 0) for c in candles], dtype=float)
-    
-    current_price = float(live_price) if live_price else float(closes[-1])
-    
-    # Compute technical indicators
-    ta = _compute_technical_indicators(closes, highs, lows, volumes)
-    ta["close"] = current_price
-    
-    # Build feature vector
-    feature_df = _build_feature_vector(normalized_symbol, ta, candles)
-    
-    # Load model and predict
-    model = _load_model(normalized_symbol)
-    
-    if model is None or feature_df is None:
-        return _rule_based_prediction(normalized_symbol, ta, current_price)
+    current_price = float(live_price) if live_price else float(candles[-1]["close"])
+    
+    # Indicators and the feature row are CPU-bound: keep them off the event loop
+    ta, features = await asyncio.to_thread(_prepare_features, normalized_symbol, candles, current_price)
+    proba = None if features is None else await _predict_proba(normalized_symbol, features)
+    
+    if proba is None:
+        return _rule_based_prediction(normalized_symbol, ta, current_price, is_gold, include_reasoning)
+    
+    # The context sources below are independent upstream calls: fetch them
+    # concurrently, then apply each result in the usual order
+    (
+        mtf_result, slippage_result, cot_result, pattern_result, candlestick_result, sr_result,
+    ) = await asyncio.gather(
+        _fetch_mtf(normalized_symbol),
+        _fetch_slippage(),
+        _fetch_cot(normalized_symbol),
+        _fetch_patterns(normalized_symbol),
+        _fetch_candlestick(normalized_symbol),
+        _fetch_sr_features(normalized_symbol, current_price),
+        return_exceptions=True,
+    )
     
     # ═══════════════════════════════════════════════════════════════════
     # MTF ADVANCED DATA INTEGRATION - Professional Trading Enhancements
@@ -602,8 +920,7 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     }
     
     try:
-        from services.mtf_analysis_service import get_mtf_analysis
-        mtf_data = await get_mtf_analysis(normalized_symbol)
+        mtf_data = _unwrap(mtf_result)
         
         if mtf_data.get("success") and "advanced" in mtf_data:
             adv = mtf_data["advanced"]
@@ -694,8 +1011,7 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     # ═══════════════════════════════════════════════════════════════════
     slippage_data = {"position_multiplier": 1.0, "warning": None, "confidence_penalty": 0}
     try:
-        from services.slippage_monitor import get_slippage_adjustment
-        slippage_data = await get_slippage_adjustment()
+        slippage_data = _unwrap(slippage_result)
         
         if slippage_data.get("high_slippage_mode"):
             mtf_adjustments["warnings"].append(slippage_data.get("warning", "⚠️ High slippage detected"))
@@ -708,8 +1024,7 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     # ═══════════════════════════════════════════════════════════════════
     cot_data = {"confidence_adjustment": 0, "signal": "NEUTRAL", "warning": None}
     try:
-        from services.cot_report_service import get_cot_adjustment
-        cot_data = await get_cot_adjustment(normalized_symbol)
+        cot_data = _unwrap(cot_result)
         
         if cot_data.get("signal") == "TREND_EXHAUSTION":
             # Speculators overcrowded - reduce confidence significantly
@@ -735,8 +1050,7 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     # ═══════════════════════════════════════════════════════════════════
     pattern_data = {"patterns": [], "recommendation": "HOLD", "confidence_boost": 0}
     try:
-        from services.pattern_analyzer import run_claude_pattern_analysis
-        pattern_result = await run_claude_pattern_analysis(normalized_symbol, ["15m", "1h"], lang="tr")
+        pattern_result = _unwrap(pattern_result)
         
         all_patterns = []
         bullish_count = 0
@@ -785,8 +1099,7 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     # ═══════════════════════════════════════════════════════════════════
     candlestick_data = {"patterns": [], "signal": "NEUTRAL", "adjustment": 0}
     try:
-        from services.candlestick_pattern_service import get_candlestick_adjustment
-        candlestick_data = await get_candlestick_adjustment(normalized_symbol)
+        candlestick_data = _unwrap(candlestick_result)
         
         if candlestick_data.get("has_patterns"):
             signal = candlestick_data.get("strongest_signal", "NEUTRAL")
@@ -814,8 +1127,7 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     # ═══════════════════════════════════════════════════════════════════
     sr_features = {}
     try:
-        from services.sr_ml_features import get_sr_features_for_ml
-        sr_features = await get_sr_features_for_ml(normalized_symbol, current_price)
+        sr_features = _unwrap(sr_result)
         
         # S/R dynamic weight'i MTF adjustments'a ekle
         sr_weight = sr_features.get('sr_dynamic_weight', 0.5)
@@ -862,8 +1174,6 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
         logger.debug(f"S/R Feature Engine skipped: {sr_err}")
     
     try:
-        # Get prediction probabilities
-        proba = model.predict_proba(feature_df)[0]
         prob_down = float(proba[0])
         prob_up = float(proba[1])
         
@@ -882,46 +1192,15 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
         ema_50 = ta.get("ema_50", current_price)
         ema_200 = ta.get("ema_200", current_price)
         
-        # Calculate trend strength from EMA positions
-        price_above_ema20 = current_price > ema_20
-        price_above_ema50 = current_price > ema_50
-        price_above_ema200 = current_price > ema_200
-        ema20_above_ema50 = ema_20 > ema_50
-        ema50_above_ema200 = ema_50 > ema_200
-        
-        # Strong bullish: Price > EMA20 > EMA50 > EMA200
-        strong_bullish_trend = price_above_ema20 and ema20_above_ema50 and ema50_above_ema200
-        # Strong bearish: Price < EMA20 < EMA50 < EMA200
-        strong_bearish_trend = not price_above_ema20 and not ema20_above_ema50 and not ema50_above_ema200
-        
-        # Calculate momentum confirmation
-        momentum_3 = ta.get("momentum_3", 0)
-        momentum_10 = ta.get("momentum_10", 0)
         rsi_14 = ta.get("rsi_14", 50)
-        macd_hist = ta.get("macd_hist", 0)
-        
-        # Bullish momentum: positive momentum + RSI > 50 + MACD positive
-        bullish_momentum = momentum_3 > 0 and momentum_10 > 0 and rsi_14 > 50
-        bearish_momentum = momentum_3 < 0 and momentum_10 < 0 and rsi_14 < 50
-        
-        # Trend score (-1 to +1)
-        trend_score = 0
-        if strong_bullish_trend:
-            trend_score += 0.4
-        elif strong_bearish_trend:
-            trend_score -= 0.4
-        if price_above_ema200:
-            trend_score += 0.2
-        else:
-            trend_score -= 0.2
-        if bullish_momentum:
-            trend_score += 0.2
-        elif bearish_momentum:
-            trend_score -= 0.2
-        if macd_hist > 0:
-            trend_score += 0.1
-        else:
-            trend_score -= 0.1
+        trend_score, trend_flags = _trend_confirmation(
+            current_price, ema_20, ema_50, ema_200,
+            ta.get("momentum_3", 0), ta.get("momentum_10", 0), rsi_14, ta.get("macd_hist", 0),
+        )
+        strong_bullish_trend = bool(trend_flags & TREND_STRONG_BULLISH)
+        strong_bearish_trend = bool(trend_flags & TREND_STRONG_BEARISH)
+        bullish_momentum = bool(trend_flags & TREND_BULLISH_MOMENTUM)
+        bearish_momentum = bool(trend_flags & TREND_BEARISH_MOMENTUM)
         
         logger.info(f"Trend analysis: score={trend_score:.2f}, bullish={strong_bullish_trend}, bearish={strong_bearish_trend}")
         
@@ -1006,44 +1285,16 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
         
     except Exception as e:
         logger.error(f"Model prediction error: {e}")
-        return _rule_based_prediction(normalized_symbol, ta, current_price)
+        return _rule_based_prediction(normalized_symbol, ta, current_price, is_gold, include_reasoning)
     
     # Calculate pip targets based on ATR
     atr = ta["atr_14"]
     # Pip value: XAUUSD = 0.01 (100 pips = $1), NASDAQ = 1.0 (points)
-    pip_value = 0.01 if "XAU" in normalized_symbol else 1.0
+    pip_value = 0.01 if is_gold else 1.0
     
     # Dynamic R/R based on confidence and trend strength
     # Higher confidence = more aggressive targets
-    # Base multipliers adjusted by market conditions
-    rsi = ta.get("rsi_14", 50)
-    adx = ta.get("adx_14", 20)
-    
-    # Base target/stop multipliers
-    base_target_mult = 1.5
-    base_stop_mult = 0.75
-    
-    # Adjust based on confidence (higher confidence = tighter stops, wider targets)
-    if confidence > 75:
-        target_mult = base_target_mult * 1.3  # 1.95
-        stop_mult = base_stop_mult * 0.85     # 0.64
-    elif confidence > 65:
-        target_mult = base_target_mult * 1.15  # 1.73
-        stop_mult = base_stop_mult * 0.9       # 0.68
-    elif confidence < 55:
-        target_mult = base_target_mult * 0.8   # 1.2
-        stop_mult = base_stop_mult * 1.2       # 0.9
-    else:
-        target_mult = base_target_mult
-        stop_mult = base_stop_mult
-    
-    # Adjust for trend strength (ADX)
-    if adx > 30:  # Strong trend
-        target_mult *= 1.1
-        stop_mult *= 0.9
-    elif adx < 20:  # Weak trend
-        target_mult *= 0.85
-        stop_mult *= 1.1
+    target_mult, stop_mult = _target_stop_multipliers(confidence, ta.get("adx_14", 20))
     
     # ATR-based price distances with dynamic multipliers
     target_distance = atr * target_mult
@@ -1065,32 +1316,26 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     
     risk_reward = target_pips / stop_pips if stop_pips > 0 else 0
     
-    # Generate reasoning
-    reasoning = _generate_reasoning(ta, direction, confidence, normalized_symbol)
-    
-    # Add MTF warnings to reasoning
-    if mtf_adjustments["warnings"]:
-        reasoning.insert(0, f"📊 MTF Analysis ({mtf_adjustments['regime']} | {mtf_adjustments['session']}):")
-        reasoning.extend(mtf_adjustments["warnings"][:5])
-    
-    # Add news factors for XAUUSD
-    if is_gold and news_factors:
-        reasoning.insert(0, f"📰 News Impact ({news_confidence:.0f}% confidence):")
-        reasoning.extend(news_factors[:5])
-    
-    # Key levels
-    key_levels = [
-        {"type": "EMA20", "price": ta["ema_20"], "distance": f"{((current_price - ta['ema_20']) / ta['ema_20'] * 100):.2f}%"},
-        {"type": "EMA50", "price": ta["ema_50"], "distance": f"{((current_price - ta['ema_50']) / ta['ema_50'] * 100):.2f}%"},
-        {"type": "EMA200", "price": ta["ema_200"], "distance": f"{((current_price - ta['ema_200']) / ta['ema_200'] * 100):.2f}%"},
-        {"type": "Boll Upper", "price": ta["boll_upper"], "distance": f"{((ta['boll_upper'] - current_price) / current_price * 100):.2f}%"},
-        {"type": "Boll Lower", "price": ta["boll_lower"], "distance": f"{((current_price - ta['boll_lower']) / current_price * 100):.2f}%"},
-    ]
+    reasoning = []
+    key_levels = []
+    if include_reasoning:
+        # Generate reasoning
+        reasoning = _generate_reasoning(ta, direction, confidence, normalized_symbol)
+        
+        # Add MTF warnings to reasoning
+        if mtf_adjustments["warnings"]:
+            reasoning.insert(0, f"📊 MTF Analysis ({mtf_adjustments['regime']} | {mtf_adjustments['session']}):")
+            reasoning.extend(mtf_adjustments["warnings"][:5])
+        
+        # Add news factors for XAUUSD
+        if is_gold and news_factors:
+            reasoning.insert(0, f"📰 News Impact ({news_confidence:.0f}% confidence):")
+            reasoning.extend(news_factors[:5])
+        
+        key_levels = _key_levels(ta, current_price)
     
     # Calculate scores
-    technical_score = _calculate_technical_score(ta)
-    momentum_score = _calculate_momentum_score(ta)
-    trend_score = _calculate_trend_score(ta)
+    technical_score, momentum_score, trend_score = _calculate_scores(ta)
     
     # Volatility regime
     vol = ta["volatility"]
@@ -1121,7 +1366,8 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
         adjusted_confidence = feedback_result.get("adjusted_confidence", confidence)
         feedback_warnings = feedback_result.get("warnings", [])
         if feedback_warnings:
-            reasoning.extend([f"⚠️ {w}" for w in feedback_warnings])
+            if include_reasoning:
+                reasoning.extend([f"⚠️ {w}" for w in feedback_warnings])
             logger.info(f"Learning feedback applied: {confidence:.1f}% -> {adjusted_confidence:.1f}%")
         confidence = adjusted_confidence
     except Exception as fb_err:
@@ -1161,9 +1407,10 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
                         confidence = adj['new_confidence']
                 
                 # Yeni uyarıları ekle
-                for warning in post_result.get('warnings', []):
-                    if warning not in reasoning:
-                        reasoning.append(warning)
+                if include_reasoning:
+                    for warning in post_result.get('warnings', []):
+                        if warning not in reasoning:
+                            reasoning.append(warning)
                 
                 logger.info(f"S/R Post-process: {direction} @ {confidence:.1f}%, adjustments={len(post_result['sr_adjustments'])}")
         except Exception as pp_err:
@@ -1192,152 +1439,181 @@ async def get_ml_prediction(symbol: str) -> PredictionResult:
     )
 
 
+# ATR target/stop multipliers: base 1.5 / 0.75, scaled by a confidence bucket
+# (<55, 55-65, 65-75, >75: higher confidence = wider target, tighter stop) and
+# then by an ADX bucket (<20 weak, 20-30, >30 strong trend)
+_CONFIDENCE_MULT_FACTORS = ((0.8, 1.2), (1.0, 1.0), (1.15, 0.9), (1.3, 0.85))
+_ADX_MULT_FACTORS = ((0.85, 1.1), (1.0, 1.0), (1.1, 0.9))
+_MULT_TABLE = tuple(
+    tuple(
+        (1.5 * conf_target * adx_target, 0.75 * conf_stop * adx_stop)
+        for adx_target, adx_stop in _ADX_MULT_FACTORS
+    )
+    for conf_target, conf_stop in _CONFIDENCE_MULT_FACTORS
+)
+
+
+def _target_stop_multipliers(confidence: float, adx: float) -> tuple:
+    """(target, stop) ATR multipliers looked up from _MULT_TABLE."""
+    ci = 3 if confidence > 75 else 2 if confidence > 65 else 0 if confidence < 55 else 1
+    ai = 2 if adx > 30 else 0 if adx < 20 else 1
+    return _MULT_TABLE[ci][ai]
+
+
+# Key levels reported with a prediction
+_LEVEL_LABELS = ("EMA20", "EMA50", "EMA200", "Boll Upper", "Boll Lower")
+_LEVEL_INPUTS = itemgetter("ema_20", "ema_50", "ema_200", "boll_upper", "boll_lower")
+# EMA distances are relative to the EMA, band distances to the price (both
+# positive when the price sits inside the bands)
+_LEVEL_SIGNS = np.array([1.0, 1.0, 1.0, -1.0, 1.0])
+_LEVEL_RELATIVE_TO_PRICE = np.array([False, False, False, True, True])
+
+
+def _key_levels(ta: dict, current_price: float) -> List[dict]:
+    """EMA and Bollinger levels with their % distance from the current price."""
+    prices = np.array(_LEVEL_INPUTS(ta), dtype=np.float64)
+    base = np.where(_LEVEL_RELATIVE_TO_PRICE, current_price, prices)
+    distances = _LEVEL_SIGNS * (current_price - prices) / base * 100
+    return [
+        {"type": label, "price": price, "distance": f"{distance:.2f}%"}
+        for label, price, distance in zip(_LEVEL_LABELS, prices.tolist(), distances.tolist())
+    ]
+
+
+# Indicator fields read by the reasoning, score and rule helpers, unpacked in one call
+_REASONING_INPUTS = itemgetter("rsi_14", "macd_hist", "boll_zscore", "momentum_10", "volatility")
+_TECHNICAL_INPUTS = itemgetter("rsi_14", "trend_direction", "boll_zscore", "macd_hist")
+_TREND_INPUTS = itemgetter("close", "ema_20", "ema_50", "ema_200")
+
+
+# Reasoning phrases, one tuple per indicator indexed by the bucket
+# _generate_reasoning picks; None = nothing to say for that bucket
+_RSI_REASONS = (
+    "RSI aşırı alım bölgesinde ({:.0f})",
+    "RSI aşırı satım bölgesinde ({:.0f})",
+    "RSI pozitif momentum ({:.0f})",
+    "RSI negatif momentum ({:.0f})",
+)
+_EMA_REASONS = (
+    "Güçlü yükseliş trendi: Fiyat > EMA20 > EMA50 > EMA200",
+    "Güçlü düşüş trendi: Fiyat < EMA20 < EMA50 < EMA200",
+    "Fiyat uzun vadeli EMA200 üzerinde (boğa eğilimi)",
+    "Fiyat uzun vadeli EMA200 altında (ayı eğilimi)",
+)
+_MACD_REASONS = (
+    "MACD histogram pozitif ({:.2f})",
+    "MACD histogram negatif ({:.2f})",
+)
+_BOLLINGER_REASONS = (
+    "Fiyat Bollinger üst bandının üzerinde (aşırı alım)",
+    "Fiyat Bollinger alt bandının altında (aşırı satım)",
+    "Fiyat Bollinger ortalamasının üzerinde",
+    "Fiyat Bollinger ortalamasının altında",
+)
+_MOMENTUM_REASONS = (
+    "Güçlü pozitif momentum (10 günlük: +{:.1f}%)",
+    "Güçlü negatif momentum (10 günlük: {:.1f}%)",
+    None,
+)
+_VOLATILITY_REASONS = (
+    "Yüksek volatilite ortamı ({:.1f}%)",
+    "Düşük volatilite ortamı ({:.1f}%)",
+    None,
+)
+_VERDICT_REASONS = {
+    "BUY": "Model güveni: {:.0f}% - ALIŞ sinyali",
+    "SELL": "Model güveni: {:.0f}% - SATIŞ sinyali",
+}
+_VERDICT_HOLD = "Model belirsiz: {:.0f}% - BEKLE"
+
+
 def _generate_reasoning(ta: dict, direction: str, confidence: float, symbol: str) -> List[str]:
     """Generate human-readable reasoning for the prediction."""
-    reasons = []
-    
-    # RSI analysis
-    rsi = ta["rsi_14"]
-    if rsi > 70:
-        reasons.append(f"RSI aşırı alım bölgesinde ({rsi:.0f})")
-    elif rsi < 30:
-        reasons.append(f"RSI aşırı satım bölgesinde ({rsi:.0f})")
-    elif rsi > 50:
-        reasons.append(f"RSI pozitif momentum ({rsi:.0f})")
-    else:
-        reasons.append(f"RSI negatif momentum ({rsi:.0f})")
-    
-    # EMA analysis
-    close = ta["close"]
-    ema20 = ta["ema_20"]
-    ema50 = ta["ema_50"]
-    ema200 = ta["ema_200"]
+    rsi, macd, zscore, mom, vol = _REASONING_INPUTS(ta)
+    close, ema20, ema50, ema200 = _TREND_INPUTS(ta)
     
+    # Buckets keep the comparison order of the original if/elif chains
+    # (a NaN input falls through to the last bucket)
+    rsi_bucket = 0 if rsi > 70 else 1 if rsi < 30 else 2 if rsi > 50 else 3
     if close > ema20 > ema50 > ema200:
-        reasons.append("Güçlü yükseliş trendi: Fiyat > EMA20 > EMA50 > EMA200")
+        ema_bucket = 0
     elif close < ema20 < ema50 < ema200:
-        reasons.append("Güçlü düşüş trendi: Fiyat < EMA20 < EMA50 < EMA200")
-    elif close > ema200:
-        reasons.append("Fiyat uzun vadeli EMA200 üzerinde (boğa eğilimi)")
-    else:
-        reasons.append("Fiyat uzun vadeli EMA200 altında (ayı eğilimi)")
-    
-    # MACD
-    macd = ta["macd_hist"]
-    if macd > 0:
-        reasons.append(f"MACD histogram pozitif ({macd:.2f})")
-    else:
-        reasons.append(f"MACD histogram negatif ({macd:.2f})")
-    
-    # Bollinger
-    zscore = ta["boll_zscore"]
-    if zscore > 2:
-        reasons.append("Fiyat Bollinger üst bandının üzerinde (aşırı alım)")
-    elif zscore < -2:
-        reasons.append("Fiyat Bollinger alt bandının altında (aşırı satım)")
-    elif zscore > 0:
-        reasons.append("Fiyat Bollinger ortalamasının üzerinde")
+        ema_bucket = 1
     else:
-        reasons.append("Fiyat Bollinger ortalamasının altında")
-    
-    # Momentum
-    mom = ta["momentum_10"]
-    if mom > 2:
-        reasons.append(f"Güçlü pozitif momentum (10 günlük: +{mom:.1f}%)")
-    elif mom < -2:
-        reasons.append(f"Güçlü negatif momentum (10 günlük: {mom:.1f}%)")
-    
-    # Volatility
-    vol = ta["volatility"]
-    if vol > 25:
-        reasons.append(f"Yüksek volatilite ortamı ({vol:.1f}%)")
-    elif vol < 15:
-        reasons.append(f"Düşük volatilite ortamı ({vol:.1f}%)")
+        ema_bucket = 2 if close > ema200 else 3
+    bollinger_bucket = 0 if zscore > 2 else 1 if zscore < -2 else 2 if zscore > 0 else 3
+    momentum_bucket = 0 if mom > 2 else 1 if mom < -2 else 2
+    volatility_bucket = 0 if vol > 25 else 1 if vol < 15 else 2
+    
+    reasons = [
+        _RSI_REASONS[rsi_bucket].format(rsi),
+        _EMA_REASONS[ema_bucket],
+        _MACD_REASONS[0 if macd > 0 else 1].format(macd),
+        _BOLLINGER_REASONS[bollinger_bucket],
+    ]
+    momentum_reason = _MOMENTUM_REASONS[momentum_bucket]
+    if momentum_reason is not None:
+        reasons.append(momentum_reason.format(mom))
+    volatility_reason = _VOLATILITY_REASONS[volatility_bucket]
+    if volatility_reason is not None:
+        reasons.append(volatility_reason.format(vol))
     
     # Final verdict
-    if direction == "BUY":
-        reasons.append(f"Model güveni: {confidence:.0f}% - ALIŞ sinyali")
-    elif direction == "SELL":
-        reasons.append(f"Model güveni: {confidence:.0f}% - SATIŞ sinyali")
-    else:
-        reasons.append(f"Model belirsiz: {confidence:.0f}% - BEKLE")
+    reasons.append(_VERDICT_REASONS.get(direction, _VERDICT_HOLD).format(confidence))
     
     return reasons
 
 
-def _calculate_technical_score(ta: dict) -> float:
-    """Calculate technical analysis score 0-100."""
-    score = 50.0
-    
-    # RSI contribution
-    rsi = ta["rsi_14"]
-    if 40 <= rsi <= 60:
-        score += 10
-    elif rsi > 70 or rsi < 30:
-        score -= 10
-    
-    # Trend alignment
-    if ta["trend_direction"] == 1:
-        score += 15
-    elif ta["trend_direction"] == -1:
-        score += 15  # Also good for shorts
-    
-    # Bollinger position
-    if -1 <= ta["boll_zscore"] <= 1:
-        score += 10
-    
-    # MACD
-    if ta["macd_hist"] > 0:
-        score += 5
-    
-    return min(100, max(0, score))
+_SCORE_INPUTS = itemgetter(
+    "rsi_14", "trend_direction", "boll_zscore", "macd_hist",
+    "momentum_3", "momentum_10", "close", "ema_20", "ema_50", "ema_200",
+)
 
 
-def _calculate_momentum_score(ta: dict) -> float:
-    """Calculate momentum score 0-100."""
-    score = 50.0
-    
-    mom3 = ta["momentum_3"]
-    mom10 = ta["momentum_10"]
+def _calculate_scores(ta: dict) -> tuple:
+    """(technical, momentum, trend) scores, each 0-100."""
+    rsi, trend_direction, zscore, macd_hist, mom3, mom10, close, ema20, ema50, ema200 = _SCORE_INPUTS(ta)
     
-    if mom3 > 0 and mom10 > 0:
-        score += 20
-    elif mom3 < 0 and mom10 < 0:
-        score += 20  # Consistent momentum either direction
-    
-    rsi = ta["rsi_14"]
+    # Technical: RSI in range, any clear trend, price inside the bands, MACD positive
+    technical = 50.0
+    if 40 <= rsi <= 60:
+        technical += 10
+    elif rsi > 70 or rsi < 30:
+        technical -= 10
+    if trend_direction == 1 or trend_direction == -1:
+        technical += 15  # Shorts count as well
+    if -1 <= zscore <= 1:
+        technical += 10
+    if macd_hist > 0:
+        technical += 5
+    
+    # Momentum: consistent direction, then RSI room or strength
+    momentum = 50.0
+    if (mom3 > 0 and mom10 > 0) or (mom3 < 0 and mom10 < 0):
+        momentum += 20
     if 45 <= rsi <= 55:
-        score += 10  # Neutral, room to move
-    elif rsi > 60:
-        score += 15  # Strong up momentum
-    elif rsi < 40:
-        score += 15  # Strong down momentum
+        momentum += 10  # Neutral, room to move
+    elif rsi > 60 or rsi < 40:
+        momentum += 15  # Strong momentum either way
     
-    return min(100, max(0, score))
-
-
-def _calculate_trend_score(ta: dict) -> float:
-    """Calculate trend score 0-100."""
-    score = 50.0
-    
-    close = ta["close"]
-    ema20 = ta["ema_20"]
-    ema50 = ta["ema_50"]
-    ema200 = ta["ema_200"]
-    
-    # EMA alignment
+    # Trend: EMA alignment
+    trend = 50.0
     if close > ema20:
-        score += 10
+        trend += 10
     if close > ema50:
-        score += 10
+        trend += 10
     if close > ema200:
-        score += 15
+        trend += 15
     if ema20 > ema50:
-        score += 10
+        trend += 10
     if ema50 > ema200:
-        score += 10
+        trend += 10
     
-    return min(100, max(0, score))
+    return (
+        min(100.0, max(0.0, technical)),
+        min(100.0, max(0.0, momentum)),
+        min(100.0, max(0.0, trend)),
+    )
 
 
 def _default_prediction(symbol: str, reason: str) -> PredictionResult:
@@ -1365,38 +1641,42 @@ def _default_prediction(symbol: str, reason: str) -> PredictionResult:
     )
 
 
-def _rule_based_prediction(symbol: str, ta: dict, current_price: float) -> PredictionResult:
+def _rule_based_prediction(
+    symbol: str, ta: dict, current_price: float, is_gold: bool, include_reasoning: bool = True
+) -> PredictionResult:
     """Fallback rule-based prediction when ML model fails."""
     
+    rsi, trend_direction, zscore, macd_hist = _TECHNICAL_INPUTS(ta)
+    
     # Simple rule-based logic
     score = 0
     
     # RSI
-    if ta["rsi_14"] < 30:
+    if rsi < 30:
         score += 2
-    elif ta["rsi_14"] > 70:
+    elif rsi > 70:
         score -= 2
-    elif ta["rsi_14"] > 50:
+    elif rsi > 50:
         score += 1
     else:
         score -= 1
     
     # Trend
-    if ta["trend_direction"] == 1:
+    if trend_direction == 1:
         score += 2
-    elif ta["trend_direction"] == -1:
+    elif trend_direction == -1:
         score -= 2
     
     # MACD
-    if ta["macd_hist"] > 0:
+    if macd_hist > 0:
         score += 1
     else:
         score -= 1
     
     # Bollinger
-    if ta["boll_zscore"] < -1.5:
+    if zscore < -1.5:
         score += 1
-    elif ta["boll_zscore"] > 1.5:
+    elif zscore > 1.5:
         score -= 1
     
     if score >= 2:
@@ -1417,36 +1697,10 @@ def _rule_based_prediction(symbol: str, ta: dict, current_price: float) -> Predi
     
     atr = ta["atr_14"]
     # Pip value: XAUUSD = 0.01 (100 pips = $1), NASDAQ = 1.0 (points)
-    pip_value = 0.01 if "XAU" in symbol else 1.0
+    pip_value = 0.01 if is_gold else 1.0
     
     # Dynamic R/R based on confidence and trend strength
-    adx = ta.get("adx_14", 20)
-    
-    # Base target/stop multipliers
-    base_target_mult = 1.5
-    base_stop_mult = 0.75
-    
-    # Adjust based on confidence
-    if confidence > 75:
-        target_mult = base_target_mult * 1.3
-        stop_mult = base_stop_mult * 0.85
-    elif confidence > 65:
-        target_mult = base_target_mult * 1.15
-        stop_mult = base_stop_mult * 0.9
-    elif confidence < 55:
-        target_mult = base_target_mult * 0.8
-        stop_mult = base_stop_mult * 1.2
-    else:
-        target_mult = base_target_mult
-        stop_mult = base_stop_mult
-    
-    # Adjust for trend strength (ADX)
-    if adx > 30:
-        target_mult *= 1.1
-        stop_mult *= 0.9
-    elif adx < 20:
-        target_mult *= 0.85
-        stop_mult *= 1.1
+    target_mult, stop_mult = _target_stop_multipliers(confidence, ta.get("adx_14", 20))
     
     # ATR-based price distances with dynamic multipliers
     target_distance = atr * target_mult
@@ -1466,6 +1720,17 @@ def _rule_based_prediction(symbol: str, ta: dict, current_price: float) -> Predi
     target_pips = abs(target_price - current_price) / pip_value
     stop_pips = abs(stop_price - current_price) / pip_value
     
+    technical_score, momentum_score, trend_score = _calculate_scores(ta)
+    
+    reasoning = []
+    key_levels = []
+    if include_reasoning:
+        reasoning = _generate_reasoning(ta, direction, confidence, symbol)
+        key_levels = [
+            {"type": "EMA20", "price": round(ta["ema_20"], 2), "distance": f"{((current_price - ta['ema_20']) / ta['ema_20'] * 100):.2f}%"},
+            {"type": "EMA50", "price": round(ta["ema_50"], 2), "distance": f"{((current_price - ta['ema_50']) / ta['ema_50'] * 100):.2f}%"},
+        ]
+    
     return PredictionResult(
         symbol=symbol,
         direction=direction,
@@ -1478,15 +1743,12 @@ def _rule_based_prediction(symbol: str, ta: dict, current_price: float) -> Predi
         entry_price=round(current_price, 2),
         target_price=round(target_price, 2),
         stop_price=round(stop_price, 2),
-        technical_score=round(_calculate_technical_score(ta), 1),
-        momentum_score=round(_calculate_momentum_score(ta), 1),
-        trend_score=round(_calculate_trend_score(ta), 1),
+        technical_score=round(technical_score, 1),
+        momentum_score=round(momentum_score, 1),
+        trend_score=round(trend_score, 1),
         volatility_regime="Medium",
-        reasoning=_generate_reasoning(ta, direction, confidence, symbol),
-        key_levels=[
-            {"type": "EMA20", "price": round(ta["ema_20"], 2), "distance": f"{((current_price - ta['ema_20']) / ta['ema_20'] * 100):.2f}%"},
-            {"type": "EMA50", "price": round(ta["ema_50"], 2), "distance": f"{((current_price - ta['ema_50']) / ta['ema_50'] * 100):.2f}%"},
-        ],
+        reasoning=reasoning,
+        key_levels=key_levels,
         timestamp=datetime.utcnow().isoformat() + "Z",
         model_version="rule_based"
     )
@@ -0,0 +1,434 @@
+"""
+TA Kernels - Compiled scalar recurrences for technical indicators
+
+Indicator recurrences (EMA, Wilder RSI/ATR/ADX, MFI, realized volatility) and
+trailing-window statistics (SMA, Bollinger, stochastic/Williams %R) walk the
+price array one bar at a time, which is slow in interpreted Python. They are
+compiled with numba's `njit` when it is installed; without numba the EMA falls
+back to pandas' `ewm` (a compiled kernel running the same recurrence).
+
+The Wilder indicators (RSI/ATR/ADX) also expose their state (`*_state`) and a one-bar
+update (`*_step`), so a caller that keeps the state can advance it by a new
+bar instead of replaying the whole history.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional accelerator
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (bare or with options)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def _ema_last_kernel(values: np.ndarray, period: int) -> float:
+    """
+    Last value of the EMA recurrence EMA_t = a*x_t + (1-a)*EMA_{t-1}, seeded
+    with the first value. With fewer than `period` values the last value is
+    returned as-is (0.0 for an empty array).
+    """
+    n = values.shape[0]
+    if n < period:
+        return float(values[n - 1]) if n else 0.0
+    alpha = 2.0 / (period + 1.0)
+    result = float(values[0])
+    for i in range(1, n):
+        result = alpha * float(values[i]) + (1 - alpha) * result
+    return result
+
+
+def _ema_last_pandas(values: np.ndarray, period: int) -> float:
+    """pandas equivalent of _ema_last_kernel (adjust=False is the same recurrence)."""
+    import pandas as pd
+    
+    n = len(values)
+    if n < period:
+        return float(values[-1]) if n else 0.0
+    return float(pd.Series(values).ewm(span=period, adjust=False).mean().iat[-1])
+
+
+@njit(cache=True, nogil=True)
+def _ema_last_many_kernel(values: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """
+    ema_last for several periods in one pass over `values`: one accumulator
+    per period, all updated from the same bar.
+    """
+    n = values.shape[0]
+    k = periods.shape[0]
+    out = np.empty(k, dtype=np.float64)
+    alphas = np.empty(k, dtype=np.float64)
+    active = np.empty(k, dtype=np.bool_)
+    for j in range(k):
+        active[j] = n >= periods[j]
+        alphas[j] = 2.0 / (periods[j] + 1.0)
+        if active[j]:
+            out[j] = float(values[0])
+        else:
+            out[j] = float(values[n - 1]) if n else 0.0
+    for i in range(1, n):
+        x = float(values[i])
+        for j in range(k):
+            if active[j]:
+                out[j] = alphas[j] * x + (1 - alphas[j]) * out[j]
+    return out
+
+
+def _ema_last_many_pandas(values: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    return np.array([_ema_last_pandas(values, int(p)) for p in periods], dtype=np.float64)
+
+
+ema_last = _ema_last_kernel if NUMBA_AVAILABLE else _ema_last_pandas
+
+
+@njit(cache=True, nogil=True)
+def rsi_step(avg_gain: float, avg_loss: float, diff: float, period: int) -> tuple:
+    """One Wilder update of the RSI averages with the close-to-close change `diff`."""
+    gain = diff if diff > 0 else 0.0
+    loss = -diff if diff < 0 else 0.0
+    return (avg_gain * (period - 1) + gain) / period, (avg_loss * (period - 1) + loss) / period
+
+
+@njit(cache=True, nogil=True)
+def rsi_value(avg_gain: float, avg_loss: float) -> float:
+    rs = avg_gain / (avg_loss + 1e-9)
+    return min(100.0, max(0.0, 100.0 - (100.0 / (1.0 + rs))))
+
+
+@njit(cache=True, nogil=True)
+def rsi_state(closes: np.ndarray, period: int = 14) -> tuple:
+    """
+    Wilder (avg_gain, avg_loss) after the last bar: seeded with the mean of
+    the first `period` changes, then rsi_step. Needs period+1 closes.
+    """
+    n = closes.shape[0]
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, min(n, period + 1)):
+        diff = closes[i] - closes[i - 1]
+        avg_gain += diff if diff > 0 else 0.0
+        avg_loss += -diff if diff < 0 else 0.0
+    avg_gain /= period
+    avg_loss /= period
+    for i in range(period + 1, n):
+        avg_gain, avg_loss = rsi_step(avg_gain, avg_loss, closes[i] - closes[i - 1], period)
+    return avg_gain, avg_loss
+
+
+@njit(cache=True, nogil=True)
+def rsi_last(closes: np.ndarray, period: int = 14) -> float:
+    """Wilder RSI of the last bar; 50.0 when there are fewer than period+1 closes."""
+    if closes.shape[0] < period + 1:
+        return 50.0
+    avg_gain, avg_loss = rsi_state(closes, period)
+    return rsi_value(avg_gain, avg_loss)
+
+
+@njit(cache=True, nogil=True)
+def true_range(high: float, low: float, prev_close: float) -> float:
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+@njit(cache=True, nogil=True)
+def atr_step(atr: float, tr: float, period: int) -> float:
+    return (atr * (period - 1) + tr) / period
+
+
+@njit(cache=True, nogil=True)
+def atr_state(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> float:
+    """
+    Wilder ATR after the last bar (true range from the second bar on, seeded
+    with the mean of the first `period` ranges). Needs period+1 bars.
+    """
+    n = closes.shape[0]
+    atr = 0.0
+    for i in range(1, min(n, period + 1)):
+        atr += true_range(highs[i], lows[i], closes[i - 1])
+    atr /= period
+    for i in range(period + 1, n):
+        atr = atr_step(atr, true_range(highs[i], lows[i], closes[i - 1]), period)
+    return atr
+
+
+@njit(cache=True, nogil=True)
+def atr_last(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> float:
+    """
+    Wilder ATR of the last bar. With fewer than period+1 bars the mean
+    high-low range is returned (0.0 for no bars).
+    """
+    n = closes.shape[0]
+    if n < period + 1:
+        if n == 0:
+            return 0.0
+        total = 0.0
+        for i in range(n):
+            total += highs[i] - lows[i]
+        return total / n
+    return atr_state(highs, lows, closes, period)
+
+
+@njit(cache=True, nogil=True)
+def _directional_movement(
+    high: float, low: float, prev_high: float, prev_low: float, prev_close: float
+) -> tuple:
+    """(true range, +DM, -DM) of one bar."""
+    up = high - prev_high
+    down = prev_low - low
+    plus_dm = up if (up > down and up > 0) else 0.0
+    minus_dm = down if (down > up and down > 0) else 0.0
+    return true_range(high, low, prev_close), plus_dm, minus_dm
+
+
+@njit(cache=True, nogil=True)
+def _dx(tr_s: float, plus_s: float, minus_s: float) -> float:
+    if tr_s > 0:
+        plus_di = 100.0 * plus_s / tr_s
+        minus_di = 100.0 * minus_s / tr_s
+    else:
+        plus_di = 0.0
+        minus_di = 0.0
+    di_sum = plus_di + minus_di
+    return 100.0 * abs(plus_di - minus_di) / di_sum if di_sum > 0 else 0.0
+
+
+@njit(cache=True, nogil=True)
+def adx_step(
+    tr_s: float, plus_s: float, minus_s: float, adx: float,
+    high: float, low: float, prev_high: float, prev_low: float, prev_close: float,
+    period: int,
+) -> tuple:
+    """One Wilder update of the ADX state (tr_s, plus_s, minus_s, adx) with a new bar."""
+    tr, plus_dm, minus_dm = _directional_movement(high, low, prev_high, prev_low, prev_close)
+    tr_s = tr_s - tr_s / period + tr
+    plus_s = plus_s - plus_s / period + plus_dm
+    minus_s = minus_s - minus_s / period + minus_dm
+    adx = (adx * (period - 1) + _dx(tr_s, plus_s, minus_s)) / period
+    return tr_s, plus_s, minus_s, adx
+
+
+@njit(cache=True, nogil=True)
+def adx_state(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> tuple:
+    """
+    Wilder ADX state (tr_s, plus_s, minus_s, adx) after the last bar. TR and
+    +DM/-DM are Wilder-smoothed from their first `period` sums, DX =
+    100*|+DI - -DI| / (+DI + -DI), and ADX is the mean of the first `period`
+    DX values, then Wilder-smoothed. Needs 2*period bars.
+    """
+    n = closes.shape[0]
+    tr_s = 0.0
+    plus_s = 0.0
+    minus_s = 0.0
+    adx = 0.0
+    for i in range(1, min(n, 2 * period)):
+        tr, plus_dm, minus_dm = _directional_movement(highs[i], lows[i], highs[i - 1], lows[i - 1], closes[i - 1])
+        if i <= period:
+            tr_s += tr
+            plus_s += plus_dm
+            minus_s += minus_dm
+            if i < period:
+                continue
+        else:
+            tr_s = tr_s - tr_s / period + tr
+            plus_s = plus_s - plus_s / period + plus_dm
+            minus_s = minus_s - minus_s / period + minus_dm
+        # DX exists from bar `period`; the first `period` of them seed ADX
+        adx += _dx(tr_s, plus_s, minus_s)
+    adx /= period
+    for i in range(2 * period, n):
+        tr_s, plus_s, minus_s, adx = adx_step(
+            tr_s, plus_s, minus_s, adx, highs[i], lows[i], highs[i - 1], lows[i - 1], closes[i - 1], period
+        )
+    return tr_s, plus_s, minus_s, adx
+
+
+@njit(cache=True, nogil=True)
+def adx_last(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> float:
+    """Wilder ADX of the last bar; 25.0 when there are fewer than 2*period bars."""
+    if closes.shape[0] < period * 2:
+        return 25.0
+    return adx_state(highs, lows, closes, period)[3]
+
+
+@njit(cache=True, nogil=True)
+def mfi_last(
+    highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray, period: int = 14
+) -> float:
+    """
+    Money Flow Index over the last `period` typical-price changes, in one pass
+    without temporary arrays. 50.0 when there are fewer than period+1 bars.
+    """
+    n = closes.shape[0]
+    if n < period + 1:
+        return 50.0
+    pos_sum = 1e-9
+    neg_sum = 1e-9
+    prev_tp = (highs[n - period - 1] + lows[n - period - 1] + closes[n - period - 1]) / 3
+    for i in range(n - period, n):
+        tp = (highs[i] + lows[i] + closes[i]) / 3
+        if tp > prev_tp:
+            pos_sum += tp * volumes[i]
+        elif tp < prev_tp:
+            neg_sum += tp * volumes[i]
+        prev_tp = tp
+    return 100 - (100 / (1 + pos_sum / neg_sum))
+
+
+@njit(cache=True, nogil=True)
+def sma_last(values: np.ndarray, period: int) -> float:
+    """Mean of the last `period` values (of all values when there are fewer; 0.0 for none)."""
+    n = values.shape[0]
+    if n == 0:
+        return 0.0
+    start = n - period if n >= period else 0
+    total = 0.0
+    for i in range(start, n):
+        total += values[i]
+    return total / (n - start)
+
+
+@njit(cache=True, nogil=True)
+def range_oscillators_last(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, period: int = 14) -> tuple:
+    """
+    Stochastic %K/%D and Williams %R of the last bar from one high/low window
+    scan (%D is simplified to %K). (50, 50, -50) for a short or flat window.
+    """
+    n = closes.shape[0]
+    if n < period:
+        return 50.0, 50.0, -50.0
+    low_min = lows[n - period]
+    high_max = highs[n - period]
+    for i in range(n - period + 1, n):
+        low_min = min(low_min, lows[i])
+        high_max = max(high_max, highs[i])
+    span = high_max - low_min
+    if span == 0:
+        return 50.0, 50.0, -50.0
+    k = 100 * (closes[n - 1] - low_min) / span
+    wr = -100 * (high_max - closes[n - 1]) / span
+    return k, k, wr
+
+
+@njit(cache=True, nogil=True)
+def bollinger_last(values: np.ndarray, period: int = 20) -> tuple:
+    """
+    (upper, lower, middle, width %, z-score) of 2-sigma Bollinger bands over
+    the last `period` values, population std; zeros for a short history.
+    """
+    n = values.shape[0]
+    if n < period:
+        return 0.0, 0.0, 0.0, 0.0, 0.0
+    mean = sma_last(values, period)
+    sq = 0.0
+    for i in range(n - period, n):
+        sq += (values[i] - mean) ** 2
+    std = np.sqrt(sq / period) + 1e-9
+    upper = mean + 2 * std
+    lower = mean - 2 * std
+    zscore = (values[n - 1] - mean) / std
+    width = (upper - lower) / mean * 100
+    return upper, lower, mean, width, zscore
+
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def realized_vol_last(closes: np.ndarray, window: int = 20) -> float:
+    """
+    Annualized (252) population std of the last `window` log returns, in
+    percent. One pass with Welford's update, no temporary arrays. 0.0 when
+    there are fewer than window+2 closes.
+    """
+    n = closes.shape[0]
+    if n < window + 2:
+        return 0.0
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    for i in range(n - window, n):
+        r = np.log(closes[i] / closes[i - 1])
+        count += 1
+        delta = r - mean
+        mean += delta / count
+        m2 += delta * (r - mean)
+    return np.sqrt(m2 / count) * np.sqrt(252.0) * 100.0
+
+
+# Output layout of window_indicators
+WINDOW_FIELDS = (
+    "sma_20", "sma_50", "sma_200",
+    "stoch_k", "stoch_d", "williams_r",
+    "boll_upper", "boll_lower", "boll_middle", "boll_width", "boll_zscore",
+    "mfi", "momentum_3", "momentum_10", "volatility", "ret_20_z",
+)
+
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def window_indicators(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+    """
+    Every trailing-window indicator of the last bar in one call, laid out as
+    WINDOW_FIELDS. These only read a fixed tail of the arrays, so unlike the
+    recurrences they need no state between calls.
+    """
+    n = closes.shape[0]
+    out = np.zeros(len(WINDOW_FIELDS), dtype=np.float64)
+    out[0] = sma_last(closes, 20)
+    out[1] = sma_last(closes, 50)
+    out[2] = sma_last(closes, 200)
+    out[3], out[4], out[5] = range_oscillators_last(closes, highs, lows, 14)
+    out[6], out[7], out[8], out[9], out[10] = bollinger_last(closes, 20)
+    out[11] = mfi_last(highs, lows, closes, volumes, 14)
+    if n >= 4:
+        out[12] = (closes[n - 1] - closes[n - 4]) / closes[n - 4] * 100
+    if n >= 11:
+        out[13] = (closes[n - 1] - closes[n - 11]) / closes[n - 11] * 100
+    out[14] = realized_vol_last(closes, 20)
+    if n >= 21:
+        # 20-bar return against the population std of the last 59 simple returns
+        ret_20 = (closes[n - 1] - closes[n - 21]) / closes[n - 21]
+        ret_std = 0.01
+        if n >= 61:
+            mean = 0.0
+            m2 = 0.0
+            count = 0
+            for i in range(n - 59, n):
+                r = (closes[i] - closes[i - 1]) / closes[i - 1]
+                count += 1
+                delta = r - mean
+                mean += delta / count
+                m2 += delta * (r - mean)
+            ret_std = np.sqrt(m2 / count)
+        out[15] = ret_20 / (ret_std + 1e-9)
+    return out
+
+
+ema_last_many = _ema_last_many_kernel if NUMBA_AVAILABLE else _ema_last_many_pandas
+
+
+def as_float_array(values) -> np.ndarray:
+    """Contiguous float64 view/copy, the layout the compiled kernels expect."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from the on-disk cache) at import, not on the first prediction
+    ema_last(np.zeros(2, dtype=np.float64), 1)
+    ema_last_many(np.zeros(2, dtype=np.float64), np.ones(1, dtype=np.int64))
+    _warm = np.zeros(3, dtype=np.float64)
+    rsi_last(_warm, 1)
+    rsi_step(0.0, 0.0, 0.0, 1)
+    atr_last(_warm, _warm, _warm, 1)
+    atr_step(0.0, 0.0, 1)
+    adx_last(_warm, _warm, _warm, 1)
+    adx_step(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1)
+    mfi_last(_warm, _warm, _warm, _warm, 1)
+    sma_last(_warm, 1)
+    range_oscillators_last(_warm, _warm, _warm, 1)
+    bollinger_last(_warm + 1.0, 1)
+    realized_vol_last(_warm, 1)
+    window_indicators(_warm, _warm, _warm, _warm)
+    del _warm
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from services import analysis_cache
+from services.analysis_cache import async_ttl_cache
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    analysis_cache.clear_all()
+    yield
+    analysis_cache.clear_all()
+
+
+def _locks(wrapper):
+    cells = dict(zip(wrapper.__code__.co_freevars, wrapper.__closure__))
+    return cells["locks"].cell_contents
+
+
+def _counting(result=lambda n, calls: f"{n}:{calls}"):
+    calls = []
+    
+    @async_ttl_cache(ttl=60)
+    async def fetch(n):
+        calls.append(n)
+        await asyncio.sleep(0.01)
+        return result(n, len(calls))
+    
+    return fetch, calls
+
+
+def test_concurrent_callers_share_one_call():
+    fetch, calls = _counting()
+    
+    async def scenario():
+        return await asyncio.gather(*(fetch(1) for _ in range(5)))
+    
+    assert asyncio.run(scenario()) == ["1:1"] * 5
+    assert calls == [1]
+
+
+def test_results_are_cached_per_arguments():
+    fetch, calls = _counting()
+    
+    async def scenario():
+        return [await fetch(1), await fetch(2), await fetch(1)]
+    
+    assert asyncio.run(scenario()) == ["1:1", "2:2", "1:1"]
+    assert calls == [1, 2]
+
+
+def test_none_is_not_cached():
+    fetch, calls = _counting(result=lambda n, calls: None)
+    
+    async def scenario():
+        await fetch(1)
+        await fetch(1)
+    
+    asyncio.run(scenario())
+    assert calls == [1, 1]
+
+
+def test_cache_clear_drops_results():
+    fetch, calls = _counting()
+    
+    async def scenario():
+        first = await fetch(1)
+        fetch.cache_clear()
+        return first, await fetch(1)
+    
+    assert asyncio.run(scenario()) == ("1:1", "1:2")
+
+
+def test_refresh_recomputes_ahead_of_expiry():
+    fetch, calls = _counting()
+    
+    async def scenario():
+        await fetch(1)
+        refreshed = await fetch.refresh(1)
+        return refreshed, await fetch(1)
+    
+    assert asyncio.run(scenario()) == ("1:2", "1:2")
+    assert calls == [1, 1]
+
+
+def test_locks_are_dropped_once_calls_finish():
+    fetch, _ = _counting()
+    
+    async def scenario():
+        await asyncio.gather(*(fetch(n) for n in range(50) for _ in range(3)))
+        await fetch.refresh(0)
+    
+    asyncio.run(scenario())
+    assert _locks(fetch) == {}
+
+
+def test_lock_is_dropped_when_the_call_fails():
+    @async_ttl_cache(ttl=60)
+    async def broken():
+        raise RuntimeError("upstream down")
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(broken())
+    assert _locks(broken) == {}
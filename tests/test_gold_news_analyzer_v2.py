@@ -0,0 +1,83 @@
+import calendar
+
+import pytest
+
+from services.gold_news_analyzer_v2 import (
+    _parse_timestamp_or_none, calculate_context_modifier, detect_negation,
+)
+
+# 2024-01-02 03:04:05 UTC
+BASE_TS = float(calendar.timegm((2024, 1, 2, 3, 4, 5, 0, 0, 0)))
+
+
+@pytest.mark.parametrize("headline", [
+    "fed delays rate cut",
+    "ecb delayed its decision",
+    "talks are delaying the deal",
+    "summit cancelled",
+    "central bank cancels hike",
+    "fed pauses tightening",
+    "rally halted",
+    "fed will not cut",
+    "no change in policy",
+])
+def test_negation_matches_words_and_inflections(headline):
+    assert detect_negation(headline)
+
+
+@pytest.mark.parametrize("headline", [
+    "fed noted strong demand",
+    "fed gives a nod to cuts",
+    "bank offers a notable outlook",
+    "stopwatch rally continues",
+    "knot of buyers at 2000",
+    "nothingness",
+    "unstoppable gold",
+])
+def test_negation_ignores_words_that_only_contain_a_negation(headline):
+    assert not detect_negation(headline)
+
+
+def test_context_modifier_counts_inflected_words():
+    assert calculate_context_modifier("fed announces cut") == pytest.approx(1.15)
+    assert calculate_context_modifier("fed confirmed and announced cut") == pytest.approx(1.15 ** 2)
+    assert calculate_context_modifier("gold surges") == pytest.approx(1.1)
+    assert calculate_context_modifier("fed considering cut") == pytest.approx(0.7)
+
+
+def test_context_modifier_ignores_embedded_words():
+    # "announcement", "official" inside "unofficially", "may" inside "mayor"
+    assert calculate_context_modifier("announcement due") == 1.0
+    assert calculate_context_modifier("unofficially the mayor spoke") == 1.0
+    assert calculate_context_modifier("") == 1.0
+
+
+@pytest.mark.parametrize("date_str, expected", [
+    # Naive times are read as UTC, not local time
+    ("2024-01-02 03:04:05", BASE_TS),
+    ("2024-01-02T03:04:05", BASE_TS),
+    ("2024-01-02", BASE_TS - (3 * 3600 + 4 * 60 + 5)),
+    # Trailing Z and explicit offsets
+    ("2024-01-02T03:04:05Z", BASE_TS),
+    ("2024-01-02T03:04:05+00:00", BASE_TS),
+    ("2024-01-02T05:04:05+02:00", BASE_TS),
+    ("2024-01-01T22:04:05-05:00", BASE_TS),
+    ("2024-01-02T03:04:05.250Z", BASE_TS + 0.25),
+])
+def test_parse_timestamp(date_str, expected):
+    assert _parse_timestamp_or_none(date_str) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("date_str, expected", [
+    # Rejected by datetime.fromisoformat, handled by the regex fallback
+    (" 2024-01-02T03:04:05Z ", BASE_TS),
+    ("2024-01-02T05:04:05+0200 ", BASE_TS),
+    (" 2024-01-02 03:04:05 ", BASE_TS),
+])
+def test_parse_timestamp_regex_fallback(date_str, expected):
+    assert _parse_timestamp_or_none(date_str) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("date_str", ["", "yesterday", "02/01/2024 03:04", "2024-13-45T03:04:05"])
+def test_parse_timestamp_unparseable(date_str):
+    assert _parse_timestamp_or_none(date_str) is None
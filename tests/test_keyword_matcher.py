@@ -0,0 +1,67 @@
+import pytest
+
+from services import keyword_matcher
+from services.keyword_matcher import KeywordMatcher
+
+
+ENTRIES = [
+    ("fed", "central_bank"),
+    ("rate cut", "dovish"),
+    ("rate", "rates"),
+    ("gold", "metal"),
+    ("fed", "duplicate"),
+]
+
+
+@pytest.fixture(params=["automaton", "scan"])
+def matcher(request, monkeypatch):
+    if request.param == "automaton":
+        if keyword_matcher.ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+    else:
+        monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+    built = KeywordMatcher(ENTRIES)
+    assert (built._automaton is None) == (request.param == "scan")
+    return built
+
+
+def test_find_reports_each_entry_once_in_registration_order(matcher):
+    text = "gold rallies as fed signals rate cut, fed speakers agree"
+    assert matcher.find(text) == [
+        ("fed", "central_bank"),
+        ("rate cut", "dovish"),
+        ("rate", "rates"),
+        ("gold", "metal"),
+        ("fed", "duplicate"),
+    ]
+
+
+def test_find_without_matches(matcher):
+    assert matcher.find("equities flat") == []
+    assert matcher.find("") == []
+
+
+def test_duplicate_keywords_keep_both_payloads(matcher):
+    assert matcher.find("the fed") == [("fed", "central_bank"), ("fed", "duplicate")]
+
+
+def test_first_is_earliest_registered_not_earliest_in_text(matcher):
+    assert matcher.first("gold up after fed") == ("fed", "central_bank")
+    assert matcher.first("rate cut hopes") == ("rate cut", "dovish")
+    assert matcher.first("gold only") == ("gold", "metal")
+    assert matcher.first("nothing here") is None
+    assert matcher.first("") is None
+
+
+def test_contains_any(matcher):
+    assert matcher.contains_any("golden opportunity")
+    assert not matcher.contains_any("silver")
+    assert not matcher.contains_any("")
+
+
+def test_empty_matcher():
+    empty = KeywordMatcher([])
+    assert len(empty) == 0
+    assert empty.find("fed") == []
+    assert empty.first("fed") is None
+    assert not empty.contains_any("fed")
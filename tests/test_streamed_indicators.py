@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from services import ml_prediction_service as mps
+
+
+def _series(n, seed=7):
+    rng = np.random.default_rng(seed)
+    closes = 1800 + np.cumsum(rng.normal(0, 1, n))
+    highs = closes + rng.random(n)
+    lows = closes - rng.random(n)
+    volumes = rng.random(n) * 100
+    return closes, highs, lows, volumes
+
+
+def _candles(arrays, start, end):
+    closes, highs, lows, volumes = arrays
+    return [
+        {
+            "timestamp": i,
+            "open": closes[i],
+            "high": highs[i],
+            "low": lows[i],
+            "close": closes[i],
+            "volume": volumes[i],
+        }
+        for i in range(start, end)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    mps._STREAM_STATE.clear()
+    mps._TA_CACHE.clear()
+    yield
+    mps._STREAM_STATE.clear()
+    mps._TA_CACHE.clear()
+
+
+def test_streamed_matches_bulk_after_one_appended_bar():
+    arrays = _series(320)
+    mps._cached_technical_indicators("XAUUSD", _candles(arrays, 0, 300))
+    streamed = mps._cached_technical_indicators("XAUUSD", _candles(arrays, 0, 301))
+    
+    expected = mps._compute_technical_indicators(*(a[:301] for a in arrays))
+    assert streamed == expected
+
+
+def test_streamed_emas_do_not_depend_on_streaming_history():
+    arrays = _series(700)
+    # Slide a 300-bar window one bar at a time, as the 30m fetch does
+    for end in range(301, 701):
+        streamed = mps._cached_technical_indicators("XAUUSD", _candles(arrays, end - 300, end))
+    
+    fresh = mps._compute_technical_indicators(*(a[400:700] for a in arrays))
+    for key in ("ema_20", "ema_50", "ema_200", "macd_line", "trend_direction"):
+        assert streamed[key] == fresh[key]
+    for key in ("rsi_14", "rsi_7", "atr_14", "adx"):
+        assert streamed[key] == pytest.approx(fresh[key], rel=1e-6)
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from services.ta_kernels import adx_last, atr_last, mfi_last, rsi_last
+
+
+def _ohlcv(n, seed=11):
+    rng = np.random.default_rng(seed)
+    closes = 100 + np.cumsum(rng.normal(0, 1, n))
+    highs = closes + rng.random(n)
+    lows = closes - rng.random(n)
+    volumes = rng.random(n) * 1000
+    return highs, lows, closes, volumes
+
+
+def _wilder(values, period):
+    """Wilder smoothing seeded with the mean of the first `period` values."""
+    avg = values[:period].mean()
+    for value in values[period:]:
+        avg = (avg * (period - 1) + value) / period
+    return avg
+
+
+def _rsi_reference(closes, period):
+    diffs = np.diff(closes)
+    avg_gain = _wilder(np.clip(diffs, 0, None), period)
+    avg_loss = _wilder(np.clip(-diffs, 0, None), period)
+    return 100 - 100 / (1 + avg_gain / (avg_loss + 1e-9))
+
+
+def _true_ranges(highs, lows, closes):
+    prev_close = closes[:-1]
+    return np.maximum.reduce([
+        highs[1:] - lows[1:],
+        np.abs(highs[1:] - prev_close),
+        np.abs(lows[1:] - prev_close),
+    ])
+
+
+def _mfi_reference(highs, lows, closes, volumes, period):
+    tp = (highs + lows + closes) / 3
+    flow = tp * volumes
+    change = np.diff(tp)[-period:]
+    window_flow = flow[-period:]
+    pos = window_flow[change > 0].sum() + 1e-9
+    neg = window_flow[change < 0].sum() + 1e-9
+    return 100 - 100 / (1 + pos / neg)
+
+
+@pytest.mark.parametrize("n", [15, 16, 60, 300])
+@pytest.mark.parametrize("period", [7, 14])
+def test_rsi_matches_wilder_reference(n, period):
+    _, _, closes, _ = _ohlcv(n)
+    assert rsi_last(closes, period) == pytest.approx(_rsi_reference(closes, period), rel=1e-12)
+
+
+def test_rsi_short_history_is_neutral():
+    _, _, closes, _ = _ohlcv(14)
+    assert rsi_last(closes, 14) == 50.0
+    assert rsi_last(closes[:0], 14) == 50.0
+
+
+@pytest.mark.parametrize("n", [15, 16, 60, 300])
+def test_atr_matches_wilder_reference(n):
+    highs, lows, closes, _ = _ohlcv(n)
+    expected = _wilder(_true_ranges(highs, lows, closes), 14)
+    assert atr_last(highs, lows, closes, 14) == pytest.approx(expected, rel=1e-12)
+
+
+def test_atr_short_history_is_mean_range():
+    highs, lows, closes, _ = _ohlcv(10)
+    assert atr_last(highs, lows, closes, 14) == pytest.approx(np.mean(highs - lows), rel=1e-12)
+    assert atr_last(highs[:0], lows[:0], closes[:0], 14) == 0.0
+
+
+@pytest.mark.parametrize("n", [15, 60, 300])
+def test_mfi_matches_reference(n):
+    highs, lows, closes, volumes = _ohlcv(n)
+    expected = _mfi_reference(highs, lows, closes, volumes, 14)
+    assert mfi_last(highs, lows, closes, volumes, 14) == pytest.approx(expected, rel=1e-12)
+
+
+def test_mfi_short_history_is_neutral():
+    highs, lows, closes, volumes = _ohlcv(14)
+    assert mfi_last(highs, lows, closes, volumes, 14) == 50.0
+
+
+def _adx_reference(highs, lows, closes, period):
+    """Textbook Wilder ADX, written out bar by bar."""
+    tr = _true_ranges(highs, lows, closes)
+    up = highs[1:] - highs[:-1]
+    down = lows[:-1] - lows[1:]
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    
+    tr_s = plus_s = minus_s = 0.0
+    dx = []
+    for i in range(len(tr)):
+        if i < period:
+            tr_s += tr[i]
+            plus_s += plus_dm[i]
+            minus_s += minus_dm[i]
+            if i < period - 1:
+                continue
+        else:
+            tr_s = tr_s - tr_s / period + tr[i]
+            plus_s = plus_s - plus_s / period + plus_dm[i]
+            minus_s = minus_s - minus_s / period + minus_dm[i]
+        plus_di = 100.0 * plus_s / tr_s if tr_s > 0 else 0.0
+        minus_di = 100.0 * minus_s / tr_s if tr_s > 0 else 0.0
+        di_sum = plus_di + minus_di
+        dx.append(100.0 * abs(plus_di - minus_di) / di_sum if di_sum > 0 else 0.0)
+    
+    adx = 0.0
+    for value in dx[:period]:
+        adx += value
+    adx /= period
+    for value in dx[period:]:
+        adx = (adx * (period - 1) + value) / period
+    return adx
+
+
+@pytest.mark.parametrize("n", [28, 29, 60, 300])
+def test_adx_matches_wilder_reference_exactly(n):
+    highs, lows, closes, _ = _ohlcv(n)
+    assert adx_last(highs, lows, closes, 14) == _adx_reference(highs, lows, closes, 14)
+
+
+def test_adx_short_history_is_neutral():
+    highs, lows, closes, _ = _ohlcv(27)
+    assert adx_last(highs, lows, closes, 14) == 25.0